@@ -1,41 +1,83 @@
 """
 Data Analysis Script for Auction Data
-Query and analyze scraped auction data
+Query and analyze scraped auction data; lots are indexed once on load (see lot_index.py)
 """
 
 import pandas as pd
 import json
-from typing import Optional
+from typing import List, Optional
 import os
+from lot_index import LotIndex
+from lot_storage import DATASET_ROOT, open_lot_dataset, read_lots
+from lot_store import LotStore
+
+
+def default_data_path() -> str:
+    """The Parquet dataset when one has been written, otherwise the CSV export"""
+    return DATASET_ROOT if os.path.isdir(DATASET_ROOT) else 'data/auction_data.csv'
 
 
 class AuctionDataAnalyzer:
     """Analyzer for scraped auction data"""
     
-    def __init__(self, data_path: str = 'data/auction_data.csv'):
+    def __init__(self, data_path: Optional[str] = None, columns: Optional[List[str]] = None,
+                 auction_id: Optional[str] = None, date: Optional[str] = None):
         """
         Initialize analyzer with data
         
         Args:
-            data_path: Path to the CSV or JSON data file
+            data_path: Parquet dataset directory, SQLite lot store (.db), CSV or JSON data file
+                (default: default_data_path())
+            columns: Columns to read from the Parquet dataset or lot store (None reads all)
+            auction_id: Only read this auction from the Parquet dataset or lot store
+            date: Only read this auction date from the Parquet dataset or lot store
         """
-        self.data_path = data_path
-        self.df = None
+        self.data_path = data_path or default_data_path()
+        self.columns = columns
+        self.auction_id = auction_id
+        self.date = date
+        self.dataset = None
+        self.store = None
+        self._df = None
+        self.index = None
         self.load_data()
     
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """Lots as a DataFrame; a Parquet dataset is only scanned on first access"""
+        if self._df is None and self.dataset is not None:
+            self.df = read_lots(self.data_path, self.columns, self.auction_id, self.date)
+            print(f"Loaded {len(self._df)} auction items")
+        return self._df
+    
+    @df.setter
+    def df(self, value: Optional[pd.DataFrame]):
+        """Replace the lots and rebuild their indexes"""
+        self._df = value
+        self.index = LotIndex(value) if value is not None else None
+    
     def load_data(self):
-        """Load data from file"""
+        """Load data from file, or open the Parquet dataset for lazy reading"""
         if not os.path.exists(self.data_path):
             print(f"Data file not found: {self.data_path}")
             print("Please run scraper.py first to collect data.")
             return
         
-        if self.data_path.endswith('.csv'):
+        if os.path.isdir(self.data_path):
+            self.dataset = open_lot_dataset(self.data_path)
+            self.df = None
+            return
+        
+        if self.data_path.endswith('.db'):
+            # Keep the store open so callers can run further queries against the full history
+            self.store = LotStore(self.data_path)
+            self.df = self.store.query(self.auction_id, self.date, columns=self.columns)
+        elif self.data_path.endswith('.csv'):
             self.df = pd.read_csv(self.data_path)
         elif self.data_path.endswith('.json'):
             self.df = pd.read_json(self.data_path)
         else:
-            raise ValueError("Unsupported file format. Use .csv or .json")
+            raise ValueError("Unsupported file format. Use a Parquet dataset directory, .db, .csv or .json")
         
         print(f"Loaded {len(self.df)} auction items")
     
@@ -57,17 +99,16 @@ class AuctionDataAnalyzer:
     
     def search_by_keyword(self, keyword: str, column: str = 'title'):
         """
-        Search for items containing keyword
+        Search for items containing keyword (case-insensitive, literal text)
         
         Args:
             keyword: Search term
-            column: Column to search in (default: 'title')
+            column: Column to search in (default: 'title'); title and description use the token index
         """
         if self.df is None:
             return None
         
-        mask = self.df[column].astype(str).str.contains(keyword, case=False, na=False)
-        results = self.df[mask]
+        results = self.index.rows(self.index.search(keyword, column))
         
         print(f"\nFound {len(results)} items matching '{keyword}' in {column}:")
         return results
@@ -77,40 +118,57 @@ class AuctionDataAnalyzer:
         if self.df is None:
             return None
         
-        results = self.df[self.df['page'] == page_num]
+        results = self.index.rows(self.index.lookup('page', page_num))
         print(f"\nPage {page_num} contains {len(results)} items:")
         return results
     
-    def get_price_range(self, min_price: Optional[float] = None, max_price: Optional[float] = None):
+    def find_lot(self, lot_number: str):
+        """Get the lot(s) with a lot number (ignoring case and surrounding whitespace)"""
+        if self.df is None:
+            return None
+        
+        return self.index.rows(self.index.lookup('lot_number', lot_number))
+    
+    def get_price_range(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+                        column: str = 'current_bid'):
         """
         Filter items by price range
         
         Args:
             min_price: Minimum price
             max_price: Maximum price
+            column: Price to compare: 'current_bid', 'starting_bid' or 'reserve_price' (default: 'current_bid')
         """
         if self.df is None:
             return None
         
-        # This assumes current_bid column has numeric values
-        # You may need to clean the data first
         try:
-            df_copy = self.df.copy()
-            df_copy['price_numeric'] = pd.to_numeric(
-                df_copy['current_bid'].str.replace('$', '').str.replace(',', ''),
-                errors='coerce'
-            )
-            
-            if min_price is not None:
-                df_copy = df_copy[df_copy['price_numeric'] >= min_price]
-            if max_price is not None:
-                df_copy = df_copy[df_copy['price_numeric'] <= max_price]
-            
-            print(f"\nFound {len(df_copy)} items in price range:")
-            return df_copy
-        except Exception as e:
+            results = self.index.rows(self.index.range(column, min_price, max_price))
+        except KeyError as e:
             print(f"Error filtering by price: {e}")
             return None
+        
+        print(f"\nFound {len(results)} items in price range:")
+        return results
+    
+    def query(self, keywords: Optional[dict] = None, ranges: Optional[dict] = None, keys: Optional[dict] = None):
+        """
+        Combine keyword, numeric range and key conditions in one indexed query
+        
+        Args:
+            keywords: Column -> keyword, e.g. {'title': 'ford', 'description': 'leather'}
+            ranges: Numeric column -> (min, max), e.g. {'starting_bid': (None, 5000), 'odometer_km': (None, 150000)}
+            keys: 'page' or 'lot_number' -> value
+        
+        Returns:
+            Matching lots
+        """
+        if self.df is None:
+            return None
+        
+        results = self.index.query(keywords, ranges, keys)
+        print(f"\nFound {len(results)} matching items:")
+        return results
     
     def show_sample(self, n: int = 5):
         """Show sample of the data"""
@@ -156,7 +214,9 @@ def interactive_mode():
     print("  2. sample - Show sample data")
     print("  3. search - Search by keyword")
     print("  4. page - Filter by page number")
-    print("  5. quit - Exit")
+    print("  5. lot - Find a lot by number")
+    print("  6. price - Filter by starting bid range")
+    print("  7. quit - Exit")
     print()
     
     while True:
@@ -182,8 +242,19 @@ def interactive_mode():
                 results = analyzer.filter_by_page(page)
                 if results is not None and not results.empty:
                     print(results[['lot_number', 'title', 'current_bid']].to_string())
+            elif command == 'lot':
+                results = analyzer.find_lot(input("Enter lot number: ").strip())
+                if results is not None and not results.empty:
+                    print(results[['lot_number', 'title', 'starting_bid']].to_string())
+            elif command == 'price':
+                low = input("Minimum (blank for none): ").strip()
+                high = input("Maximum (blank for none): ").strip()
+                results = analyzer.get_price_range(float(low) if low else None, float(high) if high else None,
+                                                   column='starting_bid')
+                if results is not None and not results.empty:
+                    print(results[['lot_number', 'title', 'starting_bid']].to_string())
             else:
-                print("Unknown command. Try: summary, sample, search, page, or quit")
+                print("Unknown command. Try: summary, sample, search, page, lot, price, or quit")
         
         except KeyboardInterrupt:
             print("\nExiting...")
@@ -197,7 +268,7 @@ def main():
     print("Auction Data Analyzer")
     
     # Check if data exists
-    if not os.path.exists('data/auction_data.csv'):
+    if not os.path.exists(default_data_path()):
         print("\nNo data found. Please run scraper.py first to collect data.")
         return
     
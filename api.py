@@ -8,24 +8,49 @@ from flask import Flask, request, jsonify, send_from_directory, Response, stream
 from flask_cors import CORS
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import time
 import re
 import os
-import json
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor
 import threading
 import queue
+import asyncio
+import contextlib
+import contextvars
+import uuid
+from driver_pool import DriverPool
+from driver_resolver import resolver as driver_resolver
+from governor import MemoryBudget, ScrapeTicket, current_ticket
+from wait_strategies import WAIT_STRATEGIES
+from fetch_backends import FetchRouter, FETCH_BACKENDS, has_marker
+from async_engine import AsyncFetcher
+from lot_extractor import extract_lots, extract_lot_from_soup, extract_lots_from_soup
+from parse_pipeline import ParsePipeline, as_parsed
+from pagination import count_total_pages, pagination_hint
+from jobs import JobStore, JobManager, FINISHED_STATUSES
+from page_cache import PageCache, CACHE_MODES
+from render_profiles import DEFAULT_RENDER_PROFILE, RENDER_PROFILES, enable_network_log
+from lot_store import LotStore, SORT_KEYS
+from metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry, ScrapeTimings, rounded, span
+from retries import (EmptyPageError, PageFailed, ScrapeRetries, describe_error, is_driver_failure, run_with_retries,
+                     run_with_retries_async)
+from response_encoding import (LOT_FORMATS, StreamCompressor, choose_encoding, columnar_lots, dumps, json_response,
+                               shape_result)
 
 app = Flask(__name__, static_folder='.')
 CORS(app)  # Enable CORS for all routes
 
-# Global progress tracker
-progress_queues = {}
-progress_lock = threading.Lock()
+# Set when the server starts shutting down: new scrapes are refused and in-flight ones stop fetching pages
+shutting_down = threading.Event()
+
+# Files the web interface may load; anything else in the app folder (code, data, databases) is not served
+STATIC_EXTENSIONS = {'.html', '.js', '.css', '.map', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp',
+                     '.woff', '.woff2'}
+
+# Browser cache lifetime for static assets; pages and env.js are always revalidated by ETag instead
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 3600))
 
 
 def create_driver(headless=True):
@@ -40,47 +65,160 @@ def create_driver(headless=True):
     chrome_options.add_argument('--remote-debugging-port=9222')
     chrome_options.add_argument('--disable-software-rasterizer')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+    enable_network_log(chrome_options)  # per-page request/byte stats for the render profiles
     
-    # Check if running in production (Railway) or locally
-    chrome_bin = os.environ.get('CHROME_BIN')
-    if chrome_bin:
-        # Production: use system Chrome and let webdriver-manager handle driver
-        chrome_options.binary_location = chrome_bin
+    # CHROME_BIN in production (Railway); the driver path is resolved once per process
+    driver_resolver.configure(chrome_options)
     
     try:
-        # Let webdriver-manager download and manage the correct ChromeDriver version
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=chrome_options)
+        return webdriver.Chrome(service=driver_resolver.service(), options=chrome_options)
     except Exception as e:
         print(f"Error creating Chrome driver: {e}")
         raise
 
 
-def scrape_generic_url(url: str, wait_time: int = 5, scrape_all_pages: bool = False, max_workers: int = 1) -> dict:
+# Shared resources of the server process, built by create_app(). Nothing that starts threads or processes or
+# opens a database runs at import: parser processes re-import the main module, and gunicorn's master and the
+# benchmark import this one without serving it.
+driver_pool: DriverPool = None
+fetcher: FetchRouter = None
+parser_pipeline: ParsePipeline = None
+page_cache: PageCache = None
+lot_store: LotStore = None
+job_store: JobStore = None
+job_manager: JobManager = None
+_setup_lock = threading.Lock()
+
+# Upper bound on a request's max_workers
+MAX_SCRAPE_WORKERS = int(os.environ.get('MAX_SCRAPE_WORKERS', 10))
+
+# Upper bound on a request's page_retries (PAGE_RETRIES and RETRY_BUDGET set the defaults, see retries.py)
+MAX_PAGE_RETRIES = int(os.environ.get('MAX_PAGE_RETRIES', 5))
+
+# Engines that can drive scrape_all_auction_pages
+SCRAPE_ENGINES = ('threads', 'async')
+
+# Timing histograms and counters served by GET /metrics (per process: each gunicorn worker has its own)
+metrics = MetricsRegistry()
+page_span_seconds = metrics.histogram('scraper_page_span_seconds', 'Seconds spent in one step of a page scrape',
+                                      ['span', 'backend'])
+page_seconds = metrics.histogram('scraper_page_seconds', 'Seconds to scrape one page, fetch to parsed lots',
+                                 ['backend'])
+pages_total = metrics.counter('scraper_pages_total', 'Pages scraped', ['backend', 'outcome'])
+page_retries_total = metrics.counter('scraper_page_retries_total', 'Page attempts retried', ['reason'])
+discovery_seconds = metrics.histogram('scraper_discovery_seconds', 'Seconds to load page 1 and count the pages')
+scrape_seconds = metrics.histogram('scraper_scrape_seconds', 'Seconds per scrape request', ['engine', 'outcome'],
+                                   buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600))
+metrics.gauge('scraper_browser_sessions', 'Browser sessions by state',
+              lambda: {(state,): driver_pool.stats()[state] for state in ('idle', 'in_use', 'waiting', 'limit')},
+              ['state'])
+metrics.gauge('scraper_available_memory_mb', 'Memory available for new browser sessions',
+              lambda: {(): driver_pool.stats()['available_memory_mb']})
+metrics.gauge('scraper_page_cache_entries', 'Pages in the page cache', lambda: {(): page_cache.stats()['entries']})
+
+
+def cached_page(url: str, cache_mode: str = 'use') -> dict:
+    """Fresh cache entry for url in the fetch_page() result shape, or None"""
+    start = time.perf_counter()
+    entry = page_cache.lookup(url, cache_mode)
+    if not entry:
+        return None
+    return {
+        'html': entry['html'],
+        'lots': entry['lots'],
+        'fetched_at': entry['fetched_at'],
+        'backend': 'cache',
+        'readiness': {'strategy': 'cache', 'ready': True, 'latency': 0.0},
+        'timings': {'cache': time.perf_counter() - start}
+    }
+
+
+def fetch_page(url: str, fetch_backend: str = 'auto', wait_strategy: str = 'auto', wait_time: int = 5,
+               ready_marker: str = None, cache_mode: str = 'use', render_profile: str = None,
+               fresh_session: bool = False, on_source=None) -> dict:
+    """
+    fetcher.fetch() behind the page cache
+    
+    Args:
+        url: Page URL
+        fetch_backend: 'auto', 'browser' or 'http'
+        wait_strategy: Readiness policy name
+        wait_time: Maximum wait time for JavaScript
+        ready_marker: Class name that marks a usable plain-HTTP response
+        cache_mode: 'use' (serve fresh cached pages), 'refresh' (always fetch, then cache) or 'bypass'
+        render_profile: What browser renders skip downloading (None uses RENDER_PROFILE, see render_profiles)
+        fresh_session: Render in a newly started browser session (after a driver failure)
+        on_source: Called with the page HTML as soon as some arrives (see FetchRouter.fetch); not for cache hits
+        
+    Returns:
+        Dictionary with html, backend, readiness and timings (the backend's spans plus 'fetch', the whole
+        call); cache hits have backend 'cache', plus the cached 'lots' (None if the page was cached before
+        being parsed) and 'fetched_at'
+    """
+    start = time.perf_counter()
+    page = cached_page(url, cache_mode)
+    if not page:
+        if shutting_down.is_set():
+            raise RuntimeError('Server is shutting down')
+        page = fetcher.fetch(url, fetch_backend, wait_strategy, wait_time, ready_marker=ready_marker,
+                             render_profile=render_profile, fresh_session=fresh_session, on_source=on_source)
+    page['timings']['fetch'] = time.perf_counter() - start
+    return page
+
+
+def cache_page(url: str, page: dict, lots: list = None, cache_mode: str = 'use'):
+    """Store a page returned by fetch_page(), keeping the original fetch time for cache hits"""
+    if page['backend'] == 'cache' and (lots is None or page.get('lots') is not None):
+        return
+    try:
+        page_cache.store(url, page['html'], lots, cache_mode, meta={'backend': page['backend']},
+                         fetched_at=page.get('fetched_at'))
+    except OSError as e:
+        print(f"⚠️  Could not cache {url}: {e}")
+
+
+def scrape_generic_url(url: str, wait_time: int = 5, scrape_all_pages: bool = False, max_workers: int = 1,
+                       wait_strategy: str = 'auto', fetch_backend: str = 'auto', engine: str = 'threads',
+                       cache_mode: str = 'use', render_profile: str = None, page_retries: int = None,
+                       retry_budget: int = None) -> dict:
     """
     Scrape any URL and return structured data
     
     Args:
         url: URL to scrape
-        wait_time: Time to wait for JavaScript rendering (seconds)
+        wait_time: Maximum time to wait for JavaScript rendering (seconds)
         scrape_all_pages: If True, automatically discover and scrape all pages
         max_workers: Number of parallel threads for scraping multiple pages (default: 1)
+        wait_strategy: Readiness policy ('auto', 'lot_cards', 'network_idle', 'pagination', 'fixed')
+        fetch_backend: 'auto', 'browser' or 'http'
+        engine: 'threads' or 'async' for multi-page scrapes
+        cache_mode: 'use', 'refresh' or 'bypass' (see fetch_page)
+        render_profile: Render profile for browser renders (see fetch_page)
+        page_retries: Retries per failed page of a multi-page scrape (None uses PAGE_RETRIES)
+        retry_budget: Retries shared by the pages of a multi-page scrape (None uses RETRY_BUDGET)
         
     Returns:
         Dictionary with scraped data
     """
     # Check if it's the Regal Auctions site and scrape_all_pages is True
     if 'regalauctions.com' in url and scrape_all_pages:
-        return scrape_all_auction_pages(url, wait_time, max_workers)
-    
-    driver = create_driver()
+        return scrape_all_auction_pages(url, wait_time, max_workers, wait_strategy=wait_strategy,
+                                        fetch_backend=fetch_backend, engine=engine, cache_mode=cache_mode,
+                                        render_profile=render_profile, page_retries=page_retries,
+                                        retry_budget=retry_budget)
     
     try:
-        driver.get(url)
-        time.sleep(wait_time)
+        ready_marker = 'lot-card' if 'regalauctions.com' in url else None
+        page = fetch_page(url, fetch_backend, wait_strategy, wait_time, ready_marker, cache_mode, render_profile)
+        fetched = time.perf_counter()
+        timings = dict(page['timings'])
+        with span(timings, 'cache_store'):
+            cache_page(url, page, cache_mode=cache_mode)
+        page_source = page['html']
+        readiness = page['readiness']
         
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'lxml')
+        with span(timings, 'parse'):
+            soup = BeautifulSoup(page_source, 'lxml')
         
         # Extract basic page information
         result = {
@@ -91,7 +229,9 @@ def scrape_generic_url(url: str, wait_time: int = 5, scrape_all_pages: bool = Fa
             'text_content': soup.get_text(separator=' ', strip=True)[:5000],  # First 5000 chars
             'links': [],
             'images': [],
-            'structured_data': {}
+            'structured_data': {},
+            'readiness': readiness,
+            'fetch_backend': page['backend']
         }
         
         # Extract meta description
@@ -115,8 +255,12 @@ def scrape_generic_url(url: str, wait_time: int = 5, scrape_all_pages: bool = Fa
         
         # Check if it's the Regal Auctions site and extract lot data
         if 'regalauctions.com' in url:
-            result['structured_data'] = scrape_regal_auctions(soup, url)
+            with span(timings, 'extract'):
+                result['structured_data'] = scrape_regal_auctions(soup, url)
         
+        timings['total'] = timings['fetch'] + time.perf_counter() - fetched
+        record_page_timings(timings, page['backend'])
+        result['timings'] = rounded(timings)
         return result
         
     except Exception as e:
@@ -125,114 +269,131 @@ def scrape_generic_url(url: str, wait_time: int = 5, scrape_all_pages: bool = Fa
             'error': str(e),
             'success': False
         }
-    finally:
-        driver.quit()
 
 
-def discover_total_pages(base_url, wait_time=5):
+def discover_first_page(url, wait_time=5, wait_strategy='auto', fetch_backend='auto', cache_mode='use',
+                        render_profile=None, on_source=None) -> tuple:
     """
-    Discover the total number of pages available on a website.
-    Returns the total number of pages found.
-    """
-    print(f"\n🔍 Discovering total pages for: {base_url}")
+    Load page 1 and count the pages from its pagination.
+    The render is returned so page 1 can be scraped from it instead of being loaded a second time.
+    on_source sees page 1's HTML as soon as some arrives, so pages can be dispatched from an early
+    pagination hint (see pagination.pagination_hint) before page 1 is ready.
     
-    driver = create_driver()
-    max_page = 1
+    Returns:
+        (total_pages, page) with page as returned by fetch_page(), or (1, None) if page 1 failed to load
+    """
+    first_url = build_page_url(url, 1)
+    print(f"\n🔍 Discovering total pages for: {first_url}")
     
+    start = time.perf_counter()
     try:
-        driver.get(base_url)
-        time.sleep(wait_time)
-        
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        
-        # Strategy 1: Look for "of X" text patterns (most reliable)
-        text_content = soup.get_text()
-        of_pattern = re.search(r'of\s+(\d+)', text_content, re.IGNORECASE)
-        if of_pattern:
-            total_pages = int(of_pattern.group(1))
-            max_page = max(max_page, total_pages)
-            print(f"   Strategy 1 ('of X' pattern): Found {total_pages} pages")
-        
-        # Strategy 2: Look for page select dropdowns
-        select_elements = soup.find_all('select')
-        for select in select_elements:
-            options = select.find_all('option')
-            for option in options:
-                try:
-                    page_num = int(option.get_text().strip())
-                    max_page = max(max_page, page_num)
-                except:
-                    pass
-        
-        if max_page > 1:
-            print(f"   Strategy 2 (select dropdown): Found {max_page} pages")
-        
-        # Strategy 3: Look for "Page X of Y" text
-        page_of_pattern = re.search(r'Page\s+\d+\s+of\s+(\d+)', text_content, re.IGNORECASE)
-        if page_of_pattern:
-            total_pages = int(page_of_pattern.group(1))
-            max_page = max(max_page, total_pages)
-            print(f"   Strategy 3 ('Page X of Y'): Found {total_pages} pages")
-        
-        # Strategy 4: Look for page links with ?page= parameter
-        all_links = soup.find_all('a', href=True)
-        for link in all_links:
-            href = link.get('href', '')
-            match = re.search(r'[?&]page=(\d+)', href)
-            if match:
-                page_num = int(match.group(1))
-                max_page = max(max_page, page_num)
-        
-        if max_page > 1:
-            print(f"   Strategy 4 (URL params): Found max page {max_page}")
-        
-        # Strategy 5: Look for pagination navigation elements
-        pagination = soup.find('nav', {'class': re.compile('pagination', re.IGNORECASE)})
-        if not pagination:
-            pagination = soup.find('div', {'class': re.compile('pagination', re.IGNORECASE)})
-        
-        if pagination:
-            page_links = pagination.find_all('a')
-            for link in page_links:
-                try:
-                    page_num = int(link.get_text().strip())
-                    max_page = max(max_page, page_num)
-                except:
-                    pass
-            if max_page > 1:
-                print(f"   Strategy 5 (pagination nav): Found max page {max_page}")
+        page = fetch_page(first_url, fetch_backend, wait_strategy, wait_time, 'lot-card', cache_mode, render_profile,
+                          on_source=on_source)
+        readiness = page['readiness']
+        print(f"   Page ready after {readiness['latency']:.2f}s ({readiness['strategy']})")
         
+        max_page = count_total_pages(page['html'])
         print(f"✅ Total pages discovered: {max_page}\n")
-        return max_page
+        return max_page, page
         
     except Exception as e:
         print(f"❌ Error discovering pages: {str(e)}")
-        return 1
+        return 1, None
     finally:
-        driver.quit()
+        discovery_seconds.observe(time.perf_counter() - start)
 
 
-def scrape_single_page(url: str, page_num: int, wait_time: int, lock: threading.Lock, progress_queue=None) -> list:
+def discover_total_pages(base_url, wait_time=5, wait_strategy='auto', fetch_backend='auto', cache_mode='use',
+                         render_profile=None):
     """
-    Scrape a single page in a thread
+    Discover the total number of pages available on a website.
+    Returns the total number of pages found.
+    """
+    return discover_first_page(base_url, wait_time, wait_strategy, fetch_backend, cache_mode, render_profile)[0]
+
+
+# Upper bound on pages probed past the last page found by discovery
+MAX_PROBE_PAGES = 200
+
+
+def build_page_url(url: str, page_num: int) -> str:
+    """Return the URL with its page query parameter set to page_num"""
+    parsed = urlparse(url)
+    query_params = parse_qs(parsed.query)
+    query_params['page'] = [str(page_num)]
+    new_query = urlencode(query_params, doseq=True)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
+
+
+def parse_page_lots(page_source: str, page_num: int) -> list:
+    """Extract all valid lots from a rendered auction page"""
+    return extract_lots(page_source, page_num)
+
+
+def record_page_timings(timings: dict, backend: str, scrape_timings: ScrapeTimings = None):
+    """Add a scraped page's timing spans to the /metrics histograms and to its scrape's totals"""
+    for name, seconds in timings.items():
+        if name == 'total':
+            page_seconds.observe(seconds, backend=backend)
+        else:
+            page_span_seconds.observe(seconds, span=name, backend=backend)
+    pages_total.inc(backend=backend, outcome='ok')
+    if scrape_timings is not None:
+        scrape_timings.add_page(timings)
+
+
+def retry_reason(error: Exception) -> str:
+    """Label for the page_retries_total counter"""
+    if isinstance(error, EmptyPageError):
+        return 'empty'
+    return 'driver' if is_driver_failure(error) else 'error'
+
+
+def summarize_timings(scrape_timings: ScrapeTimings, discovery: float, elapsed: float) -> dict:
+    """Timings of a multi-page scrape for its result"""
+    return {
+        'discovery': round(discovery, 3),
+        'pages': round(elapsed, 3),
+        'total': round(discovery + elapsed, 3),
+        'per_page': scrape_timings.summary()
+    }
+
+
+def fetch_single_page(url: str, page_num: int, wait_time: int, lock: threading.Lock, progress_queue=None,
+                      wait_strategy: str = 'auto', fetch_backend: str = 'auto', cache_mode: str = 'use',
+                      prefetched: dict = None, render_profile: str = None, expect_lots: bool = False,
+                      retries: ScrapeRetries = None) -> dict:
+    """
+    Fetch a single page in a thread, retrying it when it fails, and queue it for parsing
+    
+    The thread returns as soon as the page is queued, so it can fetch the next page while this one is
+    parsed; finish_page() collects the lots (see parse_pipeline.as_parsed).
     
     Args:
         url: Base URL
         page_num: Page number to scrape
-        wait_time: Wait time for JavaScript
+        wait_time: Maximum wait time for JavaScript
         lock: Thread lock for printing
         progress_queue: Queue for sending progress updates
+        wait_strategy: Readiness policy name (see wait_strategies.get_wait_strategy)
+        fetch_backend: 'auto', 'browser' or 'http'
+        cache_mode: 'use', 'refresh' or 'bypass' (see fetch_page)
+        prefetched: This page as already loaded by discovery (skips the first fetch)
+        render_profile: Render profile for browser renders (see fetch_page)
+        expect_lots: The page must list lots (it is within the discovered page count); a render without
+                     any lot-card elements is retried instead of being taken as an empty page
+        retries: Retry policy and budget shared by the scrape's pages, which also records pages that
+                 failed for good (defaults to PAGE_RETRIES/RETRY_BUDGET for this page alone)
         
     Returns:
-        List of lots from this page
+        Dictionary with the page, its lots (a parse Future, or the cached lots), timings, attempts and
+        page_url for finish_page(), or None when the page failed after its retries
     """
     # Modify URL to include page number
-    parsed = urlparse(url)
-    query_params = parse_qs(parsed.query)
-    query_params['page'] = [str(page_num)]
-    new_query = urlencode(query_params, doseq=True)
-    page_url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
+    page_url = build_page_url(url, page_num)
+    retries = retries or ScrapeRetries()
+    # Retries always fetch again: the cached copy may be the empty render being retried
+    retry_cache_mode = 'bypass' if cache_mode == 'bypass' else 'refresh'
     
     if progress_queue:
         progress_queue.put({
@@ -241,296 +402,669 @@ def scrape_single_page(url: str, page_num: int, wait_time: int, lock: threading.
             'message': f'Starting page {page_num}...'
         })
     
-    driver = create_driver()
+    start = time.perf_counter()
     
-    try:
-        driver.get(page_url)
-        time.sleep(wait_time)
-        
-        soup = BeautifulSoup(driver.page_source, 'lxml')
-        lot_items = soup.find_all('div', class_='lot-card')
-        
-        lots = []
-        
-        for item in lot_items:
-            lot_data = extract_lot_from_element(item)
-            if lot_data and (lot_data.get('lot_number') or lot_data.get('title')):
-                lot_data['page'] = page_num
-                lots.append(lot_data)
-        
-        with lock:
-            print(f"[Thread] Page {page_num}: Found {len(lots)} lots")
-        
-        if progress_queue:
-            progress_queue.put({
-                'type': 'page_complete',
-                'page': page_num,
-                'lots_found': len(lots),
-                'message': f'Page {page_num}: Found {len(lots)} lots'
-            })
-        
-        return lots
-        
-    except Exception as e:
+    def attempt_page(attempt, previous):
+        attempt_start = time.perf_counter()
+        if attempt == 1 and prefetched:
+            page = prefetched
+        else:
+            page = fetch_page(page_url, fetch_backend, wait_strategy, wait_time, 'lot-card',
+                              cache_mode if attempt == 1 else retry_cache_mode, render_profile,
+                              fresh_session=previous is not None and is_driver_failure(previous))
+        # Checked on the HTML, so an empty render is retried without waiting for its parse
+        if expect_lots and not page.get('lots') and not has_marker(page['html'], 'lot-card'):
+            raise EmptyPageError(f'No lot-card elements on page {page_num}')
+        timings = dict(page['timings'])
+        if attempt > 1:
+            # Failed attempts and their backoff
+            timings['retry'] = attempt_start - start
+        return page, timings, attempt
+    
+    def on_retry(retry, error, delay):
+        page_retries_total.inc(reason=retry_reason(error))
         with lock:
-            print(f"[Thread] Error on page {page_num}: {e}")
-        
+            print(f"🔁 [Thread] Page {page_num} attempt {retry} failed ({describe_error(error)}), "
+                  f"retrying in {delay:.1f}s")
         if progress_queue:
-            progress_queue.put({
-                'type': 'page_error',
-                'page': page_num,
-                'error': str(e),
-                'message': f'Error on page {page_num}: {str(e)}'
-            })
-        
-        return []
-    finally:
-        driver.quit()
+            progress_queue.put(page_retry_event(page_num, retry, error, delay))
+    
+    try:
+        page, timings, attempts = run_with_retries(attempt_page, retries.policy, retries.budget, on_retry,
+                                                   lambda error: not shutting_down.is_set())
+    except PageFailed as failure:
+        report_page_error(page_num, failure.error, failure.attempts, lock, progress_queue, retries)
+        return None
+    
+    lots = page.get('lots')
+    if lots is None:
+        # Parsing runs in a parser process; the browser session has already gone back to the pool
+        lots = parser_pipeline.submit(page['html'], page_num, timings)
+    return {'page': page, 'page_url': page_url, 'lots': lots, 'timings': timings, 'attempts': attempts,
+            'fetched': time.perf_counter()}
 
 
-def scrape_all_auction_pages(url: str, wait_time: int = 30, max_workers: int = 1, progress_queue=None) -> dict:
+def finish_page(page_num: int, fetched: dict, lock: threading.Lock, progress_queue=None, readiness: dict = None,
+                stream_lots: bool = False, cache_mode: str = 'use', scrape_timings: ScrapeTimings = None,
+                retries: ScrapeRetries = None) -> list:
     """
-    Automatically discover total pages and scrape all of them
+    Collect a page queued by fetch_single_page() once its parse has finished
     
     Args:
-        url: Base URL to scrape
-        wait_time: Wait time for JavaScript
-        max_workers: Maximum concurrent threads
+        page_num: Page number
+        fetched: fetch_single_page() result
+        lock: Thread lock for printing
         progress_queue: Queue for sending progress updates
+        readiness: Optional dict that receives this page's readiness result keyed by page number
+        stream_lots: Also send this page's lots as a 'lots_batch' progress event
+        cache_mode: 'use', 'refresh' or 'bypass' (see fetch_page)
+        scrape_timings: Receives this page's timing spans (also sent in the page_complete event)
+        retries: Records the page as failed when its parse fails
         
     Returns:
-        Dictionary with all scraped data
+        List of lots from this page ([] when its parse failed)
     """
+    page, timings, attempts = fetched['page'], fetched['timings'], fetched['attempts']
+    retries = retries or ScrapeRetries()
+    lots = fetched['lots']
+    parsed = isinstance(lots, Future)
+    if parsed:
+        try:
+            lots = lots.result()
+        except Exception as e:
+            report_page_error(page_num, e, attempts, lock, progress_queue, retries)
+            return []
+        with span(timings, 'cache_store'):
+            cache_page(fetched['page_url'], page, lots, cache_mode)
+    # A prefetched page was fetched during discovery; its fetch still counts towards the page
+    timings['total'] = timings.get('retry', 0.0) + timings['fetch'] + time.perf_counter() - fetched['fetched']
+    
+    page_ready = dict(page['readiness'], backend=page['backend'])
+    record_page_timings(timings, page['backend'], scrape_timings)
+    if attempts > 1:
+        retries.recovered(page_num, attempts)
+    
+    with lock:
+        print(f"[Thread] Page {page_num}: Found {len(lots)} lots (ready in {page_ready['latency']:.2f}s)")
+        if readiness is not None:
+            readiness[page_num] = page_ready
+    
     if progress_queue:
         progress_queue.put({
-            'type': 'discovery_start',
-            'message': 'Discovering total pages...'
+            'type': 'page_complete',
+            'page': page_num,
+            'lots_found': len(lots),
+            'ready_latency': page_ready['latency'],
+            'backend': page['backend'],
+            'attempts': attempts,
+            'timings': rounded(timings),
+            'message': f'Page {page_num}: Found {len(lots)} lots'
         })
+        if stream_lots:
+            progress_queue.put(lots_batch_event(page_num, lots))
     
-    print(f"Discovering total pages for: {url}")
-    total_pages = discover_total_pages(url, wait_time)
-    print(f"Found {total_pages} pages to scrape")
+    return lots
+
+
+def report_page_error(page_num: int, error: Exception, attempts: int, lock: threading.Lock, progress_queue,
+                      retries: ScrapeRetries):
+    """Record, print and send a page that failed for good"""
+    e = describe_error(error)
+    pages_total.inc(backend='none', outcome='error')
+    retries.failed(page_num, error, attempts)
+    with lock:
+        print(f"[Thread] Error on page {page_num} after {attempts} attempt(s): {e}")
     
     if progress_queue:
         progress_queue.put({
-            'type': 'discovery_complete',
-            'total_pages': total_pages,
-            'message': f'Found {total_pages} pages to scrape'
+            'type': 'page_error',
+            'page': page_num,
+            'error': e,
+            'attempts': attempts,
+            'message': f'Error on page {page_num}: {e}'
         })
+
+
+def scrape_all_auction_pages(url: str, wait_time: int = 30, max_workers: int = 1, progress_queue=None,
+                             wait_strategy: str = 'auto', fetch_backend: str = 'auto', engine: str = 'threads',
+                             stream_lots: bool = False, cache_mode: str = 'use', render_profile: str = None,
+                             page_retries: int = None, retry_budget: int = None) -> dict:
+    """
+    Automatically discover total pages and scrape all of them
     
-    all_lots = []
-    lock = threading.Lock()
-    
-    print(f"Starting parallel scraping with {max_workers} threads...")
+    Args:
+        url: Base URL to scrape
+        wait_time: Maximum wait time for JavaScript
+        max_workers: Maximum concurrent threads (pages in flight for the async engine)
+        progress_queue: Queue for sending progress updates
+        wait_strategy: Readiness policy name (see wait_strategies.get_wait_strategy)
+        fetch_backend: 'auto', 'browser' or 'http'
+        engine: 'threads' (one worker thread per in-flight page) or 'async' (asyncio event loop)
+        stream_lots: Send each page's lots as a 'lots_batch' progress event as soon as it is parsed
+        cache_mode: 'use', 'refresh' or 'bypass' (see fetch_page)
+        render_profile: Render profile for browser renders (see fetch_page)
+        page_retries: Retries per failed page (None uses PAGE_RETRIES)
+        retry_budget: Retries shared by all pages of the scrape (None uses RETRY_BUDGET)
+        
+    Returns:
+        Dictionary with all scraped data; failed_pages lists the pages that failed after their retries, and
+        probe_capped is set when probing stopped at MAX_PROBE_PAGES while pages were still full
+    """
+    if engine == 'async':
+        return asyncio.run(scrape_all_auction_pages_async(url, wait_time, max_workers, progress_queue,
+                                                          wait_strategy, fetch_backend, stream_lots, cache_mode,
+                                                          render_profile, page_retries, retry_budget))
     
     if progress_queue:
         progress_queue.put({
-            'type': 'scraping_start',
-            'total_pages': total_pages,
-            'max_workers': max_workers,
-            'message': f'Starting parallel scraping with {max_workers} threads...'
+            'type': 'discovery_start',
+            'message': 'Discovering total pages...'
         })
     
-    start_time = time.time()
+    page_lots = {}
+    readiness = {}
+    scrape_timings = ScrapeTimings()
+    retries = ScrapeRetries.from_options(page_retries, retry_budget)
+    lock = threading.Lock()
     
-    # Use ThreadPoolExecutor for parallel scraping
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(scrape_single_page, url, page, wait_time, lock, progress_queue): page 
-            for page in range(1, total_pages + 1)
+    def dispatch(executor, pages, expect_lots, prefetched=None):
+        # Each page is fetched in a copy of this context so its browser checkout queues under the scrape's
+        # ticket. Pages within a multi-page count must list lots (a lone page may be an empty auction);
+        # past the count, an empty page ends the probing.
+        return {
+            executor.submit(contextvars.copy_context().run, fetch_single_page, url, page, wait_time, lock,
+                            progress_queue, wait_strategy, fetch_backend, cache_mode, prefetched, render_profile,
+                            expect_lots, retries): page
+            for page in pages
         }
-        
-        for future in as_completed(futures):
-            page = futures[future]
+    
+    def collect(futures):
+        # Fetch threads move on once their page is queued for parsing; the lots are collected here as each
+        # parse finishes
+        results = {}
+        for page, future in as_parsed(futures):
             try:
-                lots = future.result()
-                with lock:
-                    all_lots.extend(lots)
+                fetched = future.result()
             except Exception as e:
                 print(f"Exception for page {page}: {e}")
+                fetched = None
+            results[page] = [] if fetched is None else finish_page(page, fetched, lock, progress_queue, readiness,
+                                                                   stream_lots, cache_mode, scrape_timings,
+                                                                   retries)
+        return results
     
+    # Use ThreadPoolExecutor for parallel scraping
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        hinted = 1  # last page dispatched from a pagination hint while page 1 was still loading
+        
+        def on_source(html):
+            nonlocal hinted
+            hint = pagination_hint(html)
+            if hint and hint > hinted:
+                print(f"Pagination hints at {hint} pages, dispatching pages {hinted + 1}-{hint}")
+                if progress_queue:
+                    progress_queue.put(pagination_hint_event(hinted, hint))
+                futures.update(dispatch(executor, range(hinted + 1, hint + 1), True))
+                hinted = hint
+        
+        # Discovery renders page 1; that render is scraped as page 1 rather than loaded again. Pages 2..N are
+        # dispatched from the first pagination hint in page 1's HTML, without waiting for page 1 to be ready.
+        print(f"Discovering total pages for: {url}")
+        discovery_start = time.perf_counter()
+        total_pages, first_page = discover_first_page(url, wait_time, wait_strategy, fetch_backend, cache_mode,
+                                                      render_profile, on_source)
+        discovery_time = time.perf_counter() - discovery_start
+        total_pages = max(total_pages, hinted)
+        print(f"Found {total_pages} pages to scrape")
+        
+        if progress_queue:
+            progress_queue.put({
+                'type': 'discovery_complete',
+                'total_pages': total_pages,
+                'message': f'Found {total_pages} pages to scrape'
+            })
+        
+        print(f"Starting parallel scraping with {max_workers} threads...")
+        
+        if progress_queue:
+            progress_queue.put({
+                'type': 'scraping_start',
+                'total_pages': total_pages,
+                'max_workers': max_workers,
+                'message': f'Starting parallel scraping with {max_workers} threads...'
+            })
+        
+        start_time = time.time()
+        futures.update(dispatch(executor, range(hinted + 1, total_pages + 1), True))
+        if first_page:
+            # Page 1 is already loaded: queue its parse here rather than behind the dispatched pages
+            page_one = Future()
+            page_one.set_result(fetch_single_page(url, 1, wait_time, lock, progress_queue, wait_strategy,
+                                                  fetch_backend, cache_mode, first_page, render_profile,
+                                                  total_pages > 1, retries))
+            futures[page_one] = 1
+        else:
+            futures.update(dispatch(executor, [1], total_pages > 1))
+        page_lots.update(collect(futures))
+        
+        # A full last page means pagination may be missing or only hint at the next page: probe ahead
+        # (one page, then max_workers at a time) until a page has no lots
+        discovered = total_pages
+        probe_capped = False
+        page_size = len(page_lots.get(1, []))
+        if page_lots.get(total_pages) and len(page_lots[total_pages]) >= page_size:
+            batch_size = 1
+            while total_pages < MAX_PROBE_PAGES:
+                batch = range(total_pages + 1, min(total_pages + batch_size, MAX_PROBE_PAGES) + 1)
+                print(f"Probing pages {batch.start}-{batch.stop - 1}...")
+                results = collect(dispatch(executor, batch, False))
+                for page in batch:
+                    if not results[page]:
+                        break
+                    page_lots[page] = results[page]
+                    total_pages = page
+                if total_pages < batch.stop - 1 or len(page_lots[total_pages]) < page_size:
+                    break
+                batch_size = max_workers
+            else:
+                probe_capped = True
+            
+            if total_pages > discovered and progress_queue:
+                progress_queue.put({
+                    'type': 'discovery_complete',
+                    'total_pages': total_pages,
+                    'message': f'Probing found {total_pages} pages'
+                })
+            if probe_capped:
+                print(f"⚠️  Stopped probing at MAX_PROBE_PAGES ({MAX_PROBE_PAGES}); page {total_pages} was full")
+                if progress_queue:
+                    progress_queue.put(probe_capped_event(total_pages))
+    
+    all_lots = [lot for page in sorted(page_lots) for lot in page_lots[page]]
     elapsed_time = time.time() - start_time
     
     print(f"Scraping completed in {elapsed_time:.2f} seconds")
     print(f"Total lots scraped: {len(all_lots)}")
+    if scrape_timings.summary()['pages']:
+        print(f"⏱️  Average page: {scrape_timings.describe()}")
+    failed_pages = report_failed_pages(retries)
     
     if progress_queue:
         progress_queue.put({
             'type': 'scraping_complete',
             'total_lots': len(all_lots),
             'elapsed_time': elapsed_time,
-            'message': f'Scraping completed! Found {len(all_lots)} lots in {elapsed_time:.2f}s'
+            'timings': summarize_timings(scrape_timings, discovery_time, elapsed_time),
+            'failed_pages': failed_pages,
+            'retries': retries.summary(),
+            'message': completion_message(len(all_lots), elapsed_time, failed_pages)
         })
     
     return {
         'type': 'regal_auctions',
         'total_pages': total_pages,
+        'probe_capped': probe_capped,
         'total_lots': len(all_lots),
         'scraping_time': f"{elapsed_time:.2f}s",
+        'readiness': summarize_readiness(readiness, wait_strategy),
+        'timings': summarize_timings(scrape_timings, discovery_time, elapsed_time),
+        'failed_pages': failed_pages,
+        'retries': retries.summary(),
         'lots': all_lots
     }
 
 
-def extract_lot_from_element(item) -> dict:
-    """Extract lot data from a BeautifulSoup element"""
-    try:
-        # Extract lot number
-        lot_number_elem = item.find('div', class_='lot-number')
-        lot_number = lot_number_elem.find('strong').get_text(strip=True) if lot_number_elem and lot_number_elem.find('strong') else ""
-        
-        # Extract title
-        title_elem = item.find('div', class_='lot__name')
-        title = title_elem.get_text(strip=True) if title_elem else ""
-        
-        # Extract description
-        desc_elem = item.find('div', class_='lot__description')
-        description = desc_elem.get_text(strip=True) if desc_elem else ""
-        
-        # Extract image
-        img_elem = item.find('img')
-        image_url = img_elem.get('src', '') if img_elem else ""
-        
-        # Extract link
-        link_elem = desc_elem.find('a') if desc_elem else None
-        lot_url = link_elem.get('href', '') if link_elem else ""
-        
-        # Extract bidding info
-        bid_elem = item.find('div', class_='lot__bidding')
-        starting_bid = ""
-        if bid_elem:
-            bid_match = bid_elem.find('span', class_='fs-4')
-            if bid_match:
-                starting_bid = bid_match.get_text(strip=True)
-        
-        # Extract table data
-        odometer = ""
-        engine = ""
-        declarations = ""
-        options = ""
-        reserve_price = ""
-        
-        if desc_elem:
-            table = desc_elem.find('table')
-            if table:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        key = cells[0].get_text(strip=True).upper()
-                        value = cells[1].get_text(strip=True)
-                        
-                        if 'ODOMETER' in key:
-                            odometer = value
-                        elif 'ENGINE' in key:
-                            engine = value
-                        elif 'DECLARATION' in key:
-                            declarations = value
-                        elif 'OPTIONS' in key:
-                            options = value
-                        elif 'RESERVE' in key:
-                            reserve_price = value
-        
-        return {
-            'lot_number': lot_number,
-            'title': title,
-            'description': description[:500],
-            'image_url': image_url,
-            'lot_url': lot_url,
-            'starting_bid': starting_bid,
-            'reserve_price': reserve_price,
-            'odometer': odometer,
-            'engine': engine,
-            'declarations': declarations,
-            'options': options,
-        }
-    except Exception as e:
-        return {}
+def report_failed_pages(retries: ScrapeRetries) -> list:
+    """Print the pages that failed for good and return them for the scrape result"""
+    failed_pages = retries.failed_pages()
+    stats = retries.summary()
+    if stats['used']:
+        print(f"🔁 Retries: {stats['used']} of {stats['budget']} used, "
+              f"{len(stats['recovered_pages'])} page(s) recovered")
+    if failed_pages:
+        print(f"⚠️  {len(failed_pages)} page(s) failed: "
+              + ', '.join(f"{failure['page']} ({failure['error']})" for failure in failed_pages))
+    return failed_pages
 
 
-def scrape_regal_auctions(soup: BeautifulSoup, url: str) -> dict:
-    """Extract structured data from Regal Auctions pages"""
-    lots = []
+def completion_message(total_lots: int, elapsed_time: float, failed_pages: list) -> str:
+    """scraping_complete message, naming the pages that are missing from the result"""
+    message = f'Scraping completed! Found {total_lots} lots in {elapsed_time:.2f}s'
+    if failed_pages:
+        message += f" ({len(failed_pages)} page(s) failed: {', '.join(str(f['page']) for f in failed_pages)})"
+    return message
+
+
+def summarize_readiness(readiness: dict, wait_strategy: str) -> dict:
+    """Aggregate per-page readiness results for the job result"""
+    latencies = [r['latency'] for r in readiness.values()]
+    return {
+        'strategy': wait_strategy,
+        'avg_latency': round(sum(latencies) / len(latencies), 3) if latencies else None,
+        'max_latency': max(latencies) if latencies else None,
+        'pages': {str(page): r for page, r in sorted(readiness.items())}
+    }
+
+
+def page_retry_event(page_num: int, attempt: int, error: Exception, delay: float) -> dict:
+    """Progress event for a failed page attempt that will be retried after delay seconds"""
+    return {
+        'type': 'page_retry',
+        'page': page_num,
+        'attempt': attempt,
+        'delay': round(delay, 3),
+        'error': describe_error(error),
+        'message': f'Page {page_num}: attempt {attempt} failed, retrying in {delay:.1f}s ({describe_error(error)})'
+    }
+
+
+def pagination_hint_event(dispatched: int, hint: int) -> dict:
+    """Progress event for pages dispatched from a pagination hint while page 1 is still loading"""
+    return {
+        'type': 'pagination_hint',
+        'total_pages': hint,
+        'message': f'Pagination hints at {hint} pages, starting pages {dispatched + 1}-{hint}'
+    }
+
+
+def probe_capped_event(total_pages: int) -> dict:
+    """Progress event for probing that stopped at MAX_PROBE_PAGES while pages were still full"""
+    return {
+        'type': 'probe_capped',
+        'total_pages': total_pages,
+        'max_probe_pages': MAX_PROBE_PAGES,
+        'message': f'Stopped probing at {MAX_PROBE_PAGES} pages; the auction may have more pages'
+    }
+
+
+def lots_batch_event(page_num: int, lots: list) -> dict:
+    """Progress event carrying one page's lots"""
+    return {
+        'type': 'lots_batch',
+        'page': page_num,
+        'count': len(lots),
+        'lots': lots,
+        'message': f'Page {page_num}: Streamed {len(lots)} lots'
+    }
+
+
+def strip_streamed_data(result: dict) -> dict:
+    """Summary of a scrape result without the lots (already streamed) or the raw HTML"""
+    summary = {key: value for key, value in result.items() if key not in ('lots', 'raw_html')}
+    if isinstance(summary.get('structured_data'), dict):
+        summary['structured_data'] = {key: value for key, value in summary['structured_data'].items()
+                                      if key != 'lots'}
+    summary['lots_streamed'] = True
+    return summary
+
+
+async def scrape_all_auction_pages_async(url: str, wait_time: int = 30, max_concurrency: int = 10,
+                                         progress_queue=None, wait_strategy: str = 'auto',
+                                         fetch_backend: str = 'auto', stream_lots: bool = False,
+                                         cache_mode: str = 'use', render_profile: str = None,
+                                         page_retries: int = None, retry_budget: int = None) -> dict:
+    """
+    Asyncio version of scrape_all_auction_pages with the same result shape and progress events.
+    Pages are fetched on one event loop; browser renders run in threads and parsing in parser processes.
     
-    # Find all lot cards
-    lot_items = soup.find_all('div', class_='lot-card')
+    Args:
+        url: Base URL to scrape
+        wait_time: Maximum wait time for JavaScript
+        max_concurrency: Maximum pages in flight at once
+        progress_queue: Queue for sending progress updates
+        wait_strategy: Readiness policy name (see wait_strategies.get_wait_strategy)
+        fetch_backend: 'auto', 'browser' or 'http'
+        stream_lots: Send each page's lots as a 'lots_batch' progress event as soon as it is parsed
+        cache_mode: 'use', 'refresh' or 'bypass' (see fetch_page)
+        render_profile: Render profile for browser renders (see fetch_page)
+        page_retries: Retries per failed page (None uses PAGE_RETRIES)
+        retry_budget: Retries shared by all pages of the scrape (None uses RETRY_BUDGET)
+        
+    Returns:
+        Dictionary with all scraped data; failed_pages lists the pages that failed after their retries
+    """
+    def emit(event):
+        if progress_queue:
+            progress_queue.put(event)
     
-    for item in lot_items:
-        try:
-            # Extract lot number
-            lot_number_elem = item.find('div', class_='lot-number')
-            lot_number = lot_number_elem.find('strong').get_text(strip=True) if lot_number_elem and lot_number_elem.find('strong') else ""
-            
-            # Extract title
-            title_elem = item.find('div', class_='lot__name')
-            title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            # Extract description
-            desc_elem = item.find('div', class_='lot__description')
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
-            
-            # Extract image
-            img_elem = item.find('img')
-            image_url = img_elem.get('src', '') if img_elem else ""
+    async with AsyncFetcher(fetcher, max_connections=max(max_concurrency, 1), timeout=max(wait_time, 1)) as async_fetcher:
+        async def fetch_cached(page_url, mode=cache_mode, fresh_session=False, on_source=None):
+            # Same contract as fetch_page(), with misses going through the async fetcher
+            start = time.perf_counter()
+            page = await asyncio.to_thread(cached_page, page_url, mode)
+            if not page:
+                if shutting_down.is_set():
+                    raise RuntimeError('Server is shutting down')
+                page = await async_fetcher.fetch(page_url, fetch_backend, wait_strategy, wait_time,
+                                                 ready_marker='lot-card', render_profile=render_profile,
+                                                 fresh_session=fresh_session, on_source=on_source)
+            page['timings']['fetch'] = time.perf_counter() - start
+            return page
+        
+        readiness = {}
+        scrape_timings = ScrapeTimings()
+        retries = ScrapeRetries.from_options(page_retries, retry_budget)
+        retry_cache_mode = 'bypass' if cache_mode == 'bypass' else 'refresh'
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        
+        async def scrape_page(page_num, prefetched=None, expect_lots=False):
+            page_url = build_page_url(url, page_num)
+            start = time.perf_counter()
             
-            # Extract link
-            link_elem = desc_elem.find('a') if desc_elem else None
-            lot_url = link_elem.get('href', '') if link_elem else ""
+            async def attempt_page(attempt, previous):
+                # A page waiting out its backoff gives its slot to other pages; page 1 as loaded by discovery
+                # needs no slot, so its parse is not queued behind the pages dispatched meanwhile
+                async with contextlib.nullcontext() if attempt == 1 and prefetched else semaphore:
+                    if attempt == 1:
+                        emit({'type': 'page_start', 'page': page_num, 'message': f'Starting page {page_num}...'})
+                    attempt_start = time.perf_counter()
+                    if attempt == 1 and prefetched:
+                        page = prefetched
+                    else:
+                        page = await fetch_cached(page_url, cache_mode if attempt == 1 else retry_cache_mode,
+                                                  previous is not None and is_driver_failure(previous))
+                    fetched = time.perf_counter()
+                    timings = dict(page['timings'])
+                    lots = page.get('lots')
+                    parsed = lots is None
+                    if parsed:
+                        # submit() may block on the bounded parse queue, so hand off from a thread
+                        parse_future = await asyncio.to_thread(parser_pipeline.submit, page['html'], page_num,
+                                                               timings)
+                        lots = await asyncio.wrap_future(parse_future)
+                    if expect_lots and not lots and not has_marker(page['html'], 'lot-card'):
+                        raise EmptyPageError(f'No lot-card elements on page {page_num}')
+                    if parsed:
+                        store_start = time.perf_counter()
+                        await asyncio.to_thread(cache_page, page_url, page, lots, cache_mode)
+                        timings['cache_store'] = time.perf_counter() - store_start
+                    if attempt > 1:
+                        timings['retry'] = attempt_start - start
+                    timings['total'] = timings.get('retry', 0.0) + timings['fetch'] + time.perf_counter() - fetched
+                    return page, lots, timings, attempt
             
-            # Extract bidding info
-            bid_elem = item.find('div', class_='lot__bidding')
-            starting_bid = ""
-            if bid_elem:
-                bid_match = bid_elem.find('span', class_='fs-4')
-                if bid_match:
-                    starting_bid = bid_match.get_text(strip=True)
+            def on_retry(retry, error, delay):
+                page_retries_total.inc(reason=retry_reason(error))
+                print(f"🔁 [Async] Page {page_num} attempt {retry} failed ({describe_error(error)}), "
+                      f"retrying in {delay:.1f}s")
+                emit(page_retry_event(page_num, retry, error, delay))
             
-            # Extract table data
-            odometer = ""
-            engine = ""
-            declarations = ""
-            options = ""
-            reserve_price = ""
+            try:
+                page, lots, timings, attempts = await run_with_retries_async(
+                    attempt_page, retries.policy, retries.budget, on_retry, lambda error: not shutting_down.is_set())
+            except PageFailed as failure:
+                e = describe_error(failure.error)
+                pages_total.inc(backend='none', outcome='error')
+                retries.failed(page_num, failure.error, failure.attempts)
+                print(f"[Async] Error on page {page_num} after {failure.attempts} attempt(s): {e}")
+                emit({
+                    'type': 'page_error',
+                    'page': page_num,
+                    'error': e,
+                    'attempts': failure.attempts,
+                    'message': f'Error on page {page_num}: {e}'
+                })
+                return []
             
-            if desc_elem:
-                table = desc_elem.find('table')
-                if table:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            key = cells[0].get_text(strip=True).upper()
-                            value = cells[1].get_text(strip=True)
-                            
-                            if 'ODOMETER' in key:
-                                odometer = value
-                            elif 'ENGINE' in key:
-                                engine = value
-                            elif 'DECLARATION' in key:
-                                declarations = value
-                            elif 'OPTIONS' in key:
-                                options = value
-                            elif 'RESERVE' in key:
-                                reserve_price = value
+            record_page_timings(timings, page['backend'], scrape_timings)
+            if attempts > 1:
+                retries.recovered(page_num, attempts)
+            readiness[page_num] = dict(page['readiness'], backend=page['backend'])
             
-            lot_data = {
-                'lot_number': lot_number,
-                'title': title,
-                'description': description[:500],
-                'image_url': image_url,
-                'lot_url': lot_url,
-                'starting_bid': starting_bid,
-                'reserve_price': reserve_price,
-                'odometer': odometer,
-                'engine': engine,
-                'declarations': declarations,
-                'options': options,
-            }
-            
-            if lot_data['lot_number'] or lot_data['title']:
-                lots.append(lot_data)
-                
+            print(f"[Async] Page {page_num}: Found {len(lots)} lots (ready in {page['readiness']['latency']:.2f}s)")
+            emit({
+                'type': 'page_complete',
+                'page': page_num,
+                'lots_found': len(lots),
+                'ready_latency': page['readiness']['latency'],
+                'backend': page['backend'],
+                'attempts': attempts,
+                'timings': rounded(timings),
+                'message': f'Page {page_num}: Found {len(lots)} lots'
+            })
+            if stream_lots:
+                emit(lots_batch_event(page_num, lots))
+            return lots
+        
+        tasks = {}  # page -> its scrape_page() task
+        hinted = 1  # last page dispatched from a pagination hint while page 1 was still loading
+        loop = asyncio.get_running_loop()
+        
+        def dispatch(pages):
+            for page in pages:
+                if page not in tasks:
+                    tasks[page] = asyncio.ensure_future(scrape_page(page, expect_lots=True))
+        
+        def dispatch_hinted(hint):
+            nonlocal hinted
+            if hint > hinted:
+                print(f"Pagination hints at {hint} pages, dispatching pages {hinted + 1}-{hint}")
+                emit(pagination_hint_event(hinted, hint))
+                dispatch(range(hinted + 1, hint + 1))
+                hinted = hint
+        
+        def on_source(html):
+            # Runs on the event loop for HTTP responses and in the render thread for browser renders
+            hint = pagination_hint(html)
+            if hint:
+                loop.call_soon_threadsafe(dispatch_hinted, hint)
+        
+        emit({'type': 'discovery_start', 'message': 'Discovering total pages...'})
+        
+        # Discovery renders page 1; that render is scraped as page 1 rather than loaded again. Pages 2..N are
+        # dispatched from the first pagination hint in page 1's HTML (see scrape_all_auction_pages).
+        print(f"Discovering total pages for: {url}")
+        discovery_start = time.perf_counter()
+        try:
+            first_page = await fetch_cached(build_page_url(url, 1), on_source=on_source)
+            total_pages = await asyncio.to_thread(count_total_pages, first_page['html'])
         except Exception as e:
-            continue
+            print(f"❌ Error discovering pages: {str(e)}")
+            first_page, total_pages = None, 1
+        discovery_time = time.perf_counter() - discovery_start
+        discovery_seconds.observe(discovery_time)
+        total_pages = max(total_pages, hinted)
+        print(f"Found {total_pages} pages to scrape")
+        
+        emit({
+            'type': 'discovery_complete',
+            'total_pages': total_pages,
+            'message': f'Found {total_pages} pages to scrape'
+        })
+        
+        print(f"Starting async scraping with up to {max_concurrency} pages in flight...")
+        emit({
+            'type': 'scraping_start',
+            'total_pages': total_pages,
+            'max_workers': max_concurrency,
+            'message': f'Starting async scraping with up to {max_concurrency} pages in flight...'
+        })
+        
+        start_time = time.time()
+        # Pages within a discovered multi-page count must list lots (see scrape_all_auction_pages)
+        dispatch(range(2, total_pages + 1))
+        tasks[1] = asyncio.ensure_future(scrape_page(1, first_page, total_pages > 1))
+        results = await asyncio.gather(*tasks.values())
+        page_lots = dict(zip(tasks, results))
+        total_pages = max(page_lots)
+        
+        # A full last page means pagination may be missing or only hint at the next page: probe ahead
+        # (one page, then max_concurrency at a time) until a page has no lots
+        discovered = total_pages
+        probe_capped = False
+        page_size = len(page_lots.get(1, []))
+        if page_lots.get(total_pages) and len(page_lots[total_pages]) >= page_size:
+            batch_size = 1
+            while total_pages < MAX_PROBE_PAGES:
+                batch = range(total_pages + 1, min(total_pages + batch_size, MAX_PROBE_PAGES) + 1)
+                print(f"Probing pages {batch.start}-{batch.stop - 1}...")
+                results = await asyncio.gather(*(scrape_page(page) for page in batch))
+                for page, lots in zip(batch, results):
+                    if not lots:
+                        break
+                    page_lots[page] = lots
+                    total_pages = page
+                if total_pages < batch.stop - 1 or len(page_lots[total_pages]) < page_size:
+                    break
+                batch_size = max(max_concurrency, 1)
+            else:
+                probe_capped = True
+            
+            if total_pages > discovered:
+                emit({
+                    'type': 'discovery_complete',
+                    'total_pages': total_pages,
+                    'message': f'Probing found {total_pages} pages'
+                })
+            if probe_capped:
+                print(f"⚠️  Stopped probing at MAX_PROBE_PAGES ({MAX_PROBE_PAGES}); page {total_pages} was full")
+                emit(probe_capped_event(total_pages))
+        
+        all_lots = [lot for page in sorted(page_lots) for lot in page_lots[page]]
+        elapsed_time = time.time() - start_time
+    
+    print(f"Scraping completed in {elapsed_time:.2f} seconds")
+    print(f"Total lots scraped: {len(all_lots)}")
+    if scrape_timings.summary()['pages']:
+        print(f"⏱️  Average page: {scrape_timings.describe()}")
+    failed_pages = report_failed_pages(retries)
+    
+    emit({
+        'type': 'scraping_complete',
+        'total_lots': len(all_lots),
+        'elapsed_time': elapsed_time,
+        'timings': summarize_timings(scrape_timings, discovery_time, elapsed_time),
+        'failed_pages': failed_pages,
+        'retries': retries.summary(),
+        'message': completion_message(len(all_lots), elapsed_time, failed_pages)
+    })
+    
+    return {
+        'type': 'regal_auctions',
+        'total_pages': total_pages,
+        'probe_capped': probe_capped,
+        'total_lots': len(all_lots),
+        'scraping_time': f"{elapsed_time:.2f}s",
+        'readiness': summarize_readiness(readiness, wait_strategy),
+        'timings': summarize_timings(scrape_timings, discovery_time, elapsed_time),
+        'failed_pages': failed_pages,
+        'retries': retries.summary(),
+        'lots': all_lots
+    }
+
+
+def extract_lot_from_element(item) -> dict:
+    """Extract lot data from a BeautifulSoup element"""
+    try:
+        return extract_lot_from_soup(item)
+    except Exception as e:
+        return {}
+
+
+def scrape_regal_auctions(soup: BeautifulSoup, url: str) -> dict:
+    """Extract structured data from Regal Auctions pages"""
+    lots = extract_lots_from_soup(soup)
     
     return {
         'type': 'regal_auctions',
@@ -539,6 +1073,230 @@ def scrape_regal_auctions(soup: BeautifulSoup, url: str) -> dict:
     }
 
 
+def parse_scrape_options(data) -> tuple:
+    """
+    Validate a scrape request body
+    
+    Returns:
+        (options, None) on success or (None, error message) when the body is invalid
+    """
+    if not data or 'url' not in data:
+        return None, 'URL is required in request body'
+    
+    options = {
+        'url': data['url'],
+        'wait_time': data.get('wait_time', 5),
+        'scrape_all_pages': data.get('scrape_all_pages', False),
+        'max_workers': data.get('max_workers', 1),
+        'wait_strategy': data.get('wait_strategy', 'auto'),
+        'fetch_backend': data.get('fetch_backend', 'auto'),
+        'engine': data.get('engine', 'threads'),
+        'stream_lots': bool(data.get('stream_lots', False)),
+        'cache': data.get('cache', 'use'),
+        'lot_format': data.get('lot_format', 'records'),
+        'include_html': bool(data.get('include_html', True)),
+        'render_profile': data.get('render_profile', DEFAULT_RENDER_PROFILE),
+        'page_retries': data.get('page_retries'),
+        'retry_budget': data.get('retry_budget'),
+    }
+    
+    if options['wait_strategy'] != 'auto' and options['wait_strategy'] not in WAIT_STRATEGIES:
+        return None, f"Unknown wait_strategy '{options['wait_strategy']}'. Use one of: auto, {', '.join(WAIT_STRATEGIES)}"
+    if options['fetch_backend'] not in FETCH_BACKENDS:
+        return None, f"Unknown fetch_backend '{options['fetch_backend']}'. Use one of: {', '.join(FETCH_BACKENDS)}"
+    if options['engine'] not in SCRAPE_ENGINES:
+        return None, f"Unknown engine '{options['engine']}'. Use one of: {', '.join(SCRAPE_ENGINES)}"
+    if options['cache'] not in CACHE_MODES:
+        return None, f"Unknown cache mode '{options['cache']}'. Use one of: {', '.join(CACHE_MODES)}"
+    if options['render_profile'] not in RENDER_PROFILES:
+        return None, f"Unknown render_profile '{options['render_profile']}'. Use one of: {', '.join(RENDER_PROFILES)}"
+    if options['lot_format'] not in LOT_FORMATS:
+        return None, f"Unknown lot_format '{options['lot_format']}'. Use one of: {', '.join(LOT_FORMATS)}"
+    if isinstance(options['max_workers'], bool) or not isinstance(options['max_workers'], int) \
+            or options['max_workers'] < 1:
+        return None, 'max_workers must be a positive integer'
+    options['max_workers'] = min(options['max_workers'], MAX_SCRAPE_WORKERS)
+    for name in ('page_retries', 'retry_budget'):
+        value = options[name]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            return None, f'{name} must be a non-negative integer'
+    if options['page_retries'] is not None:
+        options['page_retries'] = min(options['page_retries'], MAX_PAGE_RETRIES)
+    
+    return options, None
+
+
+def scrape_workers(requested: int, fetch_backend: str) -> int:
+    """
+    Worker threads for one scrape: the requested count, lowered to the browser sessions that currently
+    fit in memory (more threads would only wait in the browser queue); plain HTTP scrapes need no browser
+    """
+    if fetch_backend == 'http':
+        return requested
+    return max(1, min(requested, driver_pool.session_limit()))
+
+
+def lot_source(url: str) -> tuple:
+    """
+    (auction_id, date) that a scraped URL's lots are stored under
+    
+    Regal Auctions URLs use their auction ID and date; other sites use host + path and an empty date.
+    """
+    parsed = urlparse(url)
+    match = re.search(r'/auctions/(\d+)', parsed.path)
+    auction_id = match.group(1) if match else parsed.netloc.lower() + parsed.path.rstrip('/')
+    return auction_id, parse_qs(parsed.query).get('date', [''])[0]
+
+
+def store_scrape_lots(url: str, result: dict):
+    """
+    Upsert a scrape result's lots into the lot store and point the result at GET /lots
+    
+    Lots without a lot number are left out, since the store is keyed by it.
+    """
+    if not isinstance(result, dict):
+        return
+    lots = result.get('lots')
+    if lots is None and isinstance(result.get('structured_data'), dict):
+        lots = result['structured_data'].get('lots')
+    lots = [lot for lot in lots or [] if lot.get('lot_number')]
+    if not lots:
+        return
+    
+    auction_id, date = lot_source(url)
+    try:
+        stored = lot_store.upsert_lots(lots, auction_id, date)
+    except Exception as e:
+        print(f"⚠️ Could not store lots for {url}: {e}")
+        return
+    result['lots_query'] = {
+        'auction_id': auction_id,
+        'date': date,
+        'run_id': stored['run_id'],
+        'url': '/lots?' + urlencode({'auction_id': auction_id, 'date': date, 'run_id': stored['run_id']})
+    }
+
+
+def run_scrape(options: dict, progress_queue=None) -> dict:
+    """
+    Run a scrape described by parse_scrape_options() output
+    
+    Args:
+        options: Validated scrape options
+        progress_queue: Anything with a put(event) method that receives progress events
+        
+    Returns:
+        Scrape result dictionary
+    """
+    # Browser checkouts made for this scrape, in any of its threads, queue under one ticket
+    ticket = current_ticket.set(ScrapeTicket(uuid.uuid4().hex, progress_queue))
+    multi_page = 'regalauctions.com' in options['url'] and options['scrape_all_pages']
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        result = scrape_with_ticket(options, progress_queue)
+        if not (isinstance(result, dict) and result.get('error')):
+            outcome = 'ok'
+        return result
+    finally:
+        current_ticket.reset(ticket)
+        scrape_seconds.observe(time.perf_counter() - start, engine=options['engine'] if multi_page else 'single',
+                               outcome=outcome)
+
+
+def scrape_with_ticket(options: dict, progress_queue=None) -> dict:
+    """run_scrape() body, called with the scrape's ticket set"""
+    url = options['url']
+    max_workers = scrape_workers(options['max_workers'], options['fetch_backend'])
+    if max_workers < options['max_workers']:
+        print(f"⚠️  Using {max_workers} of {options['max_workers']} requested workers (browser sessions that fit in memory)")
+    
+    if 'regalauctions.com' in url and options['scrape_all_pages']:
+        result = scrape_all_auction_pages(url, options['wait_time'], max_workers,
+                                          progress_queue=progress_queue, wait_strategy=options['wait_strategy'],
+                                          fetch_backend=options['fetch_backend'], engine=options['engine'],
+                                          stream_lots=options['stream_lots'], cache_mode=options['cache'],
+                                          render_profile=options['render_profile'],
+                                          page_retries=options.get('page_retries'),
+                                          retry_budget=options.get('retry_budget'))
+        if shutting_down.is_set():
+            # Pages after the shutdown were never fetched; a partial result is not stored as the auction's lots
+            raise RuntimeError('Server shut down before the scrape finished')
+        store_scrape_lots(url, result)
+        return result
+    
+    result = scrape_generic_url(url, options['wait_time'], options['scrape_all_pages'], max_workers,
+                                options['wait_strategy'], options['fetch_backend'], options['engine'],
+                                options['cache'], options['render_profile'])
+    if shutting_down.is_set():
+        raise RuntimeError('Server shut down before the scrape finished')
+    lots = result.get('structured_data', {}).get('lots') if isinstance(result, dict) else None
+    if progress_queue and options['stream_lots'] and lots:
+        progress_queue.put(lots_batch_event(1, lots))
+    store_scrape_lots(url, result)
+    return result
+
+
+def sse_event(event: dict, event_id=None) -> str:
+    """Format one Server-Sent Events message"""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}data: {dumps(event).decode('utf-8')}\n\n"
+
+
+def shape_for(options: dict, payload):
+    """Apply a request's lot_format and include_html options to a result or lots_batch event"""
+    return shape_result(payload, options.get('lot_format', 'records'), options.get('include_html', True))
+
+
+def event_stream(events, headers: dict = None) -> Response:
+    """Server-Sent Events response, compressed with flushes between events when the client accepts it"""
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    response = Response(
+        stream_with_context(StreamCompressor(encoding).wrap(events)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+            'Vary': 'Accept-Encoding',
+            **(headers or {})
+        }
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def api_response(payload, status: int = 200) -> Response:
+    """JSON response compressed to the request's Accept-Encoding"""
+    return json_response(payload, status, request.headers.get('Accept-Encoding'))
+
+
+def begin_shutdown():
+    """Refuse new scrapes and make in-flight ones stop fetching, so open requests and streams finish quickly"""
+    if not shutting_down.is_set():
+        print("🛑 Shutting down: stopping in-flight scrapes...")
+    shutting_down.set()
+    if job_manager is not None:
+        job_manager.shutdown(wait=False)
+
+
+def shutdown_server():
+    """Stop scrapes, wait for running jobs to wind down, then close the browser sessions and parser processes"""
+    begin_shutdown()
+    if job_manager is None:
+        return
+    job_manager.shutdown(wait=True)
+    driver_pool.shutdown()
+    parser_pipeline.shutdown()
+
+
+@app.before_request
+def refuse_during_shutdown():
+    """New scrapes and jobs get 503 once shutdown has started; reads keep working"""
+    if shutting_down.is_set() and request.method == 'POST':
+        return jsonify({'success': False, 'error': 'Server is shutting down'}), 503
+
+
 @app.route('/scrape', methods=['POST'])
 def scrape_endpoint():
     """
@@ -549,29 +1307,31 @@ def scrape_endpoint():
         "url": "https://example.com",
         "wait_time": 5,  # optional, default is 5 seconds
         "scrape_all_pages": true,  # optional, default is false, auto-discovers and scrapes all pages
-        "max_workers": 1  # optional, default is 1, number of parallel threads for scraping
+        "max_workers": 1,  # optional, default is 1, number of parallel threads for scraping (at most MAX_SCRAPE_WORKERS)
+        "wait_strategy": "auto",  # optional, readiness policy: auto, lot_cards, network_idle, pagination, fixed
+        "fetch_backend": "auto",  # optional, auto, browser or http (auto tries plain HTTP first for lot pages)
+        "engine": "threads",  # optional, threads or async (multi-page scrapes only)
+        "lot_format": "records",  # optional, records or columnar (one array per field)
+        "include_html": true  # optional, false leaves raw_html out of the response
     }
+    
+    Responses are gzip or brotli compressed when the request's Accept-Encoding allows it.
     """
     try:
-        data = request.get_json()
+        options, error = parse_scrape_options(request.get_json())
         
-        if not data or 'url' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'URL is required in request body'
+                'error': error
             }), 400
         
-        url = data['url']
-        wait_time = data.get('wait_time', 5)
-        scrape_all_pages = data.get('scrape_all_pages', False)
-        max_workers = data.get('max_workers', 1)
-        
         # Scrape the URL
-        result = scrape_generic_url(url, wait_time, scrape_all_pages, max_workers)
+        result = run_scrape(options)
         
-        return jsonify({
+        return api_response({
             'success': True,
-            'data': result
+            'data': shape_for(options, result)
         })
         
     except Exception as e:
@@ -590,23 +1350,24 @@ def scrape_stream():
     {
         "url": "https://example.com",
         "wait_time": 5,
-        "scrape_all_pages": true
+        "scrape_all_pages": true,
+        "wait_strategy": "auto",
+        "fetch_backend": "auto",
+        "engine": "threads",
+        "stream_lots": true,  # optional, send lots per page as 'lots_batch' events; final result has stats only
+        "lot_format": "records",  # optional, records or columnar, for lots_batch events and the result
+        "include_html": true  # optional, false leaves raw_html out
     }
     """
     try:
-        data = request.get_json()
+        options, error = parse_scrape_options(request.get_json())
         
-        if not data or 'url' not in data:
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'URL is required in request body'
+                'error': error
             }), 400
         
-        url = data['url']
-        wait_time = data.get('wait_time', 5)
-        scrape_all_pages = data.get('scrape_all_pages', False)
-        max_workers = data.get('max_workers', 1)
-        
         # Create a unique queue for this request
         progress_queue = queue.Queue()
         
@@ -616,11 +1377,7 @@ def scrape_stream():
             
             def scrape_task():
                 try:
-                    if 'regalauctions.com' in url and scrape_all_pages:
-                        result = scrape_all_auction_pages(url, wait_time, max_workers, progress_queue=progress_queue)
-                    else:
-                        result = scrape_generic_url(url, wait_time, scrape_all_pages, max_workers)
-                    result_container['data'] = result
+                    result_container['data'] = run_scrape(options, progress_queue)
                     result_container['success'] = True
                 except Exception as e:
                     result_container['error'] = str(e)
@@ -640,28 +1397,24 @@ def scrape_stream():
                     if update['type'] == 'done':
                         # Send final result
                         if result_container.get('success'):
-                            yield f"data: {json.dumps({'type': 'result', 'success': True, 'data': result_container['data']})}\n\n"
+                            result_data = result_container['data']
+                            if options['stream_lots']:
+                                result_data = strip_streamed_data(result_data)
+                            yield sse_event({'type': 'result', 'success': True, 'data': shape_for(options, result_data)})
                         else:
-                            yield f"data: {json.dumps({'type': 'error', 'success': False, 'error': result_container.get('error', 'Unknown error')})}\n\n"
+                            yield sse_event({'type': 'error', 'success': False, 'error': result_container.get('error', 'Unknown error')})
                         break
                     else:
                         # Send progress update
-                        yield f"data: {json.dumps(update)}\n\n"
+                        yield sse_event(shape_for(options, update) if update['type'] == 'lots_batch' else update)
                         
                 except queue.Empty:
                     # Send keepalive
-                    yield f"data: {json.dumps({'type': 'keepalive'})}\n\n"
+                    yield sse_event({'type': 'keepalive'})
             
             thread.join()
         
-        return Response(
-            stream_with_context(generate()),
-            mimetype='text/event-stream',
-            headers={
-                'Cache-Control': 'no-cache',
-                'X-Accel-Buffering': 'no'
-            }
-        )
+        return event_stream(generate())
         
     except Exception as e:
         return jsonify({
@@ -670,27 +1423,220 @@ def scrape_stream():
         }), 500
 
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Start a scrape in the background and return its job ID immediately
+    
+    Request body: same as /scrape-stream
+    """
+    options, error = parse_scrape_options(request.get_json())
+    
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    job_id = job_manager.submit(options)
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': f'/jobs/{job_id}',
+        'events_url': f'/jobs/{job_id}/events',
+        'result_url': f'/jobs/{job_id}/result'
+    }), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status and progress"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({'success': True, 'job': job})
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Server-Sent Events for a job, replayed from an offset
+    
+    Query parameters:
+        offset: first event sequence number to send (default: 0)
+    The Last-Event-ID header sent by reconnecting EventSource clients takes precedence.
+    """
+    if job_store.get(job_id) is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    last_event_id = request.headers.get('Last-Event-ID')
+    try:
+        offset = int(last_event_id) + 1 if last_event_id else int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'offset must be an integer'}), 400
+    
+    options = job_store.get(job_id)['params']
+    
+    def generate(offset):
+        last_sent = time.time()
+        while True:
+            events = job_store.events(job_id, offset)
+            for seq, event in events:
+                if event.get('type') == 'lots_batch':
+                    event = shape_for(options, event)
+                yield sse_event(event, seq)
+                offset = seq + 1
+                last_sent = time.time()
+                if event.get('type') == 'done':
+                    return
+            
+            if not events:
+                if job_store.get(job_id)['status'] in FINISHED_STATUSES and not job_store.events(job_id, offset):
+                    return
+                if time.time() - last_sent >= 30:
+                    yield sse_event({'type': 'keepalive'})
+                    last_sent = time.time()
+                time.sleep(0.5)
+    
+    return event_stream(generate(offset))
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Final result of a finished job"""
+    job = job_store.get(job_id, include_result=True)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    if job['status'] not in FINISHED_STATUSES:
+        return jsonify({
+            'success': False,
+            'status': job['status'],
+            'error': 'Job has not finished yet'
+        }), 409
+    
+    if job['status'] != 'completed':
+        return jsonify({
+            'success': False,
+            'status': job['status'],
+            'error': job['error']
+        })
+    
+    return api_response({
+        'success': True,
+        'data': shape_for(job['params'], job['result'])
+    })
+
+
+@app.route('/lots', methods=['GET'])
+def list_lots():
+    """
+    One page of stored lots, filtered and sorted on the server
+    
+    Query parameters:
+        auction_id, date: Which auction's lots (as in a result's lots_query; both optional)
+        run_id: Only the lots of this scrape run (as in lots_query), not lots stored by earlier or concurrent runs
+        lot_number, title: Substring filters (case-insensitive)
+        min_price, max_price: Starting bid range
+        sort: One of SORT_KEYS (default: lot order); order: asc or desc
+        page: Page number from 1 (default: 1); limit: Lots per page, up to 500 (default: 20)
+        lot_format: records (default) or columnar
+    """
+    args = request.args
+    try:
+        min_price = float(args['min_price']) if args.get('min_price') else None
+        max_price = float(args['max_price']) if args.get('max_price') else None
+        page = max(1, int(args.get('page', 1)))
+        limit = min(500, max(1, int(args.get('limit', 20))))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'min_price, max_price, page and limit must be numbers'}), 400
+    
+    sort = args.get('sort') or None
+    if sort is not None and sort not in SORT_KEYS:
+        return jsonify({'success': False, 'error': f"Unknown sort '{sort}'. Use one of: {', '.join(SORT_KEYS)}"}), 400
+    if args.get('lot_format', 'records') not in LOT_FORMATS:
+        return jsonify({'success': False, 'error': f"lot_format must be one of: {', '.join(LOT_FORMATS)}"}), 400
+    if args.get('order', 'asc') not in ('asc', 'desc'):
+        return jsonify({'success': False, 'error': "order must be 'asc' or 'desc'"}), 400
+    
+    filters = {
+        'auction_id': args.get('auction_id') or None,
+        'date': args.get('date'),
+        'lot_number': args.get('lot_number') or None,
+        'title': args.get('title') or None,
+        'run_id': args.get('run_id') or None,
+        'min_price': min_price,
+        'max_price': max_price,
+    }
+    total = lot_store.count(**filters)
+    lots = lot_store.query(**filters, sort=sort, descending=args.get('order') == 'desc',
+                           limit=limit, offset=(page - 1) * limit)
+    
+    records = lots.astype(object).where(lots.notna(), None).to_dict('records')
+    
+    return api_response({
+        'success': True,
+        'total': total,
+        'page': page,
+        'limit': limit,
+        'total_pages': (total + limit - 1) // limit,
+        'lots': columnar_lots(records) if args.get('lot_format') == 'columnar' else records
+    })
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
         'service': 'Web Scraper API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'driver_pool': driver_pool.stats(),
+        'chromedriver': driver_resolver.info(),
+        'fetch_backends': fetcher.site_backends(),
+        'render_profiles': {
+            'default': fetcher.backends['browser'].render_profile,
+            'stats': fetcher.backends['browser'].render_stats.summary()
+        },
+        'parse_workers': parser_pipeline.workers,
+        'page_cache': page_cache.stats()
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Timing histograms, page counters and pool gauges in the Prometheus text format"""
+    return Response(metrics.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def static_file(path: str) -> Response:
+    """
+    A static file with an ETag, answered with 304 Not Modified when the browser's copy is current
+    
+    Pages and env.js (rewritten on every deploy) must be revalidated on each load; other assets are
+    cached for STATIC_MAX_AGE seconds.
+    """
+    revalidate = path.endswith('.html') or os.path.basename(path).startswith('env')
+    response = send_from_directory(app.root_path, path, max_age=0 if revalidate else STATIC_MAX_AGE)
+    if revalidate:
+        response.cache_control.no_cache = True
+    return response
+
+
 @app.route('/')
 def home():
     """Serve the main web interface"""
-    return send_from_directory('.', 'index.html')
+    return static_file('index.html')
 
 
 @app.route('/<path:path>')
 def serve_static(path):
     """Serve static files (CSS, JS, images, etc.)"""
-    if os.path.exists(path):
-        return send_from_directory('.', path)
+    if (os.path.splitext(path)[1].lower() in STATIC_EXTENSIONS
+            and os.path.isfile(os.path.join(app.root_path, path))):
+        return static_file(path)
     return jsonify({'error': 'File not found'}), 404
 
 
@@ -706,8 +1652,18 @@ def api_docs():
                 'description': 'Scrape a URL and return data in JSON format',
                 'request_body': {
                     'url': 'string (required) - URL to scrape',
-                    'wait_time': 'integer (optional) - Seconds to wait for JS rendering (default: 5)',
-                    'scrape_all_pages': 'boolean (optional) - Automatically discover and scrape all pages (default: false)'
+                    'wait_time': 'integer (optional) - Maximum seconds to wait for JS rendering (default: 5)',
+                    'scrape_all_pages': 'boolean (optional) - Automatically discover and scrape all pages (default: false)',
+                    'max_workers': 'integer (optional) - Pages scraped in parallel, capped by MAX_SCRAPE_WORKERS and by the browser sessions that fit in memory (default: 1)',
+                    'wait_strategy': 'string (optional) - Readiness policy: auto, lot_cards, network_idle, pagination or fixed (default: auto)',
+                    'fetch_backend': 'string (optional) - auto, browser or http (default: auto)',
+                    'engine': 'string (optional) - threads or async for multi-page scrapes (default: threads)',
+                    'cache': 'string (optional) - use, refresh or bypass the rendered page cache (default: use)',
+                    'render_profile': f"string (optional) - What browser renders skip downloading: {', '.join(RENDER_PROFILES)} (default: {DEFAULT_RENDER_PROFILE})",
+                    'lot_format': 'string (optional) - records, or columnar for one array per lot field (default: records)',
+                    'include_html': 'boolean (optional) - false leaves raw_html out of the response (default: true)',
+                    'page_retries': f'integer (optional) - Retries for a page that fails or renders without lots, up to {MAX_PAGE_RETRIES} (default: PAGE_RETRIES)',
+                    'retry_budget': 'integer (optional) - Retries shared by all pages of the scrape (default: RETRY_BUDGET); pages that still fail are listed in failed_pages'
                 },
                 'example': {
                     'url': 'https://example.com',
@@ -715,9 +1671,41 @@ def api_docs():
                     'scrape_all_pages': True
                 }
             },
+            'POST /scrape-stream': {
+                'description': 'Same as /scrape, with progress as Server-Sent Events (stream_lots sends lots per page)'
+            },
+            'POST /jobs': {
+                'description': 'Start a background scrape (same body as /scrape-stream) and return its job_id'
+            },
+            'GET /jobs/<job_id>': {
+                'description': 'Job status and progress (queued, running, completed, failed, interrupted)'
+            },
+            'GET /jobs/<job_id>/events': {
+                'description': 'Job progress as Server-Sent Events, resumable with ?offset=N or Last-Event-ID'
+            },
+            'GET /jobs/<job_id>/result': {
+                'description': 'Result of a finished job (409 while it is still running)'
+            },
+            'GET /lots': {
+                'description': 'Stored lots, one page at a time',
+                'query_parameters': {
+                    'auction_id, date': 'Which auction (see lots_query in a scrape result)',
+                    'run_id': 'Only the lots of this scrape run (see lots_query in a scrape result)',
+                    'lot_number, title': 'Substring filters',
+                    'min_price, max_price': 'Starting bid range',
+                    'sort': f"One of: {', '.join(SORT_KEYS)}",
+                    'order': 'asc or desc',
+                    'page, limit': 'Page number (from 1) and lots per page (default 20, max 500)',
+                    'lot_format': 'records or columnar'
+                }
+            },
             'GET /health': {
                 'description': 'Health check endpoint'
             },
+            'GET /metrics': {
+                'description': 'Prometheus metrics: per-step page timing histograms (scraper_page_span_seconds), '
+                               'page, discovery and scrape durations, page and retry counts and browser pool gauges'
+            },
             'GET /api': {
                 'description': 'API documentation (this page)'
             }
@@ -725,6 +1713,60 @@ def api_docs():
     })
 
 
+def create_app() -> Flask:
+    """
+    Application factory for WSGI servers (see wsgi.py and gunicorn.conf.py) and `python api.py`
+    
+    The first call builds this process's shared resources: the browser pool and the chromedriver lookup,
+    the fetch router, the parser processes, the page cache and the lot and job stores, and marks jobs left
+    unfinished by a previous server as interrupted. Later calls return the same app. Each server worker
+    calls it once and gets its own pool.
+    """
+    global driver_pool, fetcher, parser_pipeline, page_cache, lot_store, job_store, job_manager
+    with _setup_lock:
+        if job_manager is not None:
+            return app
+        
+        # Shared pool of warm browser sessions used by every scrape, handed out fairly between scrapes and
+        # capped by free memory (BROWSER_MEMORY_MB per session, MEMORY_RESERVE_MB kept free)
+        driver_pool = DriverPool(
+            create_driver,
+            max_size=int(os.environ.get('DRIVER_POOL_SIZE', 4)),
+            max_uses=int(os.environ.get('DRIVER_MAX_PAGES', 50)),
+            memory_budget=MemoryBudget(session_mb=float(os.environ.get('BROWSER_MEMORY_MB', 300)),
+                                       reserve_mb=float(os.environ.get('MEMORY_RESERVE_MB', 512)))
+        )
+        
+        # Find chromedriver now rather than on the first scrape (see /health for what was found and how long it took)
+        driver_resolver.resolve_in_background()
+        
+        # Picks plain HTTP or the browser pool per site
+        fetcher = FetchRouter(driver_pool)
+        
+        # Parser processes shared by all scrapes (PARSE_WORKERS, 0 parses in the fetch thread)
+        parser_pipeline = ParsePipeline()
+        
+        # Rendered pages and their lots, reused by repeat scrapes until PAGE_CACHE_TTL expires
+        page_cache = PageCache(
+            os.environ.get('PAGE_CACHE_DIR', 'data/page_cache'),
+            ttl=float(os.environ.get('PAGE_CACHE_TTL', 300)),
+            max_bytes=int(float(os.environ.get('PAGE_CACHE_MAX_MB', 256)) * 1024 * 1024)
+        )
+        
+        # Every scrape's lots, queryable through GET /lots (LOTS_DB)
+        lot_store = LotStore(os.environ.get('LOTS_DB', 'data/lots.db'))
+        
+        # Background jobs persisted to SQLite (JOBS_DB), at most JOB_WORKERS running at once.
+        # Under gunicorn the master recovers interrupted jobs once (gunicorn.conf.py), so workers must not mark
+        # jobs that other workers are running
+        job_store = JobStore(os.environ.get('JOBS_DB', 'data/jobs.db'))
+        job_manager = JobManager(job_store, run_scrape, max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+                                 recover=os.environ.get('JOBS_RECOVERED') != '1')
+        # Processes started from this one inherit the flag and leave this process's running jobs alone
+        os.environ['JOBS_RECOVERED'] = '1'
+    return app
+
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5001))
@@ -742,5 +1784,7 @@ if __name__ == '__main__':
     print(f'  curl -X POST http://localhost:{port}/scrape \\')
     print('    -H "Content-Type: application/json" \\')
     print('    -d \'{"url": "https://example.com"}\'')
+    print("For production, serve with: gunicorn -c gunicorn.conf.py wsgi:app")
     print("="*70)
+    create_app()
     app.run(debug=False, host='0.0.0.0', port=port)
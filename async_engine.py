@@ -0,0 +1,111 @@
+"""
+Asyncio fetch layer for multi-page scrapes
+Keeps many plain-HTTP page loads in flight on one event loop; browser renders
+run on a small executor bounded by the driver pool
+"""
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import aiohttp
+
+from fetch_backends import FETCH_BACKENDS, USER_AGENT, has_marker
+
+
+class AsyncFetcher:
+    """Async counterpart of FetchRouter, sharing its per-site backend decisions"""
+
+    def __init__(self, router, max_connections: int = 50, timeout: float = 15):
+        """
+        Args:
+            router: FetchRouter whose browser backend and site decisions are reused
+            max_connections: Maximum simultaneous HTTP connections
+            timeout: HTTP request timeout in seconds
+        """
+        self.router = router
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Browser renders block, so they run in threads; the pool caps live Chrome sessions anyway
+        browser_pool = router.backends['browser'].pool
+        self._executor = ThreadPoolExecutor(max_workers=getattr(browser_pool, 'max_size', 4),
+                                            thread_name_prefix='browser-render')
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'text/html,application/json'},
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self._executor.shutdown(wait=False)
+
+    async def fetch(self, url: str, backend: str = 'auto', wait_strategy: str = 'auto', wait_time: float = 15,
+                    ready_marker: Optional[str] = None, render_profile: Optional[str] = None,
+                    fresh_session: bool = False, on_source: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Fetch a page without blocking the event loop (same contract as FetchRouter.fetch; on_source is
+        called from the render thread for browser renders)
+
+        Returns:
+            Dictionary with html, backend name, readiness result and timings
+        """
+        if backend not in FETCH_BACKENDS:
+            raise ValueError(f"Unknown fetch backend '{backend}'. Use one of: {', '.join(FETCH_BACKENDS)}")
+
+        if backend == 'browser' or (backend == 'auto' and
+                                    (not ready_marker or self.router.preferred_backend(url) == 'browser')):
+            return await self._browser(url, wait_strategy, wait_time, render_profile, fresh_session, on_source)
+
+        probe_start = time.perf_counter()
+        try:
+            result = await self._http(url)
+            if on_source:
+                on_source(result['html'])
+            if backend == 'http' or has_marker(result['html'], ready_marker):
+                if backend == 'auto':
+                    self.router.remember_backend(url, 'http')
+                return result
+            print(f"[AsyncFetch] No '{ready_marker}' in HTTP response for {url}, using browser")
+            http_failed = False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if backend == 'http':
+                raise
+            print(f"[AsyncFetch] HTTP fetch failed for {url}: {e}, using browser")
+            http_failed = True
+        probe = time.perf_counter() - probe_start
+
+        result = await self._browser(url, wait_strategy, wait_time, render_profile, fresh_session, on_source)
+        result['timings']['http_probe'] = probe
+        self.router.record_miss(url, http_failed or has_marker(result['html'], ready_marker))
+        return result
+
+    async def _http(self, url: str) -> Dict:
+        start = time.perf_counter()
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            html = await response.text()
+        elapsed = time.perf_counter() - start
+        return {
+            'html': html,
+            'backend': 'http',
+            'readiness': {'strategy': 'http', 'ready': True, 'latency': round(elapsed, 3)},
+            'timings': {'http': elapsed}
+        }
+
+    async def _browser(self, url: str, wait_strategy: str, wait_time: float,
+                       render_profile: Optional[str] = None, fresh_session: bool = False,
+                       on_source: Optional[Callable[[str], None]] = None) -> Dict:
+        loop = asyncio.get_running_loop()
+        browser = self.router.backends['browser']
+        # run_in_executor does not carry context variables over (unlike asyncio.to_thread), so the
+        # render is run inside a copy of the caller's context to keep its browser queue ticket
+        return await loop.run_in_executor(self._executor, contextvars.copy_context().run, browser.fetch, url,
+                                          wait_strategy, wait_time, render_profile, fresh_session, on_source)
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark for lot extraction
+Compares the BeautifulSoup path with the compiled lxml path on the saved debug/page_*_rendered.html pages
+"""
+
+import argparse
+import glob
+import time
+
+from bs4 import BeautifulSoup
+
+from lot_extractor import extract_lots, extract_lots_from_soup
+
+
+def load_fixtures(pattern: str = 'debug/page_*_rendered.html') -> list:
+    """Read the rendered pages used as benchmark input"""
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            pages.append((path, f.read()))
+    return pages
+
+
+def run(label: str, parse, pages: list, repeat: int) -> dict:
+    """Time parse(html) over all pages, repeat times, and return throughput figures"""
+    lots = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in pages:
+            lots += len(parse(html))
+    elapsed = time.perf_counter() - start
+
+    page_count = len(pages) * repeat
+    result = {
+        'label': label,
+        'pages': page_count,
+        'lots': lots,
+        'ms_per_page': elapsed / page_count * 1000,
+        'lots_per_second': lots / elapsed,
+    }
+    print(f"{label:<20} {result['ms_per_page']:8.2f} ms/page {result['lots_per_second']:10.0f} lots/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lot extraction on debug fixtures')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the fixture pages (default: 5)')
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print("No fixtures found in debug/. Run scraper.py once to save rendered pages.")
+        return
+
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"Benchmarking {len(pages)} pages ({total_kb:.0f} KB) x {args.repeat} passes")
+    print("=" * 60)
+
+    # Both paths must agree before their timings mean anything
+    for path, html in pages:
+        if extract_lots(html) != extract_lots_from_soup(BeautifulSoup(html, 'lxml')):
+            print(f"❌ Extractors disagree on {path}")
+            return
+
+    soup_result = run('beautifulsoup+lxml', lambda html: extract_lots_from_soup(BeautifulSoup(html, 'lxml')),
+                      pages, args.repeat)
+    lxml_result = run('compiled lxml', extract_lots, pages, args.repeat)
+
+    print("=" * 60)
+    print(f"Speedup: {soup_result['ms_per_page'] / lxml_result['ms_per_page']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for vehicle scoring
+Compares row-by-row scoring (DataFrame.apply) with the vectorised score_vehicles on a synthetic dataset,
+and per-keyword substring scans with a single KeywordIndex pass as the keyword list grows
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from keyword_index import KeywordIndex
+from vehicle_scoring import (SCORE_COLUMNS, VEHICLE_MAKES, condition_text, filter_vehicles, score_vehicle,
+                             score_vehicles)
+
+MODELS = ['1500 CREW CAB', 'WRANGLER', 'Q5', 'SORENTO', 'ROGUE', 'SILVERADO', 'X3', 'F-150', 'ENCLAVE', 'RAV4']
+NON_VEHICLES = ['SCOOTER', 'UTILITY TRAILER', 'GENERATOR', 'LAWN TRACTOR']
+CONDITION_PHRASES = ['engine noise', 'engine will not turn over', 'transmission issues', 'frame damage',
+                     'mechanical problems', 'as is - where is', 'claims total $10,000 - $14,999',
+                     'claims total $5000 - $9999', 'claims total $3000 - $4999', 'claims total $1000 - $2999',
+                     'hail damage', 'panels repainted', 'exhaust modified', 'suspension requires repair',
+                     'driveline noise', 'leather', 'sunroof', 'heated seats', 'backup camera', 'one owner']
+RESERVES = ['High bid subject to seller approval.', 'Unreserved (Selling to the highest bidder)']
+
+
+def synthetic_lots(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Random lots shaped like scraped data, including unparseable and missing values"""
+    rng = random.Random(seed)
+    lots = []
+    for i in range(rows):
+        if rng.random() < 0.05:
+            title = f"{rng.randint(2005, 2024)} {rng.choice(NON_VEHICLES)}"
+        else:
+            title = f"{rng.randint(2005, 2024)} {rng.choice(VEHICLE_MAKES)} {rng.choice(MODELS)}"
+        starting = rng.randint(1, 300) * 100
+        reserve_roll = rng.random()
+        if reserve_roll < 0.15:
+            reserve = RESERVES[0]
+        elif reserve_roll < 0.22:
+            reserve = RESERVES[1]
+        else:
+            reserve = f"${starting * rng.uniform(1.0, 5.0):,.0f}"
+        odometer_roll = rng.random()
+        if odometer_roll < 0.02:
+            odometer = 'UNKNOWN'
+        elif odometer_roll < 0.03:
+            odometer = ''
+        else:
+            odometer = f"{rng.randint(5000, 350000):,} {'KM' if rng.random() < 0.97 else 'MILES'}"
+        phrases = rng.sample(CONDITION_PHRASES, rng.randint(0, 4))
+        lots.append({
+            'lot_number': f'{i}R',
+            'title': title,
+            'description': f"{title}. {'. '.join(phrases[:2])}",
+            'declarations': ', '.join(phrases[2:]).upper(),
+            'starting_bid': f'${starting:,}',
+            'reserve_price': reserve,
+            'odometer': odometer,
+        })
+    return pd.DataFrame(lots)
+
+
+def timed(label: str, func, rows: int):
+    """Run func once and print its throughput"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:8.3f} s {rows / elapsed:12.0f} lots/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark vehicle scoring on synthetic lots')
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic lots to score (default: 100000)')
+    parser.add_argument('--keywords', type=int, default=100,
+                        help='Keyword count for the keyword matching comparison (default: 100)')
+    args = parser.parse_args()
+
+    df = filter_vehicles(synthetic_lots(args.rows))
+    print(f"Scoring {len(df)} vehicles ({args.rows} synthetic lots)")
+    print("=" * 60)
+
+    row_scores, row_time = timed('apply(score_vehicle)', lambda: df.apply(score_vehicle, axis=1, result_type='expand'),
+                                 len(df))
+    vec_scores, vec_time = timed('score_vehicles', lambda: score_vehicles(df), len(df))
+
+    # Both paths must agree before their timings mean anything
+    mismatched = (row_scores[SCORE_COLUMNS].to_numpy() != vec_scores[SCORE_COLUMNS].to_numpy()).any(axis=1).sum()
+    if mismatched:
+        print(f"❌ Scores differ on {mismatched} lots")
+        return
+
+    print("=" * 60)
+    print(f"Speedup: {row_time / vec_time:.1f}x")
+
+    # Keyword matching cost as the rule list grows: one str.contains scan per keyword vs one automaton pass
+    keywords = (CONDITION_PHRASES + [f'{phrase} {i}' for i in range(args.keywords) for phrase in CONDITION_PHRASES])
+    keywords = keywords[:args.keywords]
+    text = condition_text(df).str.lower()
+    print(f"\nMatching {len(keywords)} keywords against {len(df)} lots")
+    print("=" * 60)
+    scan, scan_time = timed('str.contains per word', lambda: np.column_stack(
+        [text.str.contains(keyword, regex=False).to_numpy(dtype=bool) for keyword in keywords]), len(df))
+    index = KeywordIndex(keywords)
+    matrix, index_time = timed('KeywordIndex', lambda: index.match_matrix(text), len(df))
+    if not (scan == matrix[:, [index.positions[keyword] for keyword in keywords]]).all():
+        print("❌ Keyword matches differ")
+        return
+    print("=" * 60)
+    print(f"Speedup: {scan_time / index_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,487 @@
+"""
+Offline benchmark suite for the scrapers and parsers
+Serves the saved debug/page_*_rendered.html pages from a local fixture site with configurable latency, runs
+the parsers, the API's scrape_all_auction_pages and AuctionScraper.scrape_all_pages against it at several
+worker counts and wait strategies, and writes throughput, per-page latency percentiles and peak memory to a
+JSON report that can be compared with an earlier run
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from metrics import percentile
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - depends on the environment
+    psutil = None
+
+AUCTION_ID = 'bench'
+AUCTION_DATE = '2024-01-01'
+
+# Served for pages past the last fixture, like the live site's empty result pages
+EMPTY_PAGE = b'<html><head><title>No lots</title></head><body><p>No lots found</p></body></html>'
+
+
+def load_pages(pattern: str = 'debug/page_*_rendered.html') -> Dict[int, bytes]:
+    """Fixture pages keyed by page number"""
+    pages = {}
+    for path in glob.glob(pattern):
+        match = re.search(r'page_(\d+)_rendered\.html$', path)
+        if match:
+            with open(path, 'rb') as f:
+                pages[int(match.group(1))] = f.read()
+    return dict(sorted(pages.items()))
+
+
+class FixtureServer:
+    """Local HTTP server answering any path with the fixture page named by its ?page= parameter"""
+
+    def __init__(self, pages: Dict[int, bytes], latency: float = 0.0, jitter: float = 0.0, port: int = 0):
+        """
+        Args:
+            pages: Page HTML keyed by page number
+            latency: Seconds every response is delayed by
+            jitter: Up to this many extra seconds, at random, on top of latency
+            port: Port to listen on (0 picks a free one)
+        """
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    @property
+    def auction_url(self) -> str:
+        """Lots URL in the live site's shape, as given to the API"""
+        return f'{self.base_url}/auctions/{AUCTION_ID}/lots?date={AUCTION_DATE}'
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, as the real site serves it
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests += 1
+                delay = fixture.latency + random.uniform(0, fixture.jitter)
+                if delay:
+                    time.sleep(delay)
+                page = parse_qs(urlparse(self.path).query).get('page', ['1'])[0]
+                body = fixture.pages.get(int(page) if page.isdigit() else 1, EMPTY_PAGE)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _proc_rss_mb() -> Optional[float]:
+    """Resident memory of this process and its descendants from /proc (Linux), in MB"""
+    parents = {}
+    for stat_path in glob.glob('/proc/[0-9]*/stat'):
+        try:
+            with open(stat_path) as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            parents[int(stat_path.split('/')[2])] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    if not parents:
+        return None
+
+    tree, frontier = {os.getpid()}, [os.getpid()]
+    while frontier:
+        parent = frontier.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent and pid not in tree]
+        tree.update(children)
+        frontier.extend(children)
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for pid in tree:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / (1024 * 1024)
+
+
+def rss_mb() -> Optional[float]:
+    """Resident memory of this process and everything it started (parser processes, Chrome), in MB"""
+    if psutil is not None:
+        process = psutil.Process()
+        total = 0
+        for proc in [process] + process.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    return _proc_rss_mb()
+
+
+class PeakMemory:
+    """Sample rss_mb() in the background and keep the highest reading"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while True:
+            value = rss_mb()
+            if value is not None:
+                self.peak = value if self.peak is None else max(self.peak, value)
+            if self._stop.wait(self.interval):
+                break
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+@contextmanager
+def working_directory(path: str):
+    """Run a block in another directory (AuctionScraper saves debug HTML relative to the working directory)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def measure(name: str, params: Dict, run: Callable[[], Dict], repeat: int, warmup: int = 1) -> Dict:
+    """
+    Run a scenario repeat times and keep the median run by wall time
+
+    Untimed warm-up runs go first, so parser processes, browser sessions and keep-alive connections
+    are already up when timing starts.
+
+    Args:
+        name: Unique scenario name, the key used when comparing reports
+        params: Scenario settings recorded in the report
+        run: Does one run and returns {'pages', 'lots'} plus either 'latencies' (per-page seconds) or the
+             run's own 'p50' and 'p95' page latency
+
+    Returns:
+        Report entry with throughput, p50/p95 page latency and peak memory
+    """
+    runs = []
+    for attempt in range(warmup + repeat):
+        try:
+            with PeakMemory() as memory:
+                start = time.perf_counter()
+                outcome = run()
+                seconds = time.perf_counter() - start
+            if not outcome['lots']:
+                # Page errors are logged and skipped by the scrapers, which would make a broken run look fast
+                raise RuntimeError('no lots scraped, see the log above (is Chrome installed for browser runs?)')
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            return {'name': name, 'params': params, 'error': str(e)}
+        if attempt >= warmup:
+            runs.append(dict(outcome, seconds=seconds, peak_rss_mb=memory.peak))
+
+    runs.sort(key=lambda r: r['seconds'])
+    median = runs[len(runs) // 2]
+    seconds = median['seconds']
+    p50 = median['p50'] if 'p50' in median else percentile(median['latencies'], 50)
+    p95 = median['p95'] if 'p95' in median else percentile(median['latencies'], 95)
+    result = {
+        'name': name,
+        'params': params,
+        'runs': len(runs),
+        'pages': median['pages'],
+        'lots': median['lots'],
+        'seconds': round(seconds, 3),
+        'pages_per_second': round(median['pages'] / seconds, 2),
+        'lots_per_second': round(median['lots'] / seconds, 1),
+        'p50_latency': None if p50 is None else round(p50, 4),
+        'p95_latency': None if p95 is None else round(p95, 4),
+        'peak_rss_mb': None if median['peak_rss_mb'] is None else round(median['peak_rss_mb'], 1),
+    }
+    print(f"{name:<44} {result['pages_per_second']:8.2f} pages/s {result['lots_per_second']:9.0f} lots/s "
+          f"p95 {result['p95_latency'] or 0:7.3f}s  {result['peak_rss_mb'] or 0:7.0f} MB")
+    return result
+
+
+def bench_parsers(pages: Dict[int, bytes], worker_counts: List[int], passes: int, repeat: int,
+                  warmup: int) -> List[Dict]:
+    """Inline lxml extraction, then the parser process pool at each worker count"""
+    from lot_extractor import extract_lots
+    from parse_pipeline import ParsePipeline
+
+    html = [page.decode('utf-8') for page in pages.values()] * passes
+    results = []
+
+    def inline():
+        latencies, lots = [], 0
+        for source in html:
+            start = time.perf_counter()
+            lots += len(extract_lots(source))
+            latencies.append(time.perf_counter() - start)
+        return {'pages': len(html), 'lots': lots, 'latencies': latencies}
+
+    results.append(measure('parsers/inline', {'workers': 0, 'passes': passes}, inline, repeat, warmup))
+
+    for workers in worker_counts:
+        pipeline = ParsePipeline(workers=workers)
+
+        def pooled():
+            timings = [{} for _ in html]
+            futures = [pipeline.submit(source, timings=timing) for source, timing in zip(html, timings)]
+            lots = sum(len(future.result()) for future in futures)
+            return {'pages': len(html), 'lots': lots, 'latencies': [sum(timing.values()) for timing in timings]}
+
+        try:
+            results.append(measure(f'parsers/pool/w{workers}', {'workers': workers, 'passes': passes}, pooled,
+                                   repeat, warmup))
+        finally:
+            pipeline.shutdown()
+    return results
+
+
+def bench_api(server: FixtureServer, worker_counts: List[int], engines: List[str], backends: List[str],
+              wait_strategies: List[str], wait_time: float, repeat: int, warmup: int) -> List[Dict]:
+    """api.scrape_all_auction_pages over every engine, backend, wait strategy and worker count"""
+    import api
+
+    api.create_app()
+    results = []
+    for backend in backends:
+        # Wait strategies only apply to browser renders
+        strategies = wait_strategies if backend == 'browser' else ['auto']
+        for engine in engines:
+            for strategy in strategies:
+                for workers in worker_counts:
+                    def scrape():
+                        result = api.scrape_all_auction_pages(server.auction_url, wait_time, workers,
+                                                              wait_strategy=strategy, fetch_backend=backend,
+                                                              engine=engine, cache_mode='bypass')
+                        page_total = result['timings']['per_page']['spans'].get('total', {})
+                        return {'pages': result['total_pages'], 'lots': result['total_lots'],
+                                'p50': page_total.get('p50'), 'p95': page_total.get('p95')}
+
+                    params = {'engine': engine, 'backend': backend, 'wait_strategy': strategy, 'workers': workers}
+                    results.append(measure(f'api/{engine}/{backend}/{strategy}/w{workers}', params, scrape,
+                                           repeat, warmup))
+    return results
+
+
+def bench_auction_scraper(server: FixtureServer, last_page: int, worker_counts: List[int], backends: List[str],
+                          wait_strategies: List[str], wait_time: float, repeat: int, warmup: int) -> List[Dict]:
+    """AuctionScraper.scrape_all_pages over every backend, wait strategy and worker count"""
+    from scraper import AuctionScraper
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-scraper-') as scratch, working_directory(scratch):
+        for backend in backends:
+            strategies = wait_strategies if backend == 'browser' else ['lot_cards']
+            for strategy in strategies:
+                for workers in worker_counts:
+                    scraper = AuctionScraper(server.base_url, AUCTION_ID, AUCTION_DATE, pool_size=workers,
+                                             wait_strategy=strategy, wait_timeout=wait_time, fetch_backend=backend)
+
+                    def scrape():
+                        frame = scraper.scrape_all_pages(1, last_page, max_workers=workers)
+                        page_total = scraper.page_timings.summary()['spans'].get('total', {})
+                        return {'pages': last_page, 'lots': len(frame),
+                                'p50': page_total.get('p50'), 'p95': page_total.get('p95')}
+
+                    params = {'backend': backend, 'wait_strategy': strategy, 'workers': workers}
+                    try:
+                        results.append(measure(f'scraper/{backend}/{strategy}/w{workers}', params, scrape,
+                                               repeat, warmup))
+                    finally:
+                        scraper.close_driver()
+    return results
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+        'parse_workers': os.environ.get('PARSE_WORKERS'),
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Scenarios whose throughput dropped by more than threshold (a fraction) against the baseline report
+
+    Each shared scenario's change is printed; scenarios only in one report are ignored.
+    """
+    previous = {entry['name']: entry for entry in baseline.get('results', []) if 'error' not in entry}
+    regressions = []
+    print("\nCompared with baseline:")
+    for entry in report['results']:
+        before = previous.get(entry['name'])
+        if before is None or 'error' in entry:
+            continue
+        change = entry['pages_per_second'] / before['pages_per_second'] - 1 if before['pages_per_second'] else 0.0
+        p95 = ''
+        if entry.get('p95_latency') and before.get('p95_latency'):
+            p95 = f", p95 {entry['p95_latency'] / before['p95_latency'] - 1:+.0%}"
+        flag = '❌' if change < -threshold else '✅'
+        print(f"  {flag} {entry['name']:<44} throughput {change:+.0%}{p95}")
+        if change < -threshold:
+            regressions.append(entry['name'])
+    return regressions
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scrapers and parsers against an offline fixture site')
+    parser.add_argument('--suites', default='parsers,api,scraper',
+                        help='Comma-separated suites to run: parsers, api, scraper (default: all)')
+    parser.add_argument('--workers', default='1,2,4', help='Worker counts to try (default: 1,2,4)')
+    parser.add_argument('--engines', default='threads,async', help='API engines (default: threads,async)')
+    parser.add_argument('--backends', default='http',
+                        help='Fetch backends: http, browser (needs Chrome), auto (default: http)')
+    parser.add_argument('--wait-strategies', default='lot_cards,network_idle',
+                        help='Wait strategies for browser runs (default: lot_cards,network_idle)')
+    parser.add_argument('--wait-time', type=float, default=15, help='Maximum readiness wait per page (default: 15)')
+    parser.add_argument('--latency', type=float, default=0.1, help='Seconds each fixture response is delayed (default: 0.1)')
+    parser.add_argument('--jitter', type=float, default=0.05, help='Extra random delay per response (default: 0.05)')
+    parser.add_argument('--passes', type=int, default=5, help='Passes over the fixtures in the parser suite (default: 5)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per scenario; the median run is kept (default: 1)')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs before each scenario (default: 1)')
+    parser.add_argument('--fixtures', default='debug/page_*_rendered.html', help='Fixture page glob')
+    parser.add_argument('--output', help='Report path (default: data/benchmarks/bench_<timestamp>.json)')
+    parser.add_argument('--compare', help='Earlier report to compare throughput against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Throughput drop that counts as a regression with --compare (default: 0.1)')
+    parser.add_argument('--serve', action='store_true', help='Only run the fixture site until interrupted')
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures)
+    if not pages:
+        print("No fixtures found in debug/. Run scraper.py once to save rendered pages.")
+        sys.exit(1)
+
+    # The API module opens its job, lot and cache stores on import: keep them out of data/
+    scratch = tempfile.mkdtemp(prefix='bench-')
+    os.environ.update(JOBS_DB=os.path.join(scratch, 'jobs.db'), LOTS_DB=os.path.join(scratch, 'lots.db'),
+                      PAGE_CACHE_DIR=os.path.join(scratch, 'page_cache'))
+    os.environ.setdefault('CHROMEDRIVER_OFFLINE', '1')
+
+    suites = parse_list(args.suites)
+    workers = parse_list(args.workers, int)
+    backends = parse_list(args.backends)
+    strategies = parse_list(args.wait_strategies)
+
+    with FixtureServer(pages, args.latency, args.jitter) as server:
+        if args.serve:
+            print(f"Serving {len(pages)} fixture pages at {server.auction_url}&page=N (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return
+
+        total_kb = sum(len(page) for page in pages.values()) / 1024
+        print(f"Benchmarking against {len(pages)} fixture pages ({total_kb:.0f} KB) at {server.base_url}, "
+              f"latency {args.latency}s + up to {args.jitter}s")
+        print("=" * 100)
+
+        results = []
+        if 'parsers' in suites:
+            results += bench_parsers(pages, workers, args.passes, args.repeat, args.warmup)
+        if 'api' in suites:
+            results += bench_api(server, workers, parse_list(args.engines), backends, strategies, args.wait_time,
+                                 args.repeat, args.warmup)
+        if 'scraper' in suites:
+            results += bench_auction_scraper(server, max(pages), workers, backends, strategies, args.wait_time,
+                                             args.repeat, args.warmup)
+        print("=" * 100)
+
+    if 'api' in suites:
+        import api
+        api.shutdown_server()
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'fixture': {'pages': len(pages), 'kb': round(total_kb), 'latency': args.latency, 'jitter': args.jitter},
+        'settings': {'repeat': args.repeat, 'warmup': args.warmup, 'passes': args.passes},
+        'results': results,
+    }
+    output = args.output or os.path.join('data', 'benchmarks',
+                                         f"bench_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} scenario(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,7 @@ Debug script to analyze pagination structure
 """
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolver as driver_resolver
 from bs4 import BeautifulSoup
 import time
 
@@ -15,7 +14,8 @@ def create_driver():
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
     
-    service = Service(ChromeDriverManager().install())
+    driver_resolver.configure(chrome_options)
+    service = driver_resolver.service()
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
@@ -3,8 +3,7 @@ Debug script to examine what HTML is being received from the auction site
 """
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_resolver import resolver as driver_resolver
 from bs4 import BeautifulSoup
 import time
 
@@ -19,7 +18,8 @@ def create_driver():
     chrome_options.add_argument('--disable-software-rasterizer')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
     
-    service = Service(ChromeDriverManager().install())
+    driver_resolver.configure(chrome_options)
+    service = driver_resolver.service()
     return webdriver.Chrome(service=service, options=chrome_options)
 
 url = "https://bids.regalauctions.com/auctions/1778628/lots?date=2025-10-24&page=1"
@@ -0,0 +1,218 @@
+"""
+Reusable pool of Selenium WebDriver sessions
+Keeps warm Chrome instances around so each page does not pay browser startup; sessions are handed
+out fairly between scrapes (see governor.FairScheduler) and capped by free memory
+"""
+
+import atexit
+import threading
+import time
+import queue
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from governor import FairScheduler, MemoryBudget, current_ticket
+
+
+class DriverPoolClosed(RuntimeError):
+    """Raised when a session is requested from a pool that has been shut down"""
+
+
+class DriverPool:
+    """Bounded, thread-safe pool of WebDriver sessions"""
+
+    def __init__(self, factory: Callable, max_size: int = 4, max_uses: int = 50,
+                 checkout_timeout: Optional[float] = 300, memory_budget: Optional[MemoryBudget] = None):
+        """
+        Initialize the pool
+
+        Args:
+            factory: Callable returning a new WebDriver instance
+            max_size: Maximum number of live browser sessions (idle + checked out)
+            max_uses: Recycle a session after it has served this many pages
+            checkout_timeout: Seconds to wait for a free session (None waits forever)
+            memory_budget: Lowers the session limit below max_size when free memory runs short
+        """
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self.max_uses = max(1, int(max_uses))
+        self.checkout_timeout = checkout_timeout
+        self.memory_budget = memory_budget
+
+        self._idle = queue.LifoQueue()  # Most recently used first, keeps fewer sessions warm
+        self._slots = FairScheduler(self.session_limit)
+        self._lock = threading.Lock()
+        self._uses: Dict[int, int] = {}
+        self._in_use = 0
+        self._closed = False
+        self._created = 0
+        self._recycled = 0
+
+        atexit.register(self.shutdown)
+
+    def acquire(self, timeout: Optional[float] = None, fresh: bool = False):
+        """
+        Check out a healthy session, creating one if none is idle
+
+        Args:
+            timeout: Seconds to wait for a free slot (defaults to checkout_timeout)
+            fresh: Start a new session instead of reusing an idle one (e.g. to retry a page whose
+                   session crashed); an idle session is quit to make room for it
+
+        Returns:
+            WebDriver instance that must be given back with release()
+        """
+        if self._closed:
+            raise DriverPoolClosed("Driver pool has been shut down")
+
+        wait = self.checkout_timeout if timeout is None else timeout
+        # Waiting checkouts are served round-robin between scrapes; threads outside a scrape share one turn
+        ticket = current_ticket.get()
+        if not self._slots.acquire(ticket.owner if ticket else '', wait, ticket):
+            raise TimeoutError(f"No browser session became available within {wait}s")
+
+        try:
+            if fresh:
+                try:
+                    self._discard(self._idle.get_nowait())
+                except queue.Empty:
+                    pass
+            while True:
+                try:
+                    if fresh:
+                        raise queue.Empty
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    driver = self._new_driver()
+                    break
+
+                if self._is_healthy(driver):
+                    break
+                self._discard(driver)
+
+            with self._lock:
+                self._in_use += 1
+            return driver
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, discard: bool = False):
+        """
+        Return a session to the pool
+
+        Args:
+            driver: WebDriver previously obtained from acquire()
+            discard: Quit the session instead of keeping it (e.g. after a crash)
+        """
+        with self._lock:
+            self._in_use -= 1
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self._uses[id(driver)] >= self.max_uses
+
+        # Sessions beyond the current limit (free memory dropped) are quit instead of kept idle
+        over_limit = self._in_use + self._idle.qsize() >= self.session_limit()
+        try:
+            if discard or worn_out or over_limit or self._closed or not self._reset(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None, fresh: bool = False):
+        """
+        Context manager that checks out a session and always gives it back
+
+        Sessions that raise a WebDriverException are treated as crashed and recycled.
+        """
+        driver = self.acquire(timeout, fresh)
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            discard = True
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def session_limit(self) -> int:
+        """Sessions allowed right now: max_size, or fewer when free memory only fits fewer"""
+        extra = self.memory_budget.extra_sessions() if self.memory_budget else None
+        if extra is None:
+            return self.max_size
+        return max(1, min(self.max_size, self._in_use + self._idle.qsize() + extra))
+
+    def stats(self) -> dict:
+        """Current pool and queue counters"""
+        queued = self._slots.stats()
+        available = self.memory_budget.available_mb() if self.memory_budget else None
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'limit': queued['limit'],
+                'max_uses': self.max_uses,
+                'idle': self._idle.qsize(),
+                'in_use': self._in_use,
+                'waiting': queued['waiting'],
+                'waiting_scrapes': queued['waiting_scrapes'],
+                'avg_wait': queued['avg_wait'],
+                'available_memory_mb': None if available is None else round(available),
+                'created': self._created,
+                'recycled': self._recycled,
+                'closed': self._closed,
+            }
+
+    def shutdown(self):
+        """Quit all idle sessions; checked-out sessions are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _new_driver(self):
+        """Create a session through the factory, noting how long it took on driver.startup_seconds"""
+        start = time.time()
+        driver = self.factory()
+        with self._lock:
+            self._created += 1
+            self._uses[id(driver)] = 0
+        # Read (and cleared) by the first page rendered in the session, as its driver_start timing span
+        driver.startup_seconds = time.time() - start
+        print(f"[DriverPool] Started browser session in {driver.startup_seconds:.2f}s")
+        return driver
+
+    def _discard(self, driver):
+        """Quit a session and forget its usage counter"""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        """Check that the browser behind a session still responds"""
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        """Clear per-request state before a session goes back to the idle list"""
+        try:
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,170 @@
+"""
+Chromedriver resolution, done once per process
+ChromeDriverManager().install() checks versions (and goes to the network when its cache is cold) every
+time it is called; the resolver finds a driver compatible with the installed Chrome once, shares the
+path between threads, and can work without network access
+"""
+
+import glob
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import Dict, Optional
+
+from selenium.webdriver.chrome.service import Service
+
+_VERSION = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+                     '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome']
+
+
+def binary_version(path: str) -> Optional[str]:
+    """Version printed by `<path> --version`, or None if it cannot be run"""
+    try:
+        output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION.search(output)
+    return match.group(0) if match else None
+
+
+def major(version: Optional[str]) -> Optional[int]:
+    return int(version.split('.')[0]) if version else None
+
+
+class ChromeDriverResolver:
+    """Find chromedriver once and hand the same path to every driver created afterwards"""
+
+    def __init__(self, chromedriver_path: Optional[str] = None, chrome_bin: Optional[str] = None,
+                 offline: Optional[bool] = None):
+        """
+        Args:
+            chromedriver_path: Driver to use (CHROMEDRIVER_PATH); its version is checked but it is never replaced
+            chrome_bin: Chrome binary (CHROME_BIN); otherwise the first Chrome/Chromium found on PATH
+            offline: Never download a driver (CHROMEDRIVER_OFFLINE=1); cached drivers and Selenium Manager's
+                     own cache are still used
+        """
+        self.chromedriver_path = chromedriver_path or os.environ.get('CHROMEDRIVER_PATH')
+        self.chrome_bin = chrome_bin or os.environ.get('CHROME_BIN')
+        self.offline = offline if offline is not None else os.environ.get('CHROMEDRIVER_OFFLINE') == '1'
+        self._lock = threading.Lock()
+        self._info: Optional[Dict] = None
+
+    def resolve(self) -> Dict:
+        """
+        Resolve the driver, the first call doing the work; concurrent callers wait for it
+
+        Returns:
+            {'path', 'source', 'driver_version', 'chrome_bin', 'chrome_version', 'compatible', 'seconds', 'error'}
+            where path is None when nothing was found (Selenium then resolves a driver at each start)
+        """
+        with self._lock:
+            if self._info is None:
+                start = time.perf_counter()
+                info = self._resolve()
+                info['seconds'] = round(time.perf_counter() - start, 3)
+                self._info = info
+                if info['path']:
+                    print(f"[ChromeDriver] {info['source']}: {info['path']} (driver {info['driver_version']}, "
+                          f"Chrome {info['chrome_version']}) in {info['seconds']:.2f}s")
+                else:
+                    print(f"⚠️  [ChromeDriver] No driver found ({info['error']}); Selenium will look for one "
+                          f"each time a browser starts")
+            return self._info
+
+    def resolve_in_background(self) -> threading.Thread:
+        """Start resolving now, so the first scrape does not pay for it"""
+        thread = threading.Thread(target=self.resolve, name='chromedriver-resolve', daemon=True)
+        thread.start()
+        return thread
+
+    def service(self) -> Service:
+        """chromedriver Service for webdriver.Chrome"""
+        path = self.resolve()['path']
+        return Service(path) if path else Service()
+
+    def configure(self, chrome_options):
+        """Point the options at CHROME_BIN when it is set"""
+        if self.chrome_bin:
+            chrome_options.binary_location = self.chrome_bin
+
+    def info(self) -> Optional[Dict]:
+        """Resolution result, or None while it has not run"""
+        return self._info
+
+    def _chrome(self) -> tuple:
+        path = self.chrome_bin
+        if not path:
+            path = next((found for found in map(shutil.which, CHROME_CANDIDATES) if found), None)
+        return path, binary_version(path) if path else None
+
+    def _resolve(self) -> Dict:
+        chrome_bin, chrome_version = self._chrome()
+        info = {'path': None, 'source': None, 'driver_version': None, 'chrome_bin': chrome_bin,
+                'chrome_version': chrome_version, 'compatible': None, 'error': None}
+
+        def accept(path, source, check=True):
+            version = binary_version(path)
+            compatible = None if not (version and chrome_version) else major(version) == major(chrome_version)
+            if check and compatible is False:
+                print(f"[ChromeDriver] Skipping {path}: driver {version} does not match Chrome {chrome_version}")
+                return False
+            info.update(path=path, source=source, driver_version=version, compatible=compatible)
+            return True
+
+        # An explicit path is always used; a version mismatch is reported rather than worked around
+        if self.chromedriver_path:
+            if not os.access(self.chromedriver_path, os.X_OK):
+                info['error'] = f'CHROMEDRIVER_PATH {self.chromedriver_path} is not an executable file'
+            else:
+                accept(self.chromedriver_path, 'CHROMEDRIVER_PATH', check=False)
+                if info['compatible'] is False:
+                    info['error'] = (f"chromedriver {info['driver_version']} does not support "
+                                     f"Chrome {chrome_version}")
+                return info
+
+        on_path = shutil.which('chromedriver')
+        if on_path and accept(on_path, 'PATH'):
+            return info
+
+        # Drivers webdriver-manager downloaded earlier, newest first, without its network version check
+        cached = glob.glob(os.path.join(os.path.expanduser('~'), '.wdm', 'drivers', 'chromedriver', '**',
+                                        'chromedriver*'), recursive=True)
+        for path in sorted((p for p in cached if os.path.isfile(p) and os.access(p, os.X_OK)),
+                           key=os.path.getmtime, reverse=True):
+            if accept(path, 'webdriver-manager cache'):
+                return info
+
+        if not self.offline:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                if accept(ChromeDriverManager().install(), 'webdriver-manager'):
+                    return info
+            except Exception as e:
+                info['error'] = f'webdriver-manager: {e}'
+                print(f"[ChromeDriver] webdriver-manager failed: {e}")
+
+        # Selenium Manager ships with Selenium and keeps its own cache (~/.cache/selenium)
+        try:
+            from selenium.webdriver.common.selenium_manager import SeleniumManager
+            args = ['--browser', 'chrome'] + (['--offline'] if self.offline else [])
+            if chrome_bin:
+                args += ['--browser-path', chrome_bin]
+            found = SeleniumManager().binary_paths(args)
+            if found.get('driver_path'):
+                accept(found['driver_path'], 'selenium-manager', check=False)
+                info['error'] = None
+                return info
+            problem = 'selenium-manager found no driver'
+        except Exception as e:
+            problem = f'selenium-manager: {e}'
+        info['error'] = f"{info['error']}; {problem}" if info['error'] else problem
+        return info
+
+
+# Shared by every driver factory in the process
+resolver = ChromeDriverResolver()
@@ -0,0 +1,298 @@
+"""
+Pluggable fetch backends for auction pages
+"browser" renders through pooled Selenium sessions, "http" uses a pooled requests.Session
+"""
+
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import span
+from render_profiles import DEFAULT_RENDER_PROFILE, RenderStats, apply_profile, read_network_log
+from wait_strategies import get_wait_strategy
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+FETCH_BACKENDS = ('auto', 'browser', 'http')
+
+
+@lru_cache(maxsize=32)
+def _class_pattern(marker: str):
+    """class attribute (double-, single- or unquoted) listing marker as one of its class names"""
+    name = re.escape(marker)
+    return re.compile(r'(?<![\w-])class\s*=\s*(?:"(?:[^"]*\s)?' + name + r'(?:\s[^"]*)?"'
+                      r"|'(?:[^']*\s)?" + name + r"(?:\s[^']*)?'"
+                      r'|' + name + r'(?=[\s/>]))', re.IGNORECASE)
+
+
+def has_marker(html: str, marker: str) -> bool:
+    """
+    Check whether the HTML contains an element with the given CSS class
+
+    The class must be a whole class name: lot-card-image or lot-card-header do not count as lot-card.
+    """
+    return _class_pattern(marker).search(html) is not None
+
+
+class BrowserBackend:
+    """Render pages in a real browser borrowed from a DriverPool"""
+
+    name = 'browser'
+
+    def __init__(self, pool, render_profile: str = DEFAULT_RENDER_PROFILE):
+        """
+        Args:
+            pool: DriverPool to borrow sessions from
+            render_profile: Default render profile (see render_profiles.RENDER_PROFILES)
+        """
+        self.pool = pool
+        self.render_profile = render_profile
+        self.render_stats = RenderStats()
+
+    def fetch(self, url: str, wait_strategy: str = 'auto', wait_time: float = 15,
+              render_profile: Optional[str] = None, fresh_session: bool = False,
+              on_source: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Load a page and wait for it to become ready
+
+        Args:
+            url: Page URL
+            wait_strategy: Readiness policy name
+            wait_time: Maximum wait in seconds
+            render_profile: What the browser skips downloading (defaults to the backend's profile)
+            fresh_session: Render in a newly started browser rather than a pooled one
+            on_source: Called with the page source as loaded, before waiting for the page to become ready
+
+        Returns:
+            Dictionary with html, backend name, readiness result, render stats (profile, plus
+            requests, bytes and blocked requests when the session logs network traffic) and timings
+            (queue_wait, driver_start when a session was started for this page, navigation,
+            readiness and page_source, in seconds)
+        """
+        profile = render_profile or self.render_profile
+        waiter = get_wait_strategy(wait_strategy, wait_time, url)
+        timings = {}
+        checkout = time.perf_counter()
+        with self.pool.session(fresh=fresh_session) as driver:
+            timings['queue_wait'] = time.perf_counter() - checkout
+            startup = getattr(driver, 'startup_seconds', None)
+            if startup:
+                driver.startup_seconds = None
+                timings['driver_start'] = startup
+                timings['queue_wait'] = max(0.0, timings['queue_wait'] - startup)
+            apply_profile(driver, profile)
+            read_network_log(driver)  # drop whatever the previous page left in the log
+            with span(timings, 'navigation'):
+                driver.get(url)
+            if on_source:
+                on_source(driver.page_source)
+            readiness = waiter.wait(driver)
+            timings['readiness'] = readiness['latency']
+            with span(timings, 'page_source'):
+                html = driver.page_source
+            network = read_network_log(driver)
+        self.render_stats.record(profile, network, readiness['latency'])
+        render = {'profile': profile}
+        if network:
+            render.update(requests=network['requests'], bytes=network['bytes'], blocked=network['blocked'])
+        return {'html': html, 'backend': self.name, 'readiness': readiness, 'render': render, 'timings': timings}
+
+
+class HttpBackend:
+    """Fetch raw page HTML over a pooled keep-alive HTTP session"""
+
+    name = 'http'
+
+    def __init__(self, pool_size: int = 10, timeout: float = 15):
+        """
+        Args:
+            pool_size: Maximum number of keep-alive connections per host
+            timeout: Request timeout in seconds
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'text/html,application/json'})
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str, wait_strategy: str = 'auto', wait_time: float = 15,
+              validators: Optional[Dict] = None, on_source: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        GET a page without running JavaScript
+
+        Args:
+            url: Page URL
+            wait_strategy: Unused (kept for the common backend signature)
+            wait_time: Maximum wait in seconds
+            validators: 'etag'/'last_modified' from an earlier response; sent as a conditional request
+            on_source: Called with the response body (not for 304 Not Modified)
+
+        Returns:
+            Dictionary with html, backend name, readiness result, timings ('http' seconds) and the
+            response's validators. When the server answers 304 Not Modified, html is None and
+            not_modified is True.
+        """
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=min(self.timeout, max(wait_time, 1)))
+        not_modified = response.status_code == 304
+        if not not_modified:
+            response.raise_for_status()
+        html = None if not_modified else response.text
+        elapsed = time.perf_counter() - start
+        if html is not None and on_source:
+            on_source(html)
+        return {
+            'html': html,
+            'backend': self.name,
+            'readiness': {'strategy': self.name, 'ready': True, 'latency': round(elapsed, 3)},
+            'timings': {'http': elapsed},
+            'not_modified': not_modified,
+            'validators': {
+                'etag': response.headers.get('ETag') or (validators or {}).get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or (validators or {}).get('last_modified'),
+            }
+        }
+
+
+class FetchRouter:
+    """Choose a fetch backend per site, falling back to the browser when plain HTTP is not enough"""
+
+    def __init__(self, pool, http_pool_size: int = 10, recheck_after: float = 600,
+                 render_profile: str = DEFAULT_RENDER_PROFILE, misses_before_browser: int = 2):
+        """
+        Args:
+            pool: DriverPool used by the browser backend
+            http_pool_size: Keep-alive connections for the HTTP backend
+            recheck_after: Seconds before a site marked browser-only is probed over HTTP again
+            render_profile: Default render profile for browser renders (RENDER_PROFILE)
+            misses_before_browser: HTTP misses in a row (see record_miss) before a site is marked browser-only
+        """
+        self.backends = {
+            'browser': BrowserBackend(pool, render_profile),
+            'http': HttpBackend(pool_size=http_pool_size),
+        }
+        self.recheck_after = recheck_after
+        self.misses_before_browser = max(1, misses_before_browser)
+        self._site_backend = {}  # host -> (backend name, decided at)
+        self._misses = {}  # host -> HTTP misses in a row
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, backend: str = 'auto', wait_strategy: str = 'auto', wait_time: float = 15,
+              ready_marker: Optional[str] = None, validators: Optional[Dict] = None,
+              render_profile: Optional[str] = None, fresh_session: bool = False,
+              on_source: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        Fetch a page with the requested backend
+
+        Args:
+            url: Page URL
+            backend: 'browser', 'http' or 'auto'
+            wait_strategy: Readiness policy for the browser backend
+            wait_time: Maximum wait in seconds
+            ready_marker: CSS class that must be present for an HTTP result to be accepted
+                          (auto mode only tries HTTP when a marker is given)
+            validators: HTTP validators from an earlier fetch of this URL; when the HTTP backend
+                        is used the request is conditional (see HttpBackend.fetch)
+            render_profile: Render profile for browser renders (see render_profiles)
+            fresh_session: Browser renders start a new session (used when retrying after a driver failure)
+            on_source: Called with page HTML as soon as some arrives, before it is accepted or ready: the HTTP
+                       response (also one rejected for lacking the marker) and the browser's source as loaded
+
+        Returns:
+            Dictionary with html, backend name, readiness result and timings; a browser render after
+            a rejected HTTP attempt also times that attempt as 'http_probe'
+        """
+        if backend not in FETCH_BACKENDS:
+            raise ValueError(f"Unknown fetch backend '{backend}'. Use one of: {', '.join(FETCH_BACKENDS)}")
+
+        if backend == 'http':
+            return self.backends['http'].fetch(url, wait_strategy, wait_time, validators, on_source)
+        if backend != 'auto':
+            return self.backends[backend].fetch(url, wait_strategy, wait_time, render_profile, fresh_session,
+                                                on_source)
+
+        if not ready_marker or self.preferred_backend(url) == 'browser':
+            return self.backends['browser'].fetch(url, wait_strategy, wait_time, render_profile, fresh_session,
+                                                  on_source)
+
+        probe_start = time.perf_counter()
+        try:
+            result = self.backends['http'].fetch(url, wait_strategy, wait_time, validators, on_source)
+            if result['not_modified'] or has_marker(result['html'], ready_marker):
+                self.remember_backend(url, 'http')
+                return result
+            print(f"[Fetch] No '{ready_marker}' in HTTP response for {urlparse(url).netloc}, using browser")
+            http_failed = False
+        except requests.RequestException as e:
+            print(f"[Fetch] HTTP fetch failed for {url}: {e}, using browser")
+            http_failed = True
+        probe = time.perf_counter() - probe_start
+
+        result = self.backends['browser'].fetch(url, wait_strategy, wait_time, render_profile, fresh_session,
+                                                on_source)
+        result['timings']['http_probe'] = probe
+        self.record_miss(url, http_failed or has_marker(result['html'], ready_marker))
+        return result
+
+    def site_backends(self) -> Dict[str, str]:
+        """Backend currently chosen for each site seen in auto mode"""
+        with self._lock:
+            return {host: name for host, (name, _) in self._site_backend.items()}
+
+    def preferred_backend(self, url: str) -> Optional[str]:
+        """Backend remembered for the URL's site, or None when it should be (re)probed"""
+        host = urlparse(url).netloc
+        with self._lock:
+            decision = self._site_backend.get(host)
+        if not decision:
+            return None
+        name, decided_at = decision
+        if name == 'browser' and time.time() - decided_at > self.recheck_after:
+            return None
+        return name
+
+    def remember_backend(self, url: str, name: str):
+        """Record which backend works for the URL's site"""
+        host = urlparse(url).netloc
+        with self._lock:
+            self._site_backend[host] = (name, time.time())
+            self._misses.pop(host, None)
+
+    def record_miss(self, url: str, browser_needed: bool):
+        """
+        Record an HTTP attempt that was not enough and fell back to the browser
+
+        Args:
+            url: Page URL
+            browser_needed: The HTTP request failed, or the browser render had the marker that the HTTP
+                            response lacked. Otherwise the page is empty either way (e.g. past the last page)
+                            and says nothing about the site.
+
+        The site is marked browser-only after misses_before_browser misses in a row.
+        """
+        if not browser_needed:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            misses = self._misses.get(host, 0) + 1
+            if misses < self.misses_before_browser:
+                self._misses[host] = misses
+                return
+        print(f"[Fetch] {host} needed the browser {misses} times in a row, rendering its pages from now on")
+        self.remember_backend(url, 'browser')
@@ -0,0 +1,217 @@
+"""
+Process-wide limits on browser sessions
+A FairScheduler hands out browser slots round-robin between scrapes, so one large scrape cannot starve
+the others, and a MemoryBudget shrinks the number of live sessions (and of worker threads per scrape)
+when the machine or container is running out of memory
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def available_memory_mb() -> Optional[float]:
+    """
+    Memory that can still be allocated, in MB, or None when it cannot be determined
+
+    The container's cgroup limit is used when there is one (v2, then v1); otherwise MemAvailable
+    from /proc/meminfo.
+    """
+    available = None
+    for limit_path, usage_path in (('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory.current'),
+                                   ('/sys/fs/cgroup/memory/memory.limit_in_bytes',
+                                    '/sys/fs/cgroup/memory/memory.usage_in_bytes')):
+        limit, usage = _read_int(limit_path), _read_int(usage_path)
+        # cgroup v1 reports "no limit" as a huge number rather than "max"
+        if limit is not None and usage is not None and limit < 1 << 60:
+            available = (limit - usage) / (1024 * 1024)
+            break
+
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    host = int(line.split()[1]) / 1024
+                    available = host if available is None else min(available, host)
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    return available
+
+
+class MemoryBudget:
+    """How many more browser sessions fit in free memory"""
+
+    def __init__(self, session_mb: float = 300, reserve_mb: float = 512, refresh: float = 2.0):
+        """
+        Args:
+            session_mb: Memory one Chrome session is expected to use
+            reserve_mb: Memory always left free for the API, parsers and the OS
+            refresh: Seconds a memory reading is reused
+        """
+        self.session_mb = max(1.0, float(session_mb))
+        self.reserve_mb = max(0.0, float(reserve_mb))
+        self.refresh = refresh
+        self._read_at = 0.0
+        self._available = None
+        self._lock = threading.Lock()
+
+    def available_mb(self) -> Optional[float]:
+        with self._lock:
+            if time.time() - self._read_at >= self.refresh:
+                self._available = available_memory_mb()
+                self._read_at = time.time()
+            return self._available
+
+    def extra_sessions(self) -> Optional[int]:
+        """Sessions that can be started on top of the running ones (None when memory is unknown)"""
+        available = self.available_mb()
+        if available is None:
+            return None
+        return max(0, int((available - self.reserve_mb) // self.session_mb))
+
+
+class ScrapeTicket:
+    """Identifies the scrape that the current thread works for, and where its progress events go"""
+
+    def __init__(self, owner: str, progress_queue=None):
+        self.owner = owner
+        self.progress_queue = progress_queue
+        self._last_position = None
+
+    def report_queue(self, position: int, waiting_pages: int, stats: Dict):
+        """Send a browser_queue progress event when this scrape's place in the queue changes"""
+        if self.progress_queue is None or position == self._last_position:
+            return
+        self._last_position = position
+        self.progress_queue.put({
+            'type': 'browser_queue',
+            'queue_position': position,
+            'waiting_pages': waiting_pages,
+            'active_sessions': stats['active'],
+            'session_limit': stats['limit'],
+            'message': f'Waiting for a browser session (position {position} in queue)'
+        })
+
+
+# Set for the duration of a scrape; copy the context into worker threads so it follows the scrape
+current_ticket: contextvars.ContextVar[Optional[ScrapeTicket]] = contextvars.ContextVar('current_ticket',
+                                                                                         default=None)
+
+
+class FairScheduler:
+    """
+    Counting semaphore whose limit can change, granting waiting slots round-robin between owners
+
+    Each owner (usually one scrape) has a FIFO of waiting tasks; when a slot frees up it goes to the
+    next owner in turn, so a scrape with many queued pages cannot hold back one with a single page.
+    """
+
+    def __init__(self, limit: Callable[[], int], poll: float = 2.0):
+        """
+        Args:
+            limit: Callable returning the current number of slots (re-read whenever a slot is requested,
+                   released or while tasks wait)
+            poll: Seconds between limit re-checks and queue position reports while waiting
+        """
+        self.limit = limit
+        self.poll = poll
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting: 'OrderedDict[str, deque]' = OrderedDict()  # owner -> waiting tasks, in turn order
+        self._granted = set()
+        self._total_waited = 0.0
+        self._grants = 0
+
+    def acquire(self, owner: str, timeout: Optional[float] = None, ticket: Optional[ScrapeTicket] = None) -> bool:
+        """
+        Wait for a slot
+
+        Args:
+            owner: Whose turn this counts against
+            timeout: Seconds to wait (None waits forever)
+            ticket: Receives queue position reports while waiting
+
+        Returns:
+            True once a slot is held, False on timeout
+        """
+        task = object()
+        start = time.time()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            self._waiting.setdefault(owner, deque()).append(task)
+            self._grant()
+            while task not in self._granted:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    self._withdraw(owner, task)
+                    return False
+                if ticket is not None:
+                    ticket.report_queue(self._position(owner), len(self._waiting[owner]), self._stats())
+                self._cond.wait(self.poll if remaining is None else min(self.poll, remaining))
+                self._grant()  # the limit may have grown while waiting
+            self._granted.discard(task)
+            self._total_waited += time.time() - start
+            self._grants += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._grant()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return self._stats()
+
+    def _stats(self) -> Dict:
+        return {
+            'active': self._active,
+            'limit': self.limit(),
+            'waiting': sum(len(tasks) for tasks in self._waiting.values()),
+            'waiting_scrapes': len(self._waiting),
+            'avg_wait': round(self._total_waited / self._grants, 3) if self._grants else 0.0,
+        }
+
+    def _grant(self):
+        """Hand free slots to waiting tasks, one owner at a time (caller holds the lock)"""
+        granted = False
+        limit = max(1, self.limit())
+        while self._waiting and self._active < limit:
+            owner, tasks = next(iter(self._waiting.items()))
+            self._granted.add(tasks.popleft())
+            self._active += 1
+            granted = True
+            # The owner goes to the back of the line, or leaves it when it has nothing else waiting
+            del self._waiting[owner]
+            if tasks:
+                self._waiting[owner] = tasks
+        if granted:
+            self._cond.notify_all()
+
+    def _withdraw(self, owner: str, task):
+        tasks = self._waiting.get(owner)
+        if tasks is not None:
+            tasks.remove(task)
+            if not tasks:
+                del self._waiting[owner]
+
+    def _position(self, owner: str) -> int:
+        """1-based number of grants until the owner's next waiting task gets a slot, if slots free one at a time"""
+        ahead = 0
+        for other in self._waiting:
+            if other == owner:
+                break
+            ahead += 1  # owners ahead in turn order get one slot each first
+        return ahead + 1
@@ -0,0 +1,64 @@
+"""
+Gunicorn settings for the scraper API, read from environment variables
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers use threads (gthread): each open Server-Sent Events stream holds one thread for as long as
+the scrape runs, so WEB_THREADS bounds the number of concurrent streams and requests per worker.
+Every worker process has its own Chrome pool (DRIVER_POOL_SIZE sessions) and parser processes, so
+add workers only when there is memory for them.
+"""
+
+import os
+import signal
+
+from jobs import JobStore
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_WORKERS', 1))
+threads = int(os.environ.get('WEB_THREADS', 32))
+
+# gthread workers heartbeat from their main loop, so a long SSE stream does not trip the worker timeout
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+
+# Time open requests and streams get to finish after SIGTERM; in-flight scrapes are stopped first
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+
+# Recycle workers after this many requests to cap memory growth (0 disables)
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """Recover jobs from a previous run once, in the master, before any worker starts jobs of its own"""
+    JobStore(os.environ.get('JOBS_DB', 'data/jobs.db')).mark_interrupted()
+    os.environ['JOBS_RECOVERED'] = '1'
+
+
+def post_worker_init(worker):
+    """Stop in-flight scrapes as soon as the worker is asked to exit, before gunicorn waits for open requests"""
+    import api
+
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        api.begin_shutdown()
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def worker_int(worker):
+    """SIGINT/SIGQUIT: stop scrapes before the worker exits immediately"""
+    import api
+    api.begin_shutdown()
+
+
+def worker_exit(server, worker):
+    """Close the worker's browser sessions and parser processes"""
+    import api
+    api.shutdown_server()
@@ -0,0 +1,124 @@
+"""
+Incremental re-scrape support
+Keeps per-page fingerprints, HTTP validators and per-lot hashes from the previous run so a
+re-scrape can reuse unchanged pages and report what changed as a delta keyed by lot_number
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+# Fields that can differ between runs without the lot itself changing
+VOLATILE_FIELDS = ('page',)
+
+
+def lot_key(lot: Dict) -> str:
+    """Identity of a lot across runs"""
+    return str(lot.get('lot_number') or lot.get('lot_url') or lot.get('title', ''))
+
+
+def lot_hash(lot: Dict) -> str:
+    """Hash of a lot's content, ignoring volatile fields"""
+    content = {key: value for key, value in lot.items() if key not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def page_fingerprint(lots: List[Dict]) -> str:
+    """Fingerprint of a page: its lots, in order, with their content hashes"""
+    digest = hashlib.sha1()
+    for lot in lots:
+        digest.update(f'{lot_key(lot)}:{lot_hash(lot)}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def diff_lots(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict:
+    """
+    Compare two datasets keyed by lot_key()
+
+    Args:
+        previous: Lots from the last run
+        current: Lots from this run
+
+    Returns:
+        Dictionary with added and removed lots, and changed lots with their field changes
+    """
+    added = [current[key] for key in current if key not in previous]
+    removed = [previous[key] for key in previous if key not in current]
+    changed = []
+
+    for key, lot in current.items():
+        old = previous.get(key)
+        if old is None or lot_hash(old) == lot_hash(lot):
+            continue
+        fields = sorted((set(old) | set(lot)) - set(VOLATILE_FIELDS))
+        changed.append({
+            'lot_number': key,
+            'changes': {field: {'old': old.get(field), 'new': lot.get(field)}
+                        for field in fields if old.get(field) != lot.get(field)},
+            'lot': lot
+        })
+
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+class ScrapeState:
+    """Per-page fingerprints, HTTP validators and lots saved from the last run of one auction"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSON file holding the state (missing file means no previous run)
+        """
+        self.path = path
+        self.pages = {}  # str(page) -> {'fingerprint', 'validators', 'lot_numbers'}
+        self.lots = {}   # lot_key -> lot
+        self.updated_at = None
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.pages = data.get('pages', {})
+            self.lots = data.get('lots', {})
+            self.updated_at = data.get('updated_at')
+
+    def page(self, page_num: int) -> Optional[Dict]:
+        """State recorded for a page, or None if it was not scraped last time"""
+        return self.pages.get(str(page_num))
+
+    def page_lots(self, page_num: int) -> List[Dict]:
+        """Lots the page held last time"""
+        page = self.page(page_num) or {}
+        return [self.lots[key] for key in page.get('lot_numbers', []) if key in self.lots]
+
+    def page_count(self) -> Optional[int]:
+        """Last page that held lots last time, or None without a previous run"""
+        pages = [int(page_num) for page_num, page in self.pages.items() if page.get('lot_numbers')]
+        return max(pages) if pages else None
+
+    def save(self, pages: Dict[int, Dict], lots: List[Dict]):
+        """
+        Replace the state with this run's pages and lots
+
+        Args:
+            pages: Page number -> {'fingerprint', 'validators'} for every page of this run
+            lots: All lots of the merged dataset
+        """
+        self.lots = {lot_key(lot): lot for lot in lots}
+        by_page = {}
+        for lot in lots:
+            by_page.setdefault(str(lot.get('page')), []).append(lot_key(lot))
+        self.pages = {
+            str(page_num): dict(page, lot_numbers=by_page.get(str(page_num), []))
+            for page_num, page in pages.items()
+        }
+        self.updated_at = time.time()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': self.updated_at, 'pages': self.pages, 'lots': self.lots}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,209 @@
+"""
+Persistent scrape jobs
+Jobs run on a bounded worker pool; their status, progress events and results are kept in SQLite
+so clients can poll, reconnect to the event stream from any offset, and fetch results later
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+FINISHED_STATUSES = ('completed', 'failed', 'interrupted')
+
+
+class JobStore:
+    """SQLite persistence for jobs and their event logs"""
+
+    def __init__(self, db_path: str = 'data/jobs.db'):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    total_pages INTEGER,
+                    pages_done INTEGER NOT NULL DEFAULT 0,
+                    lots_found INTEGER NOT NULL DEFAULT 0,
+                    event_count INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT
+                )''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    event TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )''')
+
+    def create(self, params: Dict) -> str:
+        """Insert a queued job and return its ID"""
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute('INSERT INTO jobs (id, status, params, created_at) VALUES (?, ?, ?, ?)',
+                               (job_id, 'queued', json.dumps(params), time.time()))
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        """Set columns on a job"""
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+        columns = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+
+    def add_event(self, job_id: str, event: Dict) -> int:
+        """Append an event to the job's log, updating progress counters; returns its sequence number"""
+        with self._lock, self._conn:
+            seq = self._conn.execute('SELECT event_count FROM jobs WHERE id = ?', (job_id,)).fetchone()[0]
+            self._conn.execute('INSERT INTO job_events (job_id, seq, event) VALUES (?, ?, ?)',
+                               (job_id, seq, json.dumps(event)))
+
+            updates = {'event_count': seq + 1}
+            if event.get('type') in ('discovery_complete', 'scraping_start') and event.get('total_pages'):
+                updates['total_pages'] = event['total_pages']
+            columns = ', '.join(f'{name} = ?' for name in updates)
+            self._conn.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*updates.values(), job_id))
+
+            if event.get('type') == 'page_complete':
+                self._conn.execute('UPDATE jobs SET pages_done = pages_done + 1, lots_found = lots_found + ? '
+                                   'WHERE id = ?', (event.get('lots_found', 0), job_id))
+        return seq
+
+    def events(self, job_id: str, offset: int = 0, limit: int = 500) -> List[tuple]:
+        """Events with sequence number >= offset, as (seq, event) pairs"""
+        with self._lock:
+            rows = self._conn.execute('SELECT seq, event FROM job_events WHERE job_id = ? AND seq >= ? '
+                                      'ORDER BY seq LIMIT ?', (job_id, offset, limit)).fetchall()
+        return [(row['seq'], json.loads(row['event'])) for row in rows]
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict]:
+        """Job record as a dictionary, or None if unknown"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        result = job.pop('result')
+        if include_result:
+            job['result'] = json.loads(result) if result else None
+        return job
+
+    def mark_interrupted(self, job_ids: Optional[List[str]] = None):
+        """
+        Flag unfinished jobs as interrupted
+
+        Args:
+            job_ids: Only these jobs; by default every job left queued or running by a previous process
+        """
+        query = ("UPDATE jobs SET status = 'interrupted', finished_at = ?, "
+                 "error = 'Server restarted before the job finished' WHERE status IN ('queued', 'running')")
+        params = [time.time()]
+        if job_ids is not None:
+            if not job_ids:
+                return
+            query += f" AND id IN ({', '.join('?' * len(job_ids))})"
+            params += list(job_ids)
+        with self._lock, self._conn:
+            self._conn.execute(query, params)
+
+
+class JobProgress:
+    """Queue-like adapter so scrape functions can report progress straight into the job log"""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def put(self, event: Dict):
+        self.store.add_event(self.job_id, event)
+
+
+class JobManager:
+    """Run scrape jobs on a bounded pool of worker threads"""
+
+    def __init__(self, store: JobStore, runner: Callable, max_workers: int = 2, recover: bool = True):
+        """
+        Args:
+            store: JobStore used for persistence
+            runner: Callable(params, progress_queue) returning the scrape result
+            max_workers: Maximum number of jobs running at once; others wait queued
+            recover: Mark jobs left unfinished by a previous process as interrupted (leave this off when
+                several server processes share the store)
+        """
+        self.store = store
+        self.runner = runner
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+        self._active = set()  # jobs submitted by this process that have not finished
+        self._active_lock = threading.Lock()
+        self._stopping = False
+        if recover:
+            store.mark_interrupted()
+
+    def submit(self, params: Dict) -> str:
+        """Queue a job and return its ID"""
+        job_id = self.store.create(params)
+        self.store.add_event(job_id, {'type': 'queued', 'message': 'Job queued'})
+        with self._active_lock:
+            self._active.add(job_id)
+        self._executor.submit(self._run, job_id, params)
+        return job_id
+
+    def _run(self, job_id: str, params: Dict):
+        try:
+            self._execute(job_id, params)
+        finally:
+            with self._active_lock:
+                self._active.discard(job_id)
+
+    def _execute(self, job_id: str, params: Dict):
+        self.store.update(job_id, status='running', started_at=time.time())
+        progress = JobProgress(self.store, job_id)
+        try:
+            result = self.runner(params, progress)
+            if isinstance(result, dict) and result.get('success') is False:
+                raise RuntimeError(result.get('error', 'Scrape failed'))
+            self.store.update(job_id, status='completed', finished_at=time.time(), result=result)
+            progress.put({'type': 'done', 'status': 'completed', 'message': 'Job completed'})
+        except Exception as e:
+            # Jobs cut short by a shutdown can be rerun, so they are not reported as failures
+            status = 'interrupted' if self._stopping else 'failed'
+            self.store.update(job_id, status=status, finished_at=time.time(), error=str(e))
+            progress.put({'type': 'done', 'status': status, 'error': str(e), 'message': f'Job {status}: {e}'})
+
+    def shutdown(self, wait: bool = False):
+        """
+        Stop accepting jobs and cancel the queued ones
+
+        Args:
+            wait: Wait for running jobs to finish, then mark this process's cancelled jobs as interrupted
+        """
+        self._stopping = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        if wait:
+            with self._active_lock:
+                cancelled = list(self._active)
+            self.store.mark_interrupted(cancelled)
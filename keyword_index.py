@@ -0,0 +1,125 @@
+"""
+Multi-keyword matcher for lot text
+All keywords are compiled into one Aho-Corasick automaton, so each text is scanned once no
+matter how many keywords there are. Uses pyahocorasick when installed, otherwise a pure
+Python automaton with the same results.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+
+class _PythonAutomaton:
+    """Aho-Corasick automaton over keyword IDs"""
+
+    def __init__(self, keywords: List[str]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state] += (keyword_id,)
+
+        # Breadth-first pass to set failure links; each state also reports its suffixes' keywords
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def search(self, text: str) -> set:
+        found = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class KeywordIndex:
+    """Find which of a fixed set of keywords occur in a text, in a single pass"""
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False):
+        """
+        Args:
+            keywords: Keywords to look for (substring matches, like the 'in' operator)
+            case_sensitive: Match case exactly (default: compare lower-cased text and keywords)
+        """
+        self.case_sensitive = case_sensitive
+        self.keywords = list(dict.fromkeys(self._fold(k) for k in keywords if k))
+        self.positions = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        if ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for i, keyword in enumerate(self.keywords):
+                self._automaton.add_word(keyword, i)
+            self._automaton.make_automaton()
+            self._search = lambda text: {i for _, i in self._automaton.iter(text)}
+        else:
+            self._search = _PythonAutomaton(self.keywords).search
+
+    def _fold(self, text) -> str:
+        if text is None or (isinstance(text, float) and text != text):
+            return ''  # None and NaN hold no keywords
+        text = str(text)
+        return text if self.case_sensitive else text.lower()
+
+    def hit_ids(self, text) -> set:
+        """Positions (in self.keywords) of the keywords found in text"""
+        return self._search(self._fold(text)) if self.keywords else set()
+
+    def hits(self, text) -> FrozenSet[str]:
+        """Keywords found in text"""
+        return frozenset(self.keywords[i] for i in self.hit_ids(text))
+
+    def hits_many(self, texts: Iterable) -> List[FrozenSet[str]]:
+        """Keywords found in each text"""
+        return [self.hits(text) for text in texts]
+
+    def match_matrix(self, texts: Iterable) -> np.ndarray:
+        """
+        Boolean matrix with one row per text and one column per keyword (in self.keywords order)
+        """
+        rows, columns = [], []
+        count = 0
+        for row, text in enumerate(texts):
+            for keyword_id in self.hit_ids(text):
+                rows.append(row)
+                columns.append(keyword_id)
+            count = row + 1
+        matrix = np.zeros((count, len(self.keywords)), dtype=bool)
+        matrix[rows, columns] = True
+        return matrix
+
+    def masks(self, texts: Iterable) -> Dict[str, np.ndarray]:
+        """Boolean mask per keyword, from one scan of the texts"""
+        matrix = self.match_matrix(texts)
+        return {keyword: matrix[:, i] for i, keyword in enumerate(self.keywords)}
+
+    def any_mask(self, texts: Iterable) -> np.ndarray:
+        """True for texts containing at least one keyword"""
+        return np.fromiter((bool(self.hit_ids(text)) for text in texts), dtype=bool)
@@ -0,0 +1,214 @@
+"""
+Shared lot-card extractor for Regal Auctions pages
+Fields are declared once in LOT_FIELDS / TABLE_FIELDS and compiled to lxml XPath
+expressions; a BeautifulSoup path interprets the same spec for callers that already hold a soup
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from lxml import etree, html as lxml_html
+
+# Container element of a single lot
+LOT_CARD = ('div', 'lot-card')
+
+# Simple fields: a chain of (tag, css class) steps, each taking the first matching descendant,
+# then either the element text or an attribute
+LOT_FIELDS = {
+    'lot_number': {'path': [('div', 'lot-number'), ('strong', None)]},
+    'title': {'path': [('div', 'lot__name')]},
+    'description': {'path': [('div', 'lot__description')], 'max_length': 500},
+    'image_url': {'path': [('img', None)], 'attr': 'src'},
+    'lot_url': {'path': [('div', 'lot__description'), ('a', None)], 'attr': 'href'},
+    'starting_bid': {'path': [('div', 'lot__bidding'), ('span', 'fs-4')]},
+}
+
+# Key/value rows of the description table; the first label fragment found in a row's key wins
+TABLE_PATH = [('div', 'lot__description'), ('table', None)]
+TABLE_FIELDS = [
+    ('odometer', 'ODOMETER'),
+    ('engine', 'ENGINE'),
+    ('declarations', 'DECLARATION'),
+    ('options', 'OPTIONS'),
+    ('reserve_price', 'RESERVE'),
+]
+
+# Order of keys in every extracted lot
+FIELD_ORDER = ['lot_number', 'title', 'description', 'image_url', 'lot_url', 'starting_bid',
+               'reserve_price', 'odometer', 'engine', 'declarations', 'options']
+
+
+def _step_xpath(tag: str, css_class: Optional[str]) -> str:
+    """XPath for the descendants matching one (tag, class) step"""
+    if css_class is None:
+        return f'.//{tag}'
+    return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+
+def _path_xpath(path) -> str:
+    """XPath selecting the first match of each step in turn, like chained BeautifulSoup find() calls"""
+    expr = f'({_step_xpath(*path[0])})[1]'
+    for tag, css_class in path[1:]:
+        expr = f'({expr}{_step_xpath(tag, css_class)[1:]})[1]'
+    return expr
+
+
+def _compile():
+    """Compile the field spec into reusable XPath objects"""
+    fields = []
+    for name, spec in LOT_FIELDS.items():
+        fields.append((name, etree.XPath(_path_xpath(spec['path'])), spec.get('attr'), spec.get('max_length')))
+    return {
+        'cards': etree.XPath('/' + _step_xpath(*LOT_CARD)[1:]),
+        'fields': fields,
+        'table_rows': etree.XPath(_path_xpath(TABLE_PATH) + '//tr'),
+        'row_cells': etree.XPath('.//td'),
+    }
+
+
+_COMPILED = _compile()
+
+
+def _text(element) -> str:
+    """Same result as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(part.strip() for part in element.itertext() if part.strip())
+
+
+def _empty_lot() -> Dict:
+    return {name: '' for name in FIELD_ORDER}
+
+
+def _is_valid(lot: Dict) -> bool:
+    return bool(lot and (lot.get('lot_number') or lot.get('title')))
+
+
+def _apply_table(lot: Dict, rows):
+    """Fill table fields from (key, value) pairs"""
+    for key, value in rows:
+        key = key.upper()
+        for name, label in TABLE_FIELDS:
+            if label in key:
+                lot[name] = value
+                break
+
+
+def extract_lot(card) -> Dict:
+    """
+    Extract one lot from an lxml lot-card element
+
+    Args:
+        card: lxml element of a div.lot-card
+
+    Returns:
+        Dictionary with the fields in FIELD_ORDER
+    """
+    lot = _empty_lot()
+
+    for name, xpath, attr, max_length in _COMPILED['fields']:
+        found = xpath(card)
+        if not found:
+            continue
+        value = found[0].get(attr, '') if attr else _text(found[0])
+        lot[name] = value[:max_length] if max_length else value
+
+    rows = []
+    for row in _COMPILED['table_rows'](card):
+        cells = _COMPILED['row_cells'](row)
+        if len(cells) >= 2:
+            rows.append((_text(cells[0]), _text(cells[1])))
+    _apply_table(lot, rows)
+
+    return lot
+
+
+def extract_lots(page_source: str, page_num: Optional[int] = None, timings: Optional[Dict] = None) -> List[Dict]:
+    """
+    Extract all valid lots from a page with lxml, without building a BeautifulSoup tree
+
+    Args:
+        page_source: Rendered page HTML
+        page_num: Page number to record on each lot (omitted when None)
+        timings: Optional dict that receives 'parse' (building the tree) and 'extract' (reading the
+                 lot cards) seconds
+
+    Returns:
+        List of lot dictionaries that have a lot number or title
+    """
+    if not page_source or not page_source.strip():
+        return []
+
+    start = time.perf_counter()
+    document = lxml_html.fromstring(page_source)
+    parsed = time.perf_counter()
+    lots = []
+    for card in _COMPILED['cards'](document):
+        lot = extract_lot(card)
+        if _is_valid(lot):
+            if page_num is not None:
+                lot['page'] = page_num
+            lots.append(lot)
+    if timings is not None:
+        timings['parse'] = parsed - start
+        timings['extract'] = time.perf_counter() - parsed
+    return lots
+
+
+def _soup_find(element, path):
+    """Follow a spec path with BeautifulSoup find() calls"""
+    for tag, css_class in path:
+        if element is None:
+            return None
+        element = element.find(tag, class_=css_class) if css_class else element.find(tag)
+    return element
+
+
+def extract_lot_from_soup(item) -> Dict:
+    """
+    Extract one lot from a BeautifulSoup lot-card element (compatibility path)
+
+    Args:
+        item: BeautifulSoup element of a div.lot-card
+
+    Returns:
+        Dictionary with the fields in FIELD_ORDER
+    """
+    lot = _empty_lot()
+
+    for name, spec in LOT_FIELDS.items():
+        found = _soup_find(item, spec['path'])
+        if found is None:
+            continue
+        value = found.get(spec['attr'], '') if spec.get('attr') else found.get_text(strip=True)
+        lot[name] = value[:spec['max_length']] if spec.get('max_length') else value
+
+    table = _soup_find(item, TABLE_PATH)
+    if table is not None:
+        rows = []
+        for row in table.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                rows.append((cells[0].get_text(strip=True), cells[1].get_text(strip=True)))
+        _apply_table(lot, rows)
+
+    return lot
+
+
+def extract_lots_from_soup(soup, page_num: Optional[int] = None) -> List[Dict]:
+    """
+    Extract all valid lots from a BeautifulSoup tree (compatibility path)
+
+    Args:
+        soup: Parsed BeautifulSoup document
+        page_num: Page number to record on each lot (omitted when None)
+
+    Returns:
+        List of lot dictionaries that have a lot number or title
+    """
+    lots = []
+    for item in soup.find_all(LOT_CARD[0], class_=LOT_CARD[1]):
+        lot = extract_lot_from_soup(item)
+        if _is_valid(lot):
+            if page_num is not None:
+                lot['page'] = page_num
+            lots.append(lot)
+    return lots
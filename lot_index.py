@@ -0,0 +1,217 @@
+"""
+In-memory indexes over a DataFrame of lots
+Built once when lots are loaded: an inverted token index over text columns, sorted numeric
+indexes on prices and odometer, and hash indexes on lot_number and page. Queries work on row
+positions and only touch the DataFrame once, to select the matching rows.
+"""
+
+import re
+from itertools import chain
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from lot_storage import parse_amounts, parse_odometers_km
+
+TEXT_COLUMNS = ['title', 'description']
+
+_TOKEN = re.compile(r'\w+')
+_EMPTY = np.array([], dtype=np.int64)
+
+
+class _Groups:
+    """Sorted row positions for each key, stored as one array plus offsets"""
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray):
+        codes, uniques = pd.factorize(keys, use_na_sentinel=True)
+        valid = codes >= 0
+        codes, rows = codes[valid], rows[valid]
+        # Rows come in ascending order, so a stable sort by key leaves each key's rows sorted
+        order = np.argsort(codes, kind='stable')
+        codes, rows = codes[order], rows[order]
+        distinct = np.ones(len(rows), dtype=bool)
+        distinct[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, self.rows = codes[distinct], rows[distinct]
+        self.offsets = np.searchsorted(codes, np.arange(len(uniques) + 1))
+        self.codes = {key: code for code, key in enumerate(uniques)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def get(self, key) -> np.ndarray:
+        code = self.codes.get(key)
+        if code is None:
+            return _EMPTY
+        return self.rows[self.offsets[code]:self.offsets[code + 1]]
+
+
+class TokenIndex:
+    """Inverted index from lower-cased word tokens to the sorted row positions containing them"""
+
+    def __init__(self, texts: pd.Series):
+        self.texts = texts.fillna('').astype(str).str.lower().to_numpy(dtype=object)
+        tokens = [_TOKEN.findall(text) for text in self.texts]
+        rows = np.repeat(np.arange(len(tokens), dtype=np.int64), [len(t) for t in tokens])
+        flat = np.fromiter(chain.from_iterable(tokens), dtype=object, count=len(rows))
+        self.postings = _Groups(flat, rows)
+        self._partial = {}
+
+    def containing(self, fragment: str) -> np.ndarray:
+        """Sorted rows with a token that contains fragment"""
+        if fragment not in self._partial:
+            matched = np.zeros(len(self.texts), dtype=bool)
+            for token in self.postings:
+                if fragment in token:
+                    matched[self.postings.get(token)] = True
+            self._partial[fragment] = np.flatnonzero(matched)
+        return self._partial[fragment]
+
+    def search(self, keyword: str) -> np.ndarray:
+        """
+        Rows whose text contains keyword as a case-insensitive substring
+
+        Every word of the keyword lies inside a token of a matching row, so the rows holding the
+        longest word are the candidates, and only those are checked against the full text.
+        """
+        needle = keyword.lower()
+        words = _TOKEN.findall(needle)
+        if not words:
+            # Nothing to look up (empty or punctuation only); check every row
+            return np.flatnonzero([needle in text for text in self.texts])
+
+        rows = self.containing(max(words, key=len))
+        if words == [needle]:
+            return rows  # a single word inside a token is already a substring match
+        texts = self.texts
+        return rows[np.fromiter((needle in texts[row] for row in rows), dtype=bool, count=len(rows))]
+
+
+class SortedIndex:
+    """Row positions ordered by a numeric value, for range queries by binary search"""
+
+    def __init__(self, values: pd.Series):
+        values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        self.rows = valid[np.argsort(values[valid], kind='stable')]
+        self.values = values[self.rows]
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Sorted rows with low <= value <= high (either bound may be None); missing values never match"""
+        start = 0 if low is None else np.searchsorted(self.values, low, side='left')
+        stop = len(self.values) if high is None else np.searchsorted(self.values, high, side='right')
+        return np.sort(self.rows[start:stop])
+
+
+class HashIndex:
+    """Row positions for each distinct value of a column"""
+
+    def __init__(self, keys: pd.Series, normalize):
+        self.normalize = normalize
+        self.groups = _Groups(keys.to_numpy(dtype=object), np.arange(len(keys), dtype=np.int64))
+
+    def get(self, value) -> np.ndarray:
+        return self.groups.get(self.normalize(value))
+
+
+def _lot_key(value) -> str:
+    return str(value).strip().upper()
+
+
+def _page_key(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LotIndex:
+    """Token, numeric and key indexes over one DataFrame of lots"""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: Lots; indexes are built for whichever of the known columns it has
+        """
+        self.df = df
+        self.text: Dict[str, TokenIndex] = {
+            column: TokenIndex(df[column].reset_index(drop=True)) for column in TEXT_COLUMNS if column in df.columns
+        }
+        self.keys: Dict[str, HashIndex] = {}
+        if 'lot_number' in df.columns:
+            lot_numbers = df['lot_number'].astype(object).where(df['lot_number'].notna(), None)
+            self.keys['lot_number'] = HashIndex(lot_numbers.map(_lot_key, na_action='ignore'), _lot_key)
+        if 'page' in df.columns:
+            pages = pd.to_numeric(df['page'], errors='coerce').astype('Int64')
+            self.keys['page'] = HashIndex(pages.astype(object).where(pages.notna(), None), _page_key)
+
+        # Typed columns from lot_storage are used when present, otherwise the text is parsed once here
+        self.numeric: Dict[str, SortedIndex] = {}
+        for name, typed, column, parse in (
+                ('current_bid', 'current_bid_amount', 'current_bid', parse_amounts),
+                ('starting_bid', 'starting_bid_amount', 'starting_bid', parse_amounts),
+                ('reserve_price', 'reserve_amount', 'reserve_price', parse_amounts),
+                ('odometer_km', 'odometer_km', 'odometer', parse_odometers_km)):
+            if typed in df.columns:
+                self.numeric[name] = SortedIndex(df[typed])
+            elif column in df.columns:
+                self.numeric[name] = SortedIndex(parse(df[column]))
+
+    def rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """Select rows by position; a contiguous run is returned as a slice of the DataFrame"""
+        if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+            return self.df.iloc[positions[0]:positions[-1] + 1]
+        return self.df.iloc[positions]
+
+    def search(self, keyword: str, column: str = 'title') -> np.ndarray:
+        """Row positions whose column contains keyword (case-insensitive substring)"""
+        if column in self.text:
+            return self.text[column].search(keyword)
+        if column not in self.df.columns:
+            raise KeyError(column)
+        # Columns without a token index fall back to a scan
+        mask = self.df[column].astype(str).str.contains(keyword, case=False, regex=False, na=False)
+        return np.flatnonzero(mask.to_numpy(dtype=bool))
+
+    def range(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Row positions with low <= column value <= high"""
+        if column not in self.numeric:
+            raise KeyError(f"No numeric index on '{column}' (indexed: {', '.join(self.numeric)})")
+        return self.numeric[column].range(low, high)
+
+    def lookup(self, column: str, value) -> np.ndarray:
+        """Row positions where column equals value (lot numbers ignore case and whitespace)"""
+        if column not in self.keys:
+            raise KeyError(f"No key index on '{column}' (indexed: {', '.join(self.keys)})")
+        return self.keys[column].get(value)
+
+    def query(self, keywords: Optional[Dict[str, str]] = None, ranges: Optional[Dict[str, tuple]] = None,
+              keys: Optional[Dict[str, object]] = None) -> pd.DataFrame:
+        """
+        Lots matching every condition
+
+        Args:
+            keywords: Column -> keyword it must contain, e.g. {'title': 'ford'}
+            ranges: Numeric index -> (low, high), e.g. {'odometer_km': (None, 100000)}
+            keys: Key column -> value, e.g. {'page': 3}
+
+        Returns:
+            Matching rows of the DataFrame, in their original order
+        """
+        conditions = [self.search(keyword, column) for column, keyword in (keywords or {}).items()]
+        conditions += [self.range(column, *bounds) for column, bounds in (ranges or {}).items()]
+        conditions += [self.lookup(column, value) for column, value in (keys or {}).items()]
+        if not conditions:
+            return self.df
+
+        # Start from the most selective condition so each intersection is as small as possible
+        conditions.sort(key=len)
+        positions = conditions[0]
+        for rows in conditions[1:]:
+            if not len(positions):
+                break
+            positions = np.intersect1d(positions, rows, assume_unique=True)
+        return self.rows(positions)
@@ -0,0 +1,212 @@
+"""
+Typed, columnar storage for scraped lots
+Prices, odometer readings and lot numbers are normalised into typed columns and written
+to a Parquet dataset partitioned by auction and date, one file per scrape run
+"""
+
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DATASET_ROOT = 'data/lots'
+
+KM_PER_MILE = 1.609344
+
+# Partition columns are kept as strings so auction IDs and dates are not re-typed on read
+PARTITIONING = ds.partitioning(pa.schema([('auction_id', pa.string()), ('date', pa.string())]), flavor='hive')
+
+_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_LOT_SEQ = re.compile(r'\d+')
+_MAKE = re.compile(r'^\s*(?:19|20)\d{2}\s+([A-Za-z][\w-]*)')
+
+
+def parse_amount(value) -> Optional[float]:
+    """'$1,234' -> 1234.0; None when the text holds no amount"""
+    match = _NUMBER.search(str(value)) if value is not None else None
+    return float(match.group().replace(',', '')) if match else None
+
+
+def _map_distinct(values: pd.Series, parse) -> np.ndarray:
+    """Apply a scalar parser once per distinct value (scraped prices and readings repeat a lot)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    parsed = np.empty(len(uniques), dtype=object)
+    for code, value in enumerate(uniques):
+        parsed[code] = parse(value)
+    return parsed[codes]
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """parse_amount over a Series: floats with NaN where the text holds no amount"""
+    return pd.Series(_map_distinct(values, parse_amount).astype(float), index=values.index)
+
+
+def parse_odometers_km(values: pd.Series) -> pd.Series:
+    """parse_odometer over a Series, kilometres only: floats with NaN for unreadable readings"""
+    return pd.Series(_map_distinct(values, lambda value: parse_odometer(value)[0]).astype(float), index=values.index)
+
+
+def parse_reserve_type(value) -> Optional[str]:
+    """Classify a reserve price: 'amount', 'seller_approval' or 'unreserved'"""
+    text = str(value or '').lower()
+    if 'seller approval' in text:
+        return 'seller_approval'
+    if 'unreserved' in text:
+        return 'unreserved'
+    return 'amount' if parse_amount(value) is not None else None
+
+
+def parse_odometer(value) -> tuple:
+    """
+    Parse an odometer reading like '148,603 KM' or '52,000 MILES'
+
+    Returns:
+        (kilometres or None, unit) with unit 'km', 'miles', 'unknown' or None when empty
+    """
+    text = str(value or '').strip().lower()
+    if not text:
+        return None, None
+    amount = parse_amount(text)
+    if amount is None:
+        return None, 'unknown'
+    if 'mile' in text or re.search(r'\bmi\b', text):
+        return round(amount * KM_PER_MILE, 1), 'miles'
+    return amount, 'km'
+
+
+def parse_lot_number(value) -> tuple:
+    """
+    Normalise a lot number like ' 299r ' or 'TBD-12'
+
+    Returns:
+        (upper-cased lot number, numeric sequence or None)
+    """
+    text = str(value or '').strip().upper()
+    match = _LOT_SEQ.search(text)
+    return text, int(match.group()) if match else None
+
+
+def parse_make(title) -> Optional[str]:
+    """Make from a '<year> <MAKE> <model>' title, upper-cased; None for other titles"""
+    match = _MAKE.match(str(title or ''))
+    return match.group(1).upper() if match else None
+
+
+def normalize_lots(lots: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """
+    Add typed columns to scraped lots, keeping the original text columns for display
+
+    Added columns: lot_seq, make, starting_bid_amount, current_bid_amount, reserve_amount, reserve_type,
+    odometer_km, odometer_unit
+
+    Args:
+        lots: DataFrame or list of lot dictionaries
+
+    Returns:
+        New DataFrame with typed columns
+    """
+    df = pd.DataFrame(lots).copy()
+    df = df.drop(columns=['raw_html'], errors='ignore')
+
+    if 'page' in df.columns:
+        df['page'] = pd.to_numeric(df['page'], errors='coerce').astype('Int64')
+
+    if 'lot_number' in df.columns:
+        parsed = [parse_lot_number(v) for v in df['lot_number']]
+        df['lot_number'] = pd.Series([p[0] for p in parsed], index=df.index, dtype='string')
+        df['lot_seq'] = pd.Series([p[1] for p in parsed], index=df.index, dtype='Int64')
+
+    if 'title' in df.columns:
+        df['make'] = pd.Series([parse_make(v) for v in df['title']], index=df.index, dtype='string')
+
+    if 'starting_bid' in df.columns:
+        df['starting_bid_amount'] = parse_amounts(df['starting_bid']).astype('Float64')
+
+    if 'current_bid' in df.columns:
+        df['current_bid_amount'] = parse_amounts(df['current_bid']).astype('Float64')
+
+    if 'reserve_price' in df.columns:
+        reserve_types = _map_distinct(df['reserve_price'], parse_reserve_type)
+        df['reserve_type'] = pd.Series(reserve_types, index=df.index, dtype='category')
+        df['reserve_amount'] = parse_amounts(df['reserve_price']).where(reserve_types == 'amount').astype('Float64')
+
+    if 'odometer' in df.columns:
+        parsed = _map_distinct(df['odometer'], parse_odometer)
+        df['odometer_km'] = pd.Series([p[0] for p in parsed], index=df.index, dtype='Float64')
+        df['odometer_unit'] = pd.Series([p[1] for p in parsed], index=df.index, dtype='category')
+
+    return df
+
+
+def write_lot_dataset(lots: Union[pd.DataFrame, List[Dict]], auction_id: str, date: str,
+                      root: str = DATASET_ROOT, run_id: Optional[str] = None) -> str:
+    """
+    Append one scrape run to the partitioned Parquet dataset
+
+    Args:
+        lots: Scraped lots (normalised here if needed)
+        auction_id: Auction ID partition
+        date: Auction date partition
+        root: Dataset root directory
+        run_id: Identifier of this run (default: UTC timestamp); later runs sort after earlier ones
+
+    Returns:
+        Path of the written Parquet file
+    """
+    run_id = run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    df = lots if 'lot_seq' in getattr(lots, 'columns', []) else normalize_lots(lots)
+    df = df.assign(run_id=run_id)
+
+    directory = os.path.join(root, f'auction_id={auction_id}', f'date={date}')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'run-{run_id}.parquet')
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression='zstd')
+    return path
+
+
+def open_lot_dataset(root: str = DATASET_ROOT) -> ds.Dataset:
+    """Lazy handle on the dataset; nothing is read until a scan"""
+    return ds.dataset(root, format='parquet', partitioning=PARTITIONING)
+
+
+def read_lots(root: str = DATASET_ROOT, columns: Optional[List[str]] = None, auction_id: Optional[str] = None,
+              date: Optional[str] = None, latest_run: bool = True) -> pd.DataFrame:
+    """
+    Read lots from the dataset, scanning only the requested columns and partitions
+
+    Args:
+        root: Dataset root directory
+        columns: Columns to read (None reads all)
+        auction_id: Only this auction
+        date: Only this auction date
+        latest_run: Keep only the most recent run of each auction and date
+
+    Returns:
+        DataFrame of lots
+    """
+    dataset = open_lot_dataset(root)
+
+    condition = None
+    for name, value in (('auction_id', auction_id), ('date', date)):
+        if value is not None:
+            term = ds.field(name) == str(value)
+            condition = term if condition is None else condition & term
+
+    if latest_run:
+        runs = dataset.to_table(columns=['auction_id', 'date', 'run_id'], filter=condition).to_pandas()
+        if runs.empty:
+            return pd.DataFrame(columns=columns)
+        latest = runs.groupby(['auction_id', 'date'], observed=True)['run_id'].max()
+        term = None
+        for (auction, day), run_id in latest.items():
+            match = (ds.field('auction_id') == auction) & (ds.field('date') == day) & (ds.field('run_id') == run_id)
+            term = match if term is None else term | match
+        condition = term if condition is None else condition & term
+
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
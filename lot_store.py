@@ -0,0 +1,293 @@
+"""
+Historical lot store
+Every scrape run is upserted into SQLite keyed by (auction_id, date, lot_number), so history
+survives re-runs and can be queried across auctions. Price changes between runs are kept as
+snapshots, and which lots each run saw is kept so a run's own lots can be queried. Usage: python lot_store.py import data/auction_data.csv --auction-id 1778628 --date 2025-10-24
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from lot_storage import normalize_lots
+
+STORE_PATH = 'data/lots.db'
+
+# Columns of the lots table after the key, in insert order, with their SQLite types
+LOT_COLUMNS = {
+    'page': 'INTEGER', 'lot_seq': 'INTEGER', 'title': 'TEXT', 'make': 'TEXT', 'description': 'TEXT',
+    'image_url': 'TEXT', 'lot_url': 'TEXT', 'starting_bid': 'TEXT', 'current_bid': 'TEXT', 'reserve_price': 'TEXT',
+    'odometer': 'TEXT', 'engine': 'TEXT', 'declarations': 'TEXT', 'options': 'TEXT', 'starting_bid_amount': 'REAL',
+    'current_bid_amount': 'REAL', 'reserve_amount': 'REAL', 'reserve_type': 'TEXT', 'odometer_km': 'REAL',
+    'odometer_unit': 'TEXT',
+}
+KEY_COLUMNS = ['auction_id', 'date', 'lot_number']
+
+# Sort keys accepted by query(), mapped to the columns they order by (text prices sort by their parsed amount)
+SORT_KEYS = {
+    'lot_number': ['lot_seq', 'lot_number'],
+    'title': ['title'],
+    'make': ['make'],
+    'starting_bid': ['starting_bid_amount'],
+    'current_bid': ['current_bid_amount'],
+    'reserve_price': ['reserve_amount'],
+    'odometer': ['odometer_km'],
+    'engine': ['engine'],
+    'declarations': ['declarations'],
+    'page': ['page', 'lot_seq'],
+}
+SNAPSHOT_COLUMNS = ['starting_bid_amount', 'current_bid_amount', 'reserve_amount', 'reserve_type']
+
+_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS lots (
+        auction_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        lot_number TEXT NOT NULL,
+        {', '.join(f'{column} {sql_type}' for column, sql_type in LOT_COLUMNS.items())},
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        run_id TEXT NOT NULL,
+        PRIMARY KEY (auction_id, date, lot_number)
+    );
+    CREATE TABLE IF NOT EXISTS lot_snapshots (
+        auction_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        lot_number TEXT NOT NULL,
+        run_id TEXT NOT NULL,
+        captured_at REAL NOT NULL,
+        starting_bid_amount REAL,
+        current_bid_amount REAL,
+        reserve_amount REAL,
+        reserve_type TEXT,
+        PRIMARY KEY (auction_id, date, lot_number, run_id)
+    );
+    CREATE TABLE IF NOT EXISTS run_lots (
+        run_id TEXT NOT NULL,
+        auction_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        lot_number TEXT NOT NULL,
+        PRIMARY KEY (run_id, auction_id, date, lot_number)
+    );
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        auction_id TEXT NOT NULL,
+        date TEXT NOT NULL,
+        scraped_at REAL NOT NULL,
+        lot_count INTEGER NOT NULL,
+        changed_count INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS lots_make ON lots (make);
+    CREATE INDEX IF NOT EXISTS lots_starting_bid ON lots (starting_bid_amount);
+    CREATE INDEX IF NOT EXISTS lots_current_bid ON lots (current_bid_amount);
+    CREATE INDEX IF NOT EXISTS lots_odometer ON lots (odometer_km);
+    CREATE INDEX IF NOT EXISTS lots_auction_starting_bid ON lots (auction_id, date, starting_bid_amount);
+    CREATE INDEX IF NOT EXISTS lots_auction_odometer ON lots (auction_id, date, odometer_km);
+'''
+
+
+class LotStore:
+    """SQLite persistence for lots across scrape runs"""
+
+    def __init__(self, db_path: str = STORE_PATH, batch_size: int = 1000):
+        """
+        Args:
+            db_path: SQLite database file (created if missing)
+            batch_size: Rows per executemany call when upserting
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            # WAL keeps the database consistent on a crash; NORMAL only risks the last transactions on power loss
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(_SCHEMA)
+
+    def upsert_lots(self, lots: Union[pd.DataFrame, List[Dict]], auction_id: str, date: str,
+                    run_id: Optional[str] = None) -> Dict:
+        """
+        Insert or update one scrape run's lots, recording a price snapshot for new lots and changed prices
+
+        Args:
+            lots: Scraped lots (normalised here if needed)
+            auction_id: Auction ID
+            date: Auction date
+            run_id: Identifier of this run (default: UTC timestamp)
+
+        Returns:
+            Dictionary with run_id, lots (rows upserted) and snapshots (price changes recorded)
+        """
+        run_id = run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        df = lots if 'lot_seq' in getattr(lots, 'columns', []) else normalize_lots(lots)
+        df = df.drop_duplicates('lot_number', keep='last')
+        df = df.reindex(columns=['lot_number', *LOT_COLUMNS])
+        df = df.astype(object).where(df.notna(), None)
+
+        now = time.time()
+        rows = [(auction_id, date, *values, now, now, run_id) for values in df.itertuples(index=False, name=None)]
+
+        insert_columns = [*KEY_COLUMNS, *LOT_COLUMNS, 'first_seen', 'last_seen', 'run_id']
+        updates = ', '.join(f'{column} = excluded.{column}' for column in [*LOT_COLUMNS, 'last_seen', 'run_id'])
+        upsert = (f'INSERT INTO lots ({", ".join(insert_columns)}) VALUES ({", ".join("?" * len(insert_columns))}) '
+                  f'ON CONFLICT (auction_id, date, lot_number) DO UPDATE SET {updates}')
+
+        snapshot_positions = [list(df.columns).index(column) for column in SNAPSHOT_COLUMNS]
+        with self._lock, self._conn:
+            previous = {
+                row[0]: tuple(row[1:]) for row in self._conn.execute(
+                    f'SELECT lot_number, {", ".join(SNAPSHOT_COLUMNS)} FROM lots WHERE auction_id = ? AND date = ?',
+                    (auction_id, date))
+            }
+            snapshots = []
+            for values in df.itertuples(index=False, name=None):
+                prices = tuple(values[i] for i in snapshot_positions)
+                if previous.get(values[0]) != prices:
+                    snapshots.append((auction_id, date, values[0], run_id, now, *prices))
+
+            for start in range(0, len(rows), self.batch_size):
+                self._conn.executemany(upsert, rows[start:start + self.batch_size])
+            members = [(run_id, auction_id, date, values[0]) for values in df.itertuples(index=False, name=None)]
+            for start in range(0, len(members), self.batch_size):
+                self._conn.executemany('INSERT OR IGNORE INTO run_lots (run_id, auction_id, date, lot_number) '
+                                       'VALUES (?, ?, ?, ?)', members[start:start + self.batch_size])
+            for start in range(0, len(snapshots), self.batch_size):
+                self._conn.executemany(
+                    f'INSERT OR REPLACE INTO lot_snapshots (auction_id, date, lot_number, run_id, captured_at, '
+                    f'{", ".join(SNAPSHOT_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    snapshots[start:start + self.batch_size])
+            self._conn.execute('INSERT OR REPLACE INTO runs (run_id, auction_id, date, scraped_at, lot_count, '
+                               'changed_count) VALUES (?, ?, ?, ?, ?, ?)',
+                               (run_id, auction_id, date, now, len(rows), len(snapshots)))
+
+        return {'run_id': run_id, 'lots': len(rows), 'snapshots': len(snapshots)}
+
+    def _filters(self, auction_id: Optional[str] = None, date: Optional[str] = None,
+                 makes: Optional[List[str]] = None, min_price: Optional[float] = None,
+                 max_price: Optional[float] = None, max_odometer_km: Optional[float] = None,
+                 lot_number: Optional[str] = None, title: Optional[str] = None,
+                 run_id: Optional[str] = None) -> tuple:
+        """WHERE clause and parameters for query() and count()"""
+        conditions, params = [], []
+        if run_id is not None:
+            conditions.append('EXISTS (SELECT 1 FROM run_lots WHERE run_lots.run_id = ? AND '
+                              'run_lots.auction_id = lots.auction_id AND run_lots.date = lots.date AND '
+                              'run_lots.lot_number = lots.lot_number)')
+            params.append(run_id)
+        for clause, value in (('auction_id = ?', auction_id), ('date = ?', date),
+                              ('starting_bid_amount >= ?', min_price), ('starting_bid_amount <= ?', max_price),
+                              ('odometer_km <= ?', max_odometer_km)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        if makes:
+            conditions.append(f'make IN ({", ".join("?" * len(makes))})')
+            params.extend(make.upper() for make in makes)
+        # Substring filters; LIKE is case-insensitive for ASCII, wildcards in the text are matched literally
+        for column, text in (('lot_number', lot_number), ('title', title)):
+            if text:
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+                params.append(f'%{escaped}%')
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+    def query(self, auction_id: Optional[str] = None, date: Optional[str] = None,
+              makes: Optional[List[str]] = None, min_price: Optional[float] = None,
+              max_price: Optional[float] = None, max_odometer_km: Optional[float] = None,
+              lot_number: Optional[str] = None, title: Optional[str] = None, run_id: Optional[str] = None,
+              columns: Optional[List[str]] = None, sort: Optional[str] = None, descending: bool = False,
+              limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+        """
+        Lots matching all the given conditions, using the make/price/odometer indexes
+
+        Args:
+            auction_id: Only this auction
+            date: Only this auction date
+            makes: Only these makes (upper-case, e.g. ['FORD', 'RAM'])
+            min_price: Minimum starting bid
+            max_price: Maximum starting bid
+            max_odometer_km: Maximum odometer reading in kilometres
+            lot_number: Lot number contains this text
+            title: Title contains this text (case-insensitive)
+            run_id: Only lots seen by this run (lots missing from it, e.g. withdrawn since, are left out)
+            columns: Columns to return (None returns all)
+            sort: Key from SORT_KEYS (default: auction, date and lot sequence)
+            descending: Reverse the sort order
+            limit: Maximum number of lots
+            offset: Lots to skip before the first one returned
+
+        Returns:
+            DataFrame of lots
+        """
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'. Use one of: {', '.join(SORT_KEYS)}")
+        where, params = self._filters(auction_id, date, makes, min_price, max_price, max_odometer_km,
+                                      lot_number, title, run_id)
+        direction = 'DESC' if descending else 'ASC'
+        # Missing values sort last either way; the lot key breaks ties so pages never overlap
+        order = [f'{column} IS NULL, {column} {direction}' for column in SORT_KEYS.get(sort, [])]
+        order += ['auction_id', 'date', 'lot_seq', 'lot_number']
+
+        sql = f'SELECT {", ".join(columns) if columns else "*"} FROM lots{where} ORDER BY {", ".join(order)}'
+        if limit is not None or offset:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [-1 if limit is None else int(limit), int(offset)]
+
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def count(self, **filters) -> int:
+        """Number of lots query() would return for the same filters (without limit/offset)"""
+        where, params = self._filters(**filters)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM lots{where}', params).fetchone()[0]
+
+    def price_history(self, auction_id: str, date: str, lot_number: str) -> pd.DataFrame:
+        """Price snapshots of one lot, oldest first"""
+        with self._lock:
+            return pd.read_sql_query(
+                'SELECT run_id, captured_at, ' + ', '.join(SNAPSHOT_COLUMNS) + ' FROM lot_snapshots '
+                'WHERE auction_id = ? AND date = ? AND lot_number = ? ORDER BY captured_at, run_id',
+                self._conn, params=(auction_id, date, lot_number.strip().upper()))
+
+    def runs(self) -> pd.DataFrame:
+        """Recorded scrape runs, newest first"""
+        with self._lock:
+            return pd.read_sql_query('SELECT * FROM runs ORDER BY scraped_at DESC', self._conn)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Import CSV or JSON exports of earlier runs into the store"""
+    parser = argparse.ArgumentParser(description='Historical lot store')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    importer = subcommands.add_parser('import', help='Upsert a CSV or JSON export of one auction')
+    importer.add_argument('paths', nargs='+', help='auction_data.csv / auction_data.json files')
+    importer.add_argument('--auction-id', required=True)
+    importer.add_argument('--date', required=True)
+    importer.add_argument('--db', default=STORE_PATH, help=f'SQLite database (default: {STORE_PATH})')
+    args = parser.parse_args()
+
+    store = LotStore(args.db)
+    for path in args.paths:
+        df = pd.read_json(path, dtype=False) if path.endswith('.json') else pd.read_csv(path, dtype=str)
+        result = store.upsert_lots(df, args.auction_id, args.date)
+        print(f"✅ {path}: {result['lots']} lots upserted, {result['snapshots']} price snapshots")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""
+Timing spans and Prometheus metrics
+A page scrape is broken into spans (seconds spent queueing for a browser, starting it, navigating,
+waiting for readiness, reading page_source, fetching over HTTP, parsing and extracting lots). Spans are
+reported per page, summed per scrape, and aggregated into histograms that GET /metrics serves in the
+Prometheus text format.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Histogram buckets in seconds, from a cache hit to a slow render
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+@contextmanager
+def span(timings: Optional[Dict], name: str):
+    """Add the seconds spent in the block to timings[name] (nothing is recorded when timings is None)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def rounded(timings: Dict) -> Dict[str, float]:
+    """Spans rounded to the millisecond, for events and results"""
+    return {name: round(seconds, 3) for name, seconds in timings.items()}
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q from 0 to 100), or None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class ScrapeTimings:
+    """Span totals over the pages of one scrape"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = 0
+        self._values: Dict[str, List[float]] = {}
+
+    def add_page(self, timings: Dict):
+        with self._lock:
+            self._pages += 1
+            for name, seconds in timings.items():
+                self._values.setdefault(name, []).append(seconds)
+
+    def summary(self) -> Dict:
+        """
+        Returns:
+            {'pages': n, 'spans': {span: {'total', 'avg', 'p50', 'p95', 'max', 'pages'}}}; the statistics
+            are over the pages that had the span (e.g. driver_start only counts pages that started a browser)
+        """
+        with self._lock:
+            spans = {}
+            for name, values in sorted(self._values.items(), key=lambda item: -sum(item[1])):
+                spans[name] = {'total': round(sum(values), 3),
+                               'avg': round(sum(values) / len(values), 3),
+                               'p50': round(percentile(values, 50), 3),
+                               'p95': round(percentile(values, 95), 3),
+                               'max': round(max(values), 3),
+                               'pages': len(values)}
+            return {'pages': self._pages, 'spans': spans}
+
+    def describe(self) -> str:
+        """One-line breakdown of where an average page's time went, largest span first"""
+        summary = self.summary()
+        return ', '.join(f"{name} {values['total'] / summary['pages']:.2f}s"
+                         for name, values in summary['spans'].items() if name not in ('total', 'fetch'))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Monotonic count per label set (name it with the conventional _total suffix)"""
+
+    type = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            return [f'{self.name}{_labels(self.labels, key)} {_format(value)}'
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        with self._lock:
+            counts = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def lines(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = 'le="' + _format(bound) + '"'
+                    lines.append(f'{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}')
+                lines.append(f'{self.name}_sum{_labels(self.labels, key)} {_format(counts[-2])}')
+                lines.append(f'{self.name}_count{_labels(self.labels, key)} {counts[-1]}')
+        return lines
+
+
+class Gauge:
+    """Value read from a callback when metrics are collected"""
+
+    type = 'gauge'
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Dict[tuple, float]],
+                 labels: Sequence[str] = ()):
+        """
+        Args:
+            collect: Returns {label values tuple: value}; use the empty tuple for an unlabelled gauge
+        """
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.collect = collect
+
+    def lines(self) -> List[str]:
+        try:
+            values = self.collect()
+        except Exception as e:
+            print(f"⚠️  Could not collect {self.name}: {e}")
+            return []
+        return [f'{self.name}{_labels(self.labels, key)} {_format(value)}'
+                for key, value in sorted(values.items()) if value is not None]
+
+
+class MetricsRegistry:
+    """Metrics of one process, rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name: str, help_text: str, collect: Callable[[], Dict[tuple, float]],
+              labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, collect, labels))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.lines())
+        return '\n'.join(lines) + '\n'
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
@@ -0,0 +1,192 @@
+"""
+On-disk cache for rendered pages
+Entries are keyed by a hash of the normalised page URL and hold compressed HTML plus the
+lots extracted from it; a small SQLite index drives TTL expiry and size-bounded LRU eviction
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+CACHE_MODES = ('use', 'refresh', 'bypass')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL: lower-case scheme/host, sorted query, no fragment"""
+    parsed = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', parsed.params, query, ''))
+
+
+def cache_key(url: str) -> str:
+    """Cache key for a URL"""
+    return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+
+class PageCache:
+    """TTL + LRU cache of rendered pages stored as gzip files"""
+
+    def __init__(self, directory: str = 'data/page_cache', ttl: float = 300, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            directory: Folder holding cache files and the index database
+            ttl: Seconds an entry stays fresh
+            max_bytes: Total compressed size above which least recently used entries are evicted
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )''')
+
+    def lookup(self, url: str, mode: str = 'use') -> Optional[Dict]:
+        """
+        Return the fresh cache entry for a URL, honouring the request's cache mode
+
+        Args:
+            url: Page URL
+            mode: 'use' reads the cache; 'refresh' and 'bypass' always miss
+
+        Returns:
+            Dictionary with url, html, lots, content_hash and fetched_at, or None
+        """
+        if mode != 'use':
+            return None
+        return self.get(url)
+
+    def store(self, url: str, html: str, lots: Optional[List[Dict]] = None, mode: str = 'use',
+              meta: Optional[Dict] = None, fetched_at: Optional[float] = None) -> Optional[str]:
+        """
+        Save a page unless the cache mode is 'bypass'
+
+        Args:
+            url: Page URL
+            html: Rendered page HTML
+            lots: Lots extracted from the page, if already parsed
+            mode: Request cache mode
+            meta: Extra details kept with the entry (e.g. the fetch backend)
+            fetched_at: When the HTML was fetched; an entry's TTL runs from this time (default: now)
+
+        Returns:
+            Content hash of the stored HTML, or None when nothing was stored
+        """
+        if mode == 'bypass':
+            return None
+        return self.put(url, html, lots, meta, fetched_at)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Fresh entry for a URL, or None"""
+        key = cache_key(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute('SELECT created_at FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None or now - row[0] > self.ttl:
+            if row is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+        self.hits += 1
+        return entry
+
+    def put(self, url: str, html: str, lots: Optional[List[Dict]] = None, meta: Optional[Dict] = None,
+            fetched_at: Optional[float] = None) -> str:
+        """Write an entry and evict old ones if the cache is over its size limit; returns the content hash"""
+        key = cache_key(url)
+        fetched_at = fetched_at or time.time()
+        content_hash = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        entry = {
+            'url': normalize_url(url),
+            'html': html,
+            'lots': lots,
+            'content_hash': content_hash,
+            'fetched_at': fetched_at,
+            'meta': meta or {},
+        }
+
+        path = self._path(key)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO entries (key, url, size, content_hash, created_at, last_access) '
+                               'VALUES (?, ?, ?, ?, ?, ?)',
+                               (key, entry['url'], os.path.getsize(path), content_hash, fetched_at, time.time()))
+        self.evict()
+        return content_hash
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute('SELECT key FROM entries WHERE created_at < ?', (cutoff,))]
+        for key in expired:
+            self._remove(key)
+
+        with self._lock:
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute('SELECT key, size FROM entries ORDER BY last_access').fetchall()
+
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def stats(self) -> Dict:
+        """Entry count, size and hit counters"""
+        with self._lock:
+            count, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {
+            'entries': count,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json.gz')
+
+    def _remove(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
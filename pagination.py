@@ -0,0 +1,94 @@
+"""
+Pagination of auction lot listings
+Works out how many pages an auction has from a rendered page's pagination controls
+"""
+
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+_TAG = re.compile(r'<[^>]+>')
+_OF_PAGES = re.compile(r'\bof\s+(\d+)', re.IGNORECASE)
+_PAGE_PARAM = re.compile(r'[?&](?:amp;)?page=(\d+)')
+
+
+def pagination_hint(html: str) -> Optional[int]:
+    """
+    Cheap early page count from a page that may still be loading: the "of X" text and ?page= links that
+    count_total_pages() also reads, matched on the raw HTML without parsing it.
+    Returns None unless the HTML hints at more than one page.
+    """
+    counts = [int(n) for n in _OF_PAGES.findall(_TAG.sub(' ', html))]
+    counts += [int(n) for n in _PAGE_PARAM.findall(html)]
+    hint = max(counts, default=1)
+    return hint if hint > 1 else None
+
+
+def count_total_pages(page_source: str) -> int:
+    """
+    Work out the number of pages from a rendered page's pagination.
+    Returns 1 when no pagination hints are found.
+    """
+    max_page = 1
+    
+    soup = BeautifulSoup(page_source, 'html.parser')
+    
+    # Strategy 1: Look for "of X" text patterns (most reliable)
+    text_content = soup.get_text()
+    of_pattern = re.search(r'of\s+(\d+)', text_content, re.IGNORECASE)
+    if of_pattern:
+        total_pages = int(of_pattern.group(1))
+        max_page = max(max_page, total_pages)
+        print(f"   Strategy 1 ('of X' pattern): Found {total_pages} pages")
+    
+    # Strategy 2: Look for page select dropdowns
+    select_elements = soup.find_all('select')
+    for select in select_elements:
+        options = select.find_all('option')
+        for option in options:
+            try:
+                page_num = int(option.get_text().strip())
+                max_page = max(max_page, page_num)
+            except:
+                pass
+    
+    if max_page > 1:
+        print(f"   Strategy 2 (select dropdown): Found {max_page} pages")
+    
+    # Strategy 3: Look for "Page X of Y" text
+    page_of_pattern = re.search(r'Page\s+\d+\s+of\s+(\d+)', text_content, re.IGNORECASE)
+    if page_of_pattern:
+        total_pages = int(page_of_pattern.group(1))
+        max_page = max(max_page, total_pages)
+        print(f"   Strategy 3 ('Page X of Y'): Found {total_pages} pages")
+    
+    # Strategy 4: Look for page links with ?page= parameter
+    all_links = soup.find_all('a', href=True)
+    for link in all_links:
+        href = link.get('href', '')
+        match = re.search(r'[?&]page=(\d+)', href)
+        if match:
+            page_num = int(match.group(1))
+            max_page = max(max_page, page_num)
+    
+    if max_page > 1:
+        print(f"   Strategy 4 (URL params): Found max page {max_page}")
+    
+    # Strategy 5: Look for pagination navigation elements
+    pagination = soup.find('nav', {'class': re.compile('pagination', re.IGNORECASE)})
+    if not pagination:
+        pagination = soup.find('div', {'class': re.compile('pagination', re.IGNORECASE)})
+    
+    if pagination:
+        page_links = pagination.find_all('a')
+        for link in page_links:
+            try:
+                page_num = int(link.get_text().strip())
+                max_page = max(max_page, page_num)
+            except:
+                pass
+        if max_page > 1:
+            print(f"   Strategy 5 (pagination nav): Found max page {max_page}")
+    
+    return max_page
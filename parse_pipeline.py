@@ -0,0 +1,153 @@
+"""
+Process-pool parsing stage for scraped pages
+Fetch threads hand raw page_source strings to parser processes, so lot extraction
+scales across cores instead of being serialised by the GIL, and move on to their next
+page while the parse runs; as_parsed() collects the pages as their parses finish
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lot_extractor import FIELD_ORDER, extract_lots
+
+
+def default_workers() -> int:
+    """Parser process count from PARSE_WORKERS, defaulting to the CPU count (max 4); 0 parses inline"""
+    return int(os.environ.get('PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def parse_page_records(page_source: str) -> Tuple[List[tuple], Dict]:
+    """
+    Worker entry point: extract lots as compact tuples in FIELD_ORDER, with the parse/extract timings
+
+    Tuples pickle much smaller than dicts with repeated keys on the way back to the parent.
+    """
+    timings = {}
+    lots = extract_lots(page_source, timings=timings)
+    return [tuple(lot[name] for name in FIELD_ORDER) for lot in lots], timings
+
+
+class ParsePipeline:
+    """Bounded hand-off from fetch threads to a pool of parser processes"""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Args:
+            workers: Number of parser processes (None uses default_workers(), 0 parses in the calling thread)
+            max_pending: Maximum pages queued or being parsed; submit() blocks beyond this
+        """
+        self.workers = default_workers() if workers is None else max(0, int(workers))
+        self.max_pending = max_pending or max(self.workers * 2, 1)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        atexit.register(self.shutdown)
+
+    def submit(self, page_source: str, page_num: Optional[int] = None, timings: Optional[Dict] = None) -> Future:
+        """
+        Queue a page for parsing, blocking while max_pending pages are already queued
+
+        Args:
+            page_source: Raw page HTML
+            page_num: Page number to record on each lot
+            timings: Optional dict that receives 'parse' and 'extract' seconds (see extract_lots) and
+                     'parse_queue', the time waiting for a parser process and moving data to and from
+                     it; filled in before the future resolves
+
+        Returns:
+            Future resolving to the list of lot dictionaries
+        """
+        if self.workers == 0:
+            result = Future()
+            try:
+                result.set_result(extract_lots(page_source, page_num, timings))
+            except Exception as e:
+                result.set_exception(e)
+            return result
+
+        submitted = time.perf_counter()
+        self._slots.acquire()
+        try:
+            raw = self._get_executor().submit(parse_page_records, page_source)
+        except BrokenProcessPool:
+            # A worker died earlier; start a fresh pool and try once more
+            self.shutdown()
+            try:
+                raw = self._get_executor().submit(parse_page_records, page_source)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        result = Future()
+
+        def unpack(done):
+            self._slots.release()
+            try:
+                records, worker_timings = done.result()
+                lots = [dict(zip(FIELD_ORDER, record)) for record in records]
+                if page_num is not None:
+                    for lot in lots:
+                        lot['page'] = page_num
+                if timings is not None:
+                    timings.update(worker_timings)
+                    timings['parse_queue'] = max(0.0, time.perf_counter() - submitted - sum(worker_timings.values()))
+                result.set_result(lots)
+            except Exception as e:
+                result.set_exception(e)
+
+        raw.add_done_callback(unpack)
+        return result
+
+    def shutdown(self):
+        """Stop the parser processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps forked copies of the Flask app and its threads out of the workers. Spawned workers
+                # re-import the main module (as __mp_main__), so it must not set anything up at import
+                # (see api.create_app)
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+
+def as_parsed(fetches: Dict[Future, Any]) -> Iterator[Tuple[Any, Future]]:
+    """
+    as_completed() for fetch tasks that hand their page to the parser instead of waiting for it
+
+    A fetch task returns a dict whose 'lots' is the Future from ParsePipeline.submit(), or anything else
+    when there is nothing to parse (a failed, skipped or cached page).
+
+    Args:
+        fetches: Fetch futures mapped to their page (or any key)
+
+    Yields:
+        (key, fetch future) once the fetch has finished and, if it queued a parse, that parse has finished too
+    """
+    fetching, parsing = dict(fetches), {}
+    while fetching or parsing:
+        done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future in parsing:
+                yield parsing.pop(future)
+                continue
+            key = fetching.pop(future)
+            fetched = None if future.exception() else future.result()
+            if isinstance(fetched, dict) and isinstance(fetched.get('lots'), Future):
+                parsing[fetched['lots']] = (key, future)
+            else:
+                yield key, future
@@ -0,0 +1,152 @@
+"""
+Render profiles for browser scrapes
+A profile lists what Chrome does not download while rendering a page (images, fonts, media, stylesheets
+and third-party trackers); only the lot-card DOM is needed, so the rest is bandwidth and CPU spent for
+nothing. Requests are blocked through CDP (Network.setBlockedURLs), so a pooled session can switch
+profile between pages, and Chrome's network log is read after each render for per-profile stats.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+# URL patterns per resource type ('*' matches any characters, query strings included)
+RESOURCE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'],
+    'font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m4a*', '*.ogg*', '*.m3u8*'],
+    'stylesheet': ['*.css*'],
+}
+
+# Analytics, marketing and icon-kit hosts seen on auction pages; none of them render lots
+THIRD_PARTY_DENYLIST = [
+    'googletagmanager.com', 'google-analytics.com', 'doubleclick.net', 'facebook.net', 'connect.facebook.net',
+    'hs-analytics.net', 'hs-banner.com', 'hscollectedforms.net', 'hs-scripts.com', 'hsforms.net',
+    'hubspot.com', 'kit.fontawesome.com', 'ka-f.fontawesome.com', 'fonts.googleapis.com', 'fonts.gstatic.com',
+    'hotjar.com', 'clarity.ms',
+]
+
+RENDER_PROFILES = {
+    'full': {'block': [], 'third_party': False},
+    'lean': {'block': ['image', 'font', 'media'], 'third_party': True},
+    'minimal': {'block': ['image', 'font', 'media', 'stylesheet'], 'third_party': True},
+}
+
+DEFAULT_RENDER_PROFILE = os.environ.get('RENDER_PROFILE', 'lean')
+
+
+def blocked_url_patterns(profile: str) -> List[str]:
+    """URL patterns a profile blocks"""
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{profile}'. Use one of: {', '.join(RENDER_PROFILES)}")
+    settings = RENDER_PROFILES[profile]
+    patterns = [pattern for category in settings['block'] for pattern in RESOURCE_PATTERNS[category]]
+    if settings['third_party']:
+        patterns += [f'*://*{domain}/*' for domain in THIRD_PARTY_DENYLIST]
+    return patterns
+
+
+def enable_network_log(chrome_options):
+    """Turn on Chrome's network performance log, which render stats are read from"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+
+def apply_profile(driver, profile: str):
+    """Set a session's blocked URLs, unless it already uses this profile"""
+    if getattr(driver, 'render_profile', None) == profile:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(profile)})
+    driver.render_profile = profile
+
+
+def read_network_log(driver) -> Optional[Dict]:
+    """
+    Requests made since the log was last read (reading clears it)
+
+    Returns:
+        {'requests', 'bytes', 'blocked', 'bytes_by_type', 'requests_by_type', 'blocked_by_type'}, or None
+        when the session was started without enable_network_log
+    """
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return None
+
+    types = {}
+    stats = {'requests': 0, 'bytes': 0, 'blocked': 0,
+             'bytes_by_type': Counter(), 'requests_by_type': Counter(), 'blocked_by_type': Counter()}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method, params = message.get('method'), message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            types[params.get('requestId')] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            resource_type = types.get(params.get('requestId'), 'Other')
+            stats['requests'] += 1
+            stats['bytes'] += int(params.get('encodedDataLength', 0))
+            stats['requests_by_type'][resource_type] += 1
+            stats['bytes_by_type'][resource_type] += int(params.get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed' and (params.get('blockedReason')
+                                                    or params.get('errorText') == 'net::ERR_BLOCKED_BY_CLIENT'):
+            stats['blocked'] += 1
+            stats['blocked_by_type'][params.get('type') or types.get(params.get('requestId'), 'Other')] += 1
+    return stats
+
+
+class RenderStats:
+    """Requests and bytes per render profile, with an estimate of what blocking saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict] = {}
+        # Downloaded bytes per resource type across all profiles, to price blocked requests
+        self._type_bytes = Counter()
+        self._type_requests = Counter()
+
+    def record(self, profile: str, network: Optional[Dict], latency: float):
+        """Add one rendered page"""
+        with self._lock:
+            totals = self._profiles.setdefault(profile, {
+                'pages': 0, 'logged_pages': 0, 'requests': 0, 'bytes': 0, 'blocked': 0,
+                'blocked_by_type': Counter(), 'latency': 0.0})
+            totals['pages'] += 1
+            totals['latency'] += latency
+            if network is None:
+                return
+            totals['logged_pages'] += 1
+            totals['requests'] += network['requests']
+            totals['bytes'] += network['bytes']
+            totals['blocked'] += network['blocked']
+            totals['blocked_by_type'].update(network['blocked_by_type'])
+            self._type_bytes.update(network['bytes_by_type'])
+            self._type_requests.update(network['requests_by_type'])
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Per-profile averages per page
+
+        kb_saved_per_page prices each blocked request at the average size of its resource type when it
+        was downloaded (by any profile, e.g. a 'full' render); types never downloaded count as nothing,
+        so it is a lower bound.
+        """
+        with self._lock:
+            result = {}
+            for profile, totals in self._profiles.items():
+                logged = totals['logged_pages']
+                saved = sum(count * self._type_bytes[resource_type] / self._type_requests[resource_type]
+                            for resource_type, count in totals['blocked_by_type'].items()
+                            if self._type_requests[resource_type])
+                result[profile] = {
+                    'pages': totals['pages'],
+                    'avg_ready_latency': round(totals['latency'] / totals['pages'], 3),
+                    'requests_per_page': round(totals['requests'] / logged, 1) if logged else None,
+                    'kb_per_page': round(totals['bytes'] / logged / 1024, 1) if logged else None,
+                    'blocked_per_page': round(totals['blocked'] / logged, 1) if logged else None,
+                    'blocked_by_type': dict(totals['blocked_by_type']),
+                    'kb_saved_per_page': round(saved / logged / 1024, 1) if logged else None,
+                }
+            return result
@@ -0,0 +1,179 @@
+"""
+Compact response encoding for the API
+JSON is serialised with orjson when installed, responses are gzip or brotli compressed when the
+client accepts it, and lots can be sent column by column instead of as repeated-key records
+"""
+
+import gzip
+import json
+import math
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+LOT_FORMATS = ('records', 'columnar')
+
+# Bodies smaller than this are sent uncompressed; the headers would cost more than they save
+MIN_COMPRESS_BYTES = 1024
+
+
+def _clean(value):
+    """Replace NaN/Infinity (invalid in JSON) with None, recursively"""
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    return value
+
+
+def dumps(payload) -> bytes:
+    """Serialise to compact JSON bytes"""
+    if orjson is not None:
+        # orjson writes NaN as null; OPT_NON_STR_KEYS stringifies int keys as the standard library does
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(payload, separators=(',', ':'), allow_nan=False)
+    except ValueError:
+        # Only payloads that actually hold NaN/Infinity pay for the cleaning pass
+        text = json.dumps(_clean(payload), separators=(',', ':'), allow_nan=False)
+    return text.encode('ascii')  # non-ASCII is escaped, which the C encoder does fastest
+
+
+def columnar_lots(lots: List[Dict]) -> Dict:
+    """
+    Lots as one array per field instead of one object per lot
+
+    Returns:
+        {'format': 'columnar', 'count': n, 'columns': {field: [value per lot]}}; lots missing a field get None
+    """
+    fields = list(dict.fromkeys(field for lot in lots for field in lot))
+    return {
+        'format': 'columnar',
+        'count': len(lots),
+        'columns': {field: [lot.get(field) for lot in lots] for field in fields},
+    }
+
+
+def shape_result(result, lot_format: str = 'records', include_html: bool = True):
+    """
+    Apply the requested lot format and drop raw HTML from a scrape result (the input is not modified)
+
+    Args:
+        result: Scrape result (lots may be at the top level or under structured_data)
+        lot_format: 'records' (list of objects) or 'columnar' (see columnar_lots)
+        include_html: Keep raw_html in the result and in each lot
+    """
+    if not isinstance(result, dict):
+        return result
+
+    def shape_lots(lots):
+        if not include_html:
+            lots = [{key: value for key, value in lot.items() if key != 'raw_html'} for lot in lots]
+        return columnar_lots(lots) if lot_format == 'columnar' else lots
+
+    shaped = {key: value for key, value in result.items() if include_html or key != 'raw_html'}
+    if isinstance(shaped.get('lots'), list):
+        shaped['lots'] = shape_lots(shaped['lots'])
+    if isinstance(shaped.get('structured_data'), dict) and isinstance(shaped['structured_data'].get('lots'), list):
+        shaped['structured_data'] = {**shaped['structured_data'],
+                                     'lots': shape_lots(shaped['structured_data']['lots'])}
+    return shaped
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported content coding the client accepts: 'br', 'gzip' or None"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    def allowed(coding):
+        return accepted.get(coding, accepted.get('*', 0)) > 0
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    if allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def json_response(payload, status: int = 200, accept_encoding: Optional[str] = None) -> Response:
+    """
+    JSON response, compressed when the client accepts it and the body is large enough
+
+    Args:
+        payload: Data to serialise
+        status: HTTP status code
+        accept_encoding: The request's Accept-Encoding header
+    """
+    body = dumps(payload)
+    encoding = choose_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_BYTES else None
+    response = Response(compress(body, encoding), status=status, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+class StreamCompressor:
+    """Compress a stream chunk by chunk, flushing after each so every chunk reaches the client immediately"""
+
+    def __init__(self, encoding: Optional[str]):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=5)
+        elif encoding == 'gzip':
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        else:
+            self._compressor = None
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        if self.encoding == 'gzip':
+            return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return chunk
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        if self.encoding == 'gzip':
+            return self._compressor.flush(zlib.Z_FINISH)
+        return b''
+
+    def wrap(self, chunks: Iterable) -> Iterator[bytes]:
+        """Compressed version of a generator of str or bytes chunks"""
+        for chunk in chunks:
+            yield self.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        yield self.finish()
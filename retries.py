@@ -0,0 +1,209 @@
+"""
+Retry policy for page scrapes
+A page that fails (a crashed Chrome session, a timeout, or a render that came back without the lot cards
+it should have) is tried again after an exponential backoff with jitter, on a fresh browser session when
+the driver failed, until the page runs out of attempts or its scrape runs out of retry budget
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from driver_pool import DriverPoolClosed
+
+
+class EmptyPageError(Exception):
+    """A page that should list lots came back without any lot-card elements"""
+
+
+def describe_error(error: Exception) -> str:
+    """One-line error text for events and failed_pages (Selenium messages end in a newline)"""
+    return ' '.join(str(error).split()) or type(error).__name__
+
+
+def is_driver_failure(error: Exception) -> bool:
+    """Whether an error points at the browser session itself, so the next attempt should not reuse it"""
+    return isinstance(error, WebDriverException)
+
+
+class RetryPolicy:
+    """How often and how soon a failed page is tried again"""
+
+    def __init__(self, retries: int = 2, base_delay: float = 1.0, max_delay: float = 15.0):
+        """
+        Args:
+            retries: Extra attempts per page after the first one
+            base_delay: Backoff before the first retry, in seconds; doubled for every further retry
+            max_delay: Upper bound on a single backoff
+        """
+        self.retries = max(0, int(retries))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+
+    @classmethod
+    def from_env(cls, retries: Optional[int] = None) -> 'RetryPolicy':
+        """Policy from PAGE_RETRIES, RETRY_BASE_DELAY and RETRY_MAX_DELAY (retries overrides PAGE_RETRIES)"""
+        return cls(retries=int(os.environ.get('PAGE_RETRIES', 2)) if retries is None else retries,
+                   base_delay=float(os.environ.get('RETRY_BASE_DELAY', 1.0)),
+                   max_delay=float(os.environ.get('RETRY_MAX_DELAY', 15.0)))
+
+    def delay(self, retry: int) -> float:
+        """
+        Backoff before the given retry (1 for the first): the exponential delay, capped, with a random
+        half taken off ("equal jitter") so pages that failed together do not all come back at once
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    @staticmethod
+    def retryable(error: Exception) -> bool:
+        """
+        Whether another attempt could fix the error: not for bad arguments, a pool that has been shut down,
+        or an HTTP client error such as 404 (other than 408 Request Timeout and 429 Too Many Requests)
+        """
+        if isinstance(error, (ValueError, TypeError, KeyError, DriverPoolClosed)):
+            return False
+        # requests' HTTPError carries the response, aiohttp's ClientResponseError the status
+        status = getattr(getattr(error, 'response', None), 'status_code', None) or getattr(error, 'status', None)
+        return not (isinstance(status, int) and 400 <= status < 500 and status not in (408, 429))
+
+
+class RetryBudget:
+    """Retries shared by all pages of one scrape, so a failing site cannot multiply the scrape's duration"""
+
+    def __init__(self, retries: int):
+        self.limit = max(0, int(retries))
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, retries: Optional[int] = None) -> 'RetryBudget':
+        """Budget from RETRY_BUDGET (default 20), unless retries is given"""
+        return cls(int(os.environ.get('RETRY_BUDGET', 20)) if retries is None else retries)
+
+    def take(self) -> bool:
+        """Spend one retry, or return False when the budget is used up"""
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'limit': self.limit, 'used': self.used}
+
+
+class ScrapeRetries:
+    """Retry policy, budget and outcome of the pages of one scrape"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, budget: Optional[RetryBudget] = None):
+        self.policy = policy or RetryPolicy.from_env()
+        self.budget = budget or RetryBudget.from_env()
+        self._lock = threading.Lock()
+        self._failed = {}
+        self._recovered = {}
+
+    @classmethod
+    def from_options(cls, page_retries: Optional[int] = None, retry_budget: Optional[int] = None) -> 'ScrapeRetries':
+        """Retries configured by a request's options, falling back to the environment"""
+        return cls(RetryPolicy.from_env(page_retries), RetryBudget.from_env(retry_budget))
+
+    def failed(self, page: int, error: Exception, attempts: int):
+        """Record a page that failed for good"""
+        with self._lock:
+            self._recovered.pop(page, None)
+            self._failed[page] = {'page': page, 'error': describe_error(error), 'attempts': attempts}
+
+    def recovered(self, page: int, attempts: int):
+        """Record a page that succeeded after retrying"""
+        with self._lock:
+            self._failed.pop(page, None)
+            self._recovered[page] = attempts
+
+    def failed_pages(self) -> list:
+        """Pages that failed for good as [{'page', 'error', 'attempts'}], by page number"""
+        with self._lock:
+            return [self._failed[page] for page in sorted(self._failed)]
+
+    def summary(self) -> dict:
+        """Retry statistics for the scrape result"""
+        with self._lock:
+            recovered = sorted(self._recovered)
+        budget = self.budget.stats()
+        return {'page_retries': self.policy.retries, 'budget': budget['limit'], 'used': budget['used'],
+                'recovered_pages': recovered}
+
+
+class PageFailed(Exception):
+    """A page that failed for good; error is the last attempt's error"""
+
+    def __init__(self, error: Exception, attempts: int):
+        super().__init__(str(error))
+        self.error = error
+        self.attempts = attempts
+
+
+def _should_retry(error: Exception, attempt: int, policy: RetryPolicy, budget: Optional[RetryBudget],
+                  should_retry: Optional[Callable[[Exception], bool]]) -> bool:
+    if attempt > policy.retries or not policy.retryable(error):
+        return False
+    if should_retry is not None and not should_retry(error):
+        return False
+    return budget is None or budget.take()
+
+
+def run_with_retries(task: Callable[[int, Optional[Exception]], object], policy: RetryPolicy,
+                     budget: Optional[RetryBudget] = None, on_retry: Optional[Callable] = None,
+                     should_retry: Optional[Callable[[Exception], bool]] = None):
+    """
+    Call task until it succeeds or retrying is no longer allowed
+
+    Args:
+        task: Called as task(attempt, previous_error), attempt counting from 1
+        policy: Attempts and backoff
+        budget: Retries left for the whole scrape (None for no limit)
+        on_retry: Called as on_retry(retry, error, delay) before sleeping for a retry
+        should_retry: Extra veto on retrying an error (e.g. while the server shuts down)
+
+    Returns:
+        The task's result
+
+    Raises:
+        PageFailed with the last error once no retry is left
+    """
+    attempt, previous = 1, None
+    while True:
+        try:
+            return task(attempt, previous)
+        except Exception as e:
+            if not _should_retry(e, attempt, policy, budget, should_retry):
+                raise PageFailed(e, attempt) from e
+            delay = policy.delay(attempt)
+            if on_retry:
+                on_retry(attempt, e, delay)
+            time.sleep(delay)
+            attempt, previous = attempt + 1, e
+
+
+async def run_with_retries_async(task: Callable[[int, Optional[Exception]], Awaitable], policy: RetryPolicy,
+                                 budget: Optional[RetryBudget] = None, on_retry: Optional[Callable] = None,
+                                 should_retry: Optional[Callable[[Exception], bool]] = None):
+    """run_with_retries for a coroutine function; the backoff does not block the event loop"""
+    attempt, previous = 1, None
+    while True:
+        try:
+            return await task(attempt, previous)
+        except Exception as e:
+            if not _should_retry(e, attempt, policy, budget, should_retry):
+                raise PageFailed(e, attempt) from e
+            delay = policy.delay(attempt)
+            if on_retry:
+                on_retry(attempt, e, delay)
+            await asyncio.sleep(delay)
+            attempt, previous = attempt + 1, e
@@ -9,22 +9,39 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import pandas as pd
 import json
 import time
-from typing import List, Dict
+import argparse
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import threading
+from driver_pool import DriverPool
+from driver_resolver import resolver as driver_resolver
+from governor import MemoryBudget
+from fetch_backends import FetchRouter, has_marker
+from lot_extractor import extract_lot_from_soup
+from pagination import count_total_pages
+from parse_pipeline import ParsePipeline, as_parsed
+from render_profiles import DEFAULT_RENDER_PROFILE, enable_network_log
+from incremental import ScrapeState, diff_lots, lot_key, page_fingerprint
+from lot_storage import normalize_lots, write_lot_dataset
+from lot_store import LotStore
+from metrics import ScrapeTimings
+from retries import (EmptyPageError, PageFailed, RetryBudget, RetryPolicy, ScrapeRetries, describe_error,
+                     is_driver_failure, run_with_retries)
 
 
 class AuctionScraper:
     """Scraper for Regal Auctions website"""
     
-    def __init__(self, base_url: str, auction_id: str, date: str, headless: bool = True):
+    def __init__(self, base_url: str, auction_id: str, date: str, headless: bool = True,
+                 pool_size: int = 3, max_pages_per_driver: int = 50,
+                 wait_strategy: str = 'lot_cards', wait_timeout: float = 15, fetch_backend: str = 'auto',
+                 parse_workers: Optional[int] = None, render_profile: str = DEFAULT_RENDER_PROFILE,
+                 page_retries: Optional[int] = None, retry_budget: Optional[int] = None):
         """
         Initialize the scraper
         
@@ -33,6 +50,15 @@ class AuctionScraper:
             auction_id: Auction ID
             date: Auction date (YYYY-MM-DD format)
             headless: Run browser in headless mode
+            pool_size: Maximum number of browser sessions kept alive for scraping (fewer when free memory runs short)
+            max_pages_per_driver: Recycle a browser session after this many pages
+            wait_strategy: Readiness policy used before reading each page (see wait_strategies)
+            wait_timeout: Maximum seconds to wait for a page to become ready
+            fetch_backend: 'browser', 'http' or 'auto' (plain HTTP when the lot cards are served without JS)
+            parse_workers: Parser processes for lot extraction (None uses PARSE_WORKERS/CPU count, 0 parses inline)
+            render_profile: What the browser skips downloading: 'full', 'lean' or 'minimal' (see render_profiles)
+            page_retries: Retries for a page that fails or renders without lot cards (None uses PAGE_RETRIES)
+            retry_budget: Retries shared by all pages of one run (None uses RETRY_BUDGET)
         """
         self.base_url = base_url
         self.auction_id = auction_id
@@ -40,6 +66,22 @@ class AuctionScraper:
         self.headless = headless
         self.driver = None
         self.lock = threading.Lock()  # Thread safety for shared resources
+        self.pool = DriverPool(self._create_driver, max_size=pool_size, max_uses=max_pages_per_driver,
+                               memory_budget=MemoryBudget())
+        self.wait_strategy = wait_strategy
+        self.wait_timeout = wait_timeout
+        self.fetch_backend = fetch_backend
+        self.fetcher = FetchRouter(self.pool, http_pool_size=pool_size, render_profile=render_profile)
+        self.parser = ParsePipeline(parse_workers)
+        self.page_readiness = {}  # page number -> readiness result of the last scrape
+        self.page_timings = ScrapeTimings()  # per-step timing spans of the last scrape's pages
+        self.retry_policy = RetryPolicy.from_env(page_retries)
+        self.retry_budget = retry_budget
+        self.retries = self._new_retries()  # retry budget and failed pages of the last scrape
+        self.end_page = None  # first page of the last scrape that came back empty past the last page
+        self.page_count = None  # pages counted from the pagination of the last scrape's first page with lots
+        self.previous_page_count = None  # last page that held lots in the previous run (incremental scrapes)
+        self._pages_counted = threading.Event()
         
     def setup_driver(self):
         """Setup Selenium WebDriver"""
@@ -51,81 +93,434 @@ class AuctionScraper:
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        enable_network_log(chrome_options)
+        driver_resolver.configure(chrome_options)
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.driver = webdriver.Chrome(service=driver_resolver.service(), options=chrome_options)
         print("Browser driver initialized")
         
     def close_driver(self):
-        """Close the WebDriver"""
+        """Close the WebDriver and any pooled sessions"""
         if self.driver:
             self.driver.quit()
             print("Browser closed")
+        self.pool.shutdown()
+        self.parser.shutdown()
         
     def get_page_url(self, page_num: int) -> str:
         """Generate URL for a specific page"""
         return f"{self.base_url}/auctions/{self.auction_id}/lots?date={self.date}&page={page_num}"
     
-    def scrape_page(self, page_num: int) -> List[Dict]:
+    def scrape_page(self, page_num: int, expect_lots: bool = True) -> List[Dict]:
         """
         Scrape data from a single page
         
         Args:
             page_num: Page number to scrape
+            expect_lots: The page must list lots, so a render without lot cards is always retried; otherwise an
+                         empty page past the last page of the pagination is taken as the end of the auction
+                         and later pages are skipped (see _check_page)
             
         Returns:
             List of lot dictionaries
         """
-        # Create a new driver for this thread
-        driver = self._create_driver()
+        try:
+            started = self._start_page(page_num, expect_lots)
+        except PageFailed as failure:
+            self._report_failure(page_num, failure.error, failure.attempts)
+            return []
+        return [] if started is None else self._finish_page(page_num, started)
+    
+    def _start_page(self, page_num: int, expect_lots: bool = True, validators: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Fetch a page with the run's retries and queue it for parsing, without waiting for the parse
         
+        Args:
+            page_num: Page number to scrape
+            expect_lots: The page must list lots (see scrape_page)
+            validators: HTTP validators from the previous run, for a conditional request
+            
+        Returns:
+            Dictionary with the fetched page, its lots (a parse Future, or None when the server answered
+            304 Not Modified), timings, attempts and start time, or None for a page after the end of the auction
+            
+        Raises:
+            PageFailed when the page failed after its retries
+        """
+        if self._past_end(page_num):
+            return None
         url = self.get_page_url(page_num)
         print(f"[Thread-{threading.current_thread().name}] Scraping page {page_num}: {url}")
+        start = time.perf_counter()
         
-        try:
-            driver.get(url)
-            
-            # Wait for page to load
-            time.sleep(5)  # Give JavaScript time to render
-            
-            # Get the rendered page source
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
+        def attempt_page(attempt, previous):
+            page = self._fetch_page(url, page_num, validators,
+                                    fresh_session=previous is not None and is_driver_failure(previous))
+            if page.get('not_modified'):
+                # Unchanged since the previous run, whose page count stands in for this one's
+                self._pages_counted.set()
+            else:
+                self._check_page(page, page_num, expect_lots)
+            return page, attempt
+        
+        page, attempts = self._with_retries(attempt_page, page_num)
+        timings = dict(page['timings'])
+        lots = None if page.get('not_modified') else self._submit_parse(page['html'], page_num, timings)
+        return {'page': page, 'lots': lots, 'timings': timings, 'attempts': attempts, 'start': start}
+    
+    def _finish_page(self, page_num: int, started: Dict) -> List[Dict]:
+        """
+        Collect the lots of a page queued by _start_page() once its parse has finished
+        
+        Args:
+            page_num: Page number
+            started: _start_page() result
             
-            # Save HTML for debugging (thread-safe)
-            with self.lock:
-                os.makedirs('debug', exist_ok=True)
-                with open(f'debug/page_{page_num}_rendered.html', 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                print(f"[Thread-{threading.current_thread().name}] Saved rendered HTML to debug/page_{page_num}_rendered.html")
+        Returns:
+            List of lot dictionaries ([] when the parse failed)
+        """
+        try:
+            lots = self._parsed_lots(started['lots'].result(), page_num)
+        except Exception as e:
+            self.retries.failed(page_num, e, started['attempts'])
+            self._report_failure(page_num, e, started['attempts'])
+            return []
+        self.page_timings.add_page(dict(started['timings'], total=time.perf_counter() - started['start']))
+        return lots
+    
+    def _report_failure(self, page_num: int, error: Exception, attempts: int):
+        """Print a page that failed for good (with the traceback, unless it was only empty)"""
+        print(f"[Thread-{threading.current_thread().name}] Error scraping page {page_num} "
+              f"after {attempts} attempt(s): {error}")
+        if not isinstance(error, EmptyPageError):
+            import traceback
+            traceback.print_exception(error)
+    
+    def _fetch_page(self, url: str, page_num: int, validators: Optional[Dict] = None,
+                    fresh_session: bool = False) -> Dict:
+        """
+        Fetch over plain HTTP when possible, otherwise render in a pooled browser
+        session and wait until the lot cards are present (bounded by wait_timeout)
+        
+        Args:
+            url: Page URL
+            page_num: Page number (for readiness bookkeeping)
+            validators: HTTP validators from the previous run, for a conditional request
+            fresh_session: Render in a newly started browser session (retry after a driver failure)
             
-            # Find all lot cards
-            lot_items = soup.find_all('div', class_='lot-card')
+        Returns:
+            Fetch result from FetchRouter.fetch
+        """
+        page = self.fetcher.fetch(url, self.fetch_backend, self.wait_strategy, self.wait_timeout,
+                                  ready_marker='lot-card', validators=validators, fresh_session=fresh_session)
+        readiness = dict(page['readiness'], backend=page['backend'])
+        
+        with self.lock:
+            self.page_readiness[page_num] = readiness
+        print(f"[Thread-{threading.current_thread().name}] Page {page_num} ready after {readiness['latency']:.2f}s via {page['backend']}")
+        return page
+    
+    def _submit_parse(self, page_source: str, page_num: int, timings: Optional[Dict] = None):
+        """
+        Save the page HTML for debugging and queue it for lot extraction in a parser process
+        
+        Args:
+            page_source: Page HTML
+            page_num: Page number
+            timings: Optional dict that receives the parsing spans (see ParsePipeline.submit)
             
-            if not lot_items:
-                print(f"[Thread-{threading.current_thread().name}] Warning: No lot items found on page {page_num}")
-                return []
+        Returns:
+            Future resolving to the extracted lots (see _parsed_lots)
+        """
+        # Save HTML for debugging (thread-safe)
+        with self.lock:
+            os.makedirs('debug', exist_ok=True)
+            with open(f'debug/page_{page_num}_rendered.html', 'w', encoding='utf-8') as f:
+                f.write(page_source)
+            print(f"[Thread-{threading.current_thread().name}] Saved rendered HTML to debug/page_{page_num}_rendered.html")
+        
+        # Extract lots with the shared lxml extractor in a parser process
+        return self.parser.submit(page_source, timings=timings)
+    
+    def _parsed_lots(self, extracted: List[Dict], page_num: int) -> List[Dict]:
+        """
+        Shape a page's extracted lots into output records
+        
+        Args:
+            extracted: Lots from lot_extractor
+            page_num: Page number
             
-            print(f"[Thread-{threading.current_thread().name}] Found {len(lot_items)} lot cards on page {page_num}")
+        Returns:
+            List of lot dictionaries
+        """
+        lots = [self._finalize_lot(lot, page_num) for lot in extracted]
+        
+        if not lots:
+            print(f"[Thread-{threading.current_thread().name}] Warning: No lot items found on page {page_num}")
+            return []
+        
+        print(f"[Thread-{threading.current_thread().name}] Extracted {len(lots)} valid lots from page {page_num}")
+        return lots
+    
+    def _new_retries(self) -> ScrapeRetries:
+        """Fresh retry budget and failed-page record for one run"""
+        return ScrapeRetries(self.retry_policy, RetryBudget.from_env(self.retry_budget))
+    
+    def _with_retries(self, attempt_page, page_num: int):
+        """
+        Run a page attempt with the run's retry policy and budget
+        
+        Args:
+            attempt_page: Called as attempt_page(attempt, previous_error)
+            page_num: Page number (for logging and the failed-page record)
             
-            # Extract data from each lot
-            lots = []
-            for item in lot_items:
-                lot_data = self.extract_lot_data(item, page_num)
-                if lot_data and (lot_data.get('lot_number') or lot_data.get('title')):
-                    lots.append(lot_data)
+        Returns:
+            attempt_page's result
             
-            print(f"[Thread-{threading.current_thread().name}] Extracted {len(lots)} valid lots from page {page_num}")
-            return lots
+        Raises:
+            PageFailed when the page failed after its retries (it is recorded in self.retries)
+        """
+        def on_retry(retry, error, delay):
+            print(f"🔁 [Thread-{threading.current_thread().name}] Page {page_num} attempt {retry} failed "
+                  f"({describe_error(error)}), retrying in {delay:.1f}s")
+        
+        attempts = []
+        
+        def tracked_attempt(attempt, previous):
+            attempts.append(attempt)
+            return attempt_page(attempt, previous)
+        
+        try:
+            result = run_with_retries(tracked_attempt, self.retries.policy, self.retries.budget, on_retry)
+        except PageFailed as failure:
+            self.retries.failed(page_num, failure.error, failure.attempts)
+            raise
+        if len(attempts) > 1:
+            self.retries.recovered(page_num, len(attempts))
+        return result
+    
+    def _check_page(self, page: Dict, page_num: int, expect_lots: bool):
+        """
+        Count the auction's pages from the first render with lot cards. A render without any, checked before
+        it is parsed, raises EmptyPageError (retried like any failure) unless it agrees with the pagination:
+        the page comes after the last page counted this run (or, when no page could be counted, the last page
+        of the previous run). Such a page is the end of the auction and later pages are skipped.
+        """
+        if has_marker(page['html'], 'lot-card'):
+            with self.lock:
+                if self.page_count is None:
+                    self.page_count = count_total_pages(page['html'])
+            self._pages_counted.set()
+            return
+        last_page = None if expect_lots else self._last_page()
+        if last_page is None or page_num <= last_page:
+            raise EmptyPageError(f'No lot-card elements on page {page_num}')
+        with self.lock:
+            if self.end_page is None or page_num < self.end_page:
+                self.end_page = page_num
+        print(f"[Thread-{threading.current_thread().name}] Page {page_num} is empty and past the last page "
+              f"({last_page}), treating it as the end of the auction")
+    
+    def _last_page(self) -> Optional[int]:
+        """
+        Last page of the auction as far as this run knows, waiting (up to wait_timeout) for another thread to
+        count the pages when none has yet; None when neither this run nor the previous one counted them
+        """
+        self._pages_counted.wait(self.wait_timeout)
+        with self.lock:
+            return self.page_count if self.page_count is not None else self.previous_page_count
+    
+    def _reset_run(self, previous_page_count: Optional[int] = None):
+        """Fresh timings, retries and pagination for a new run"""
+        self.page_timings = ScrapeTimings()
+        self.retries = self._new_retries()
+        self.end_page = None
+        self.page_count = None
+        self.previous_page_count = previous_page_count
+        self._pages_counted.clear()
+    
+    def _past_end(self, page_num: int) -> bool:
+        """Whether the page comes after an empty page of this scrape (nothing to fetch)"""
+        with self.lock:
+            return self.end_page is not None and page_num > self.end_page
+    
+    def scrape_page_incremental(self, page_num: int, state: ScrapeState, expect_lots: bool = True) -> Dict:
+        """
+        Scrape a page, reusing the previous run's lots when the page has not changed
+        
+        Args:
+            page_num: Page number to scrape
+            state: State saved by the previous run
+            expect_lots: The page must list lots (see scrape_page)
             
+        Returns:
+            Dictionary with lots, status ('new', 'changed', 'unchanged', 'not_modified', 'failed' or
+            'skipped' for pages after the end of the auction), fingerprint and HTTP validators. Failed and
+            skipped pages keep the previous run's lots, fingerprint and validators.
+        """
+        return self._finish_page_incremental(page_num, state, self._start_page_incremental(page_num, state,
+                                                                                           expect_lots))
+    
+    def _start_page_incremental(self, page_num: int, state: ScrapeState, expect_lots: bool = True) -> Dict:
+        """
+        _start_page() with the previous run's HTTP validators
+        
+        Returns:
+            The _start_page() result, or the page's final result (see scrape_page_incremental) when it was
+            skipped or failed
+        """
+        previous = state.page(page_num)
+        try:
+            started = self._start_page(page_num, expect_lots, (previous or {}).get('validators'))
+        except PageFailed as failure:
+            return self._failed_page_incremental(page_num, state, failure.error, failure.attempts)
+        if started is None:
+            # Not fetched: keep the previous lots so they do not show up as removed
+            return {'lots': state.page_lots(page_num), 'status': 'skipped',
+                    'fingerprint': (previous or {}).get('fingerprint'),
+                    'validators': (previous or {}).get('validators')}
+        return started
+    
+    def _finish_page_incremental(self, page_num: int, state: ScrapeState, started: Dict) -> Dict:
+        """
+        Compare a page queued by _start_page_incremental() with the previous run once it has been parsed
+        
+        Returns:
+            The page's result (see scrape_page_incremental)
+        """
+        if 'status' in started:
+            return started
+        previous = state.page(page_num)
+        page, timings = started['page'], started['timings']
+        
+        if page.get('not_modified'):
+            # The server confirmed the page is unchanged; nothing to parse
+            lots = state.page_lots(page_num)
+            print(f"[Thread-{threading.current_thread().name}] Page {page_num} not modified, reusing {len(lots)} lots")
+            self.page_timings.add_page(dict(timings, total=time.perf_counter() - started['start']))
+            return {'lots': lots, 'status': 'not_modified', 'fingerprint': previous['fingerprint'],
+                    'validators': page['validators']}
+        
+        try:
+            lots = self._parsed_lots(started['lots'].result(), page_num)
         except Exception as e:
-            print(f"[Thread-{threading.current_thread().name}] Error scraping page {page_num}: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-        finally:
-            # Close the driver for this thread
-            driver.quit()
+            self.retries.failed(page_num, e, started['attempts'])
+            return self._failed_page_incremental(page_num, state, e, started['attempts'])
+        
+        self.page_timings.add_page(dict(timings, total=time.perf_counter() - started['start']))
+        fingerprint = page_fingerprint(lots)
+        if previous is None:
+            status = 'new'
+        elif fingerprint == previous['fingerprint']:
+            status = 'unchanged'
+        else:
+            status = 'changed'
+        return {'lots': lots, 'status': status, 'fingerprint': fingerprint, 'validators': page.get('validators')}
+    
+    def _failed_page_incremental(self, page_num: int, state: ScrapeState, error: Exception, attempts: int) -> Dict:
+        """Result for a page that failed for good, keeping its previous lots so they do not show up as removed"""
+        previous = state.page(page_num) or {}
+        print(f"[Thread-{threading.current_thread().name}] Error scraping page {page_num} "
+              f"after {attempts} attempt(s): {error}")
+        return {'lots': state.page_lots(page_num), 'status': 'failed', 'fingerprint': previous.get('fingerprint'),
+                'validators': previous.get('validators')}
+    
+    def scrape_incremental(self, start_page: int = 1, end_page: int = 8, max_workers: int = 3,
+                           state_path: Optional[str] = None) -> tuple:
+        """
+        Re-scrape all pages, merge with the previous run and compute what changed
+        
+        Pages are fetched with conditional HTTP requests when the HTTP backend serves them, so
+        unchanged pages cost a 304 response; otherwise each page is compared by fingerprint.
+        
+        Args:
+            start_page: Starting page number
+            end_page: Ending page number
+            max_workers: Maximum number of concurrent threads
+            state_path: State file (default: data/state/<auction_id>_<date>.json)
+            
+        Returns:
+            (DataFrame with the merged dataset, delta dictionary)
+        """
+        state = ScrapeState(state_path or self.get_state_path())
+        previous_lots = dict(state.lots)
+        pages = list(range(start_page, end_page + 1))
+        
+        print(f"🔁 Incremental scrape of pages {start_page}-{end_page} with {max_workers} threads...")
+        if state.updated_at:
+            print(f"   Previous run: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state.updated_at))}, "
+                  f"{len(previous_lots)} lots")
+        print("=" * 70)
+        
+        self._reset_run(state.page_count())
+        start_time = time.time()
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Only the first page must have lots (see scrape_all_pages); parses are collected as they finish
+            # while the threads fetch the next pages
+            future_to_page = {executor.submit(self._start_page_incremental, page, state, page == start_page): page
+                              for page in pages}
+            for page, future in as_parsed(future_to_page):
+                results[page] = self._finish_page_incremental(page, state, future.result())
+        elapsed_time = time.time() - start_time
+        
+        all_lots = [lot for page in pages for lot in results[page]['lots']]
+        current_lots = {lot_key(lot): lot for lot in all_lots}
+        delta = diff_lots(previous_lots, current_lots)
+        delta['pages'] = {str(page): results[page]['status'] for page in pages}
+        delta['scraping_time'] = f"{elapsed_time:.2f}s"
+        delta['timings'] = self.page_timings.summary()
+        delta['failed_pages'] = self.retries.failed_pages()
+        delta['retries'] = self.retries.summary()
+        
+        state.save({page: {'fingerprint': results[page]['fingerprint'], 'validators': results[page]['validators']}
+                    for page in pages}, all_lots)
+        
+        statuses = list(delta['pages'].values())
+        print("=" * 70)
+        print(f"✅ Incremental scraping completed in {elapsed_time:.2f} seconds")
+        print(f"   Pages: " + ', '.join(f"{statuses.count(s)} {s}" for s in sorted(set(statuses))))
+        print(f"   Lots: {len(delta['added'])} added, {len(delta['removed'])} removed, {len(delta['changed'])} changed")
+        if delta['timings']['pages']:
+            print(f"⏱️  Average page: {self.page_timings.describe()}")
+        self.report_retries()
+        
+        df = pd.DataFrame(all_lots)
+        if not df.empty and 'page' in df.columns:
+            df = df.sort_values('page').reset_index(drop=True)
+        
+        return df, delta
+    
+    def report_retries(self):
+        """Print the last run's retries, the pages that failed after them and where the auction ended"""
+        if self.end_page is not None:
+            print(f"📄 Page {self.end_page} was empty past the last page; later pages were skipped")
+        stats = self.retries.summary()
+        if stats['used']:
+            print(f"🔁 Retries: {stats['used']} of {stats['budget']} used, "
+                  f"{len(stats['recovered_pages'])} page(s) recovered")
+        failed_pages = self.retries.failed_pages()
+        if failed_pages:
+            print(f"⚠️  {len(failed_pages)} page(s) failed: "
+                  + ', '.join(f"{failure['page']} ({failure['error']})" for failure in failed_pages))
+    
+    def get_state_path(self) -> str:
+        """State file used by incremental scrapes of this auction"""
+        return os.path.join('data', 'state', f"{self.auction_id}_{self.date}.json")
+    
+    def save_delta(self, delta: Dict, path: str = 'data/auction_delta.json'):
+        """
+        Save the change feed of an incremental scrape
+        
+        Args:
+            delta: Delta returned by scrape_incremental
+            path: Output JSON file
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dict(delta, auction_id=self.auction_id, date=self.date,
+                           generated_at=time.strftime('%Y-%m-%dT%H:%M:%S')), f, indent=2)
+        print(f"Delta saved to {path}")
     
     def _create_driver(self):
         """Create a new WebDriver instance for thread use"""
@@ -137,9 +532,11 @@ class AuctionScraper:
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        enable_network_log(chrome_options)
+        driver_resolver.configure(chrome_options)
         
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=chrome_options)
+        # Resolved once and shared by every pooled session
+        return webdriver.Chrome(service=driver_resolver.service(), options=chrome_options)
     
     def extract_lot_data(self, item, page_num: int) -> Dict:
         """
@@ -153,107 +550,49 @@ class AuctionScraper:
             Dictionary with lot data
         """
         try:
-            # Extract lot number from .lot-number
-            lot_number_elem = item.find('div', class_='lot-number')
-            lot_number = lot_number_elem.find('strong').get_text(strip=True) if lot_number_elem and lot_number_elem.find('strong') else ""
-            
-            # Extract title from .lot__name
-            title_elem = item.find('div', class_='lot__name')
-            title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            # Extract description from .lot__description
-            desc_elem = item.find('div', class_='lot__description')
-            description = desc_elem.get_text(strip=True) if desc_elem else ""
-            
-            # Extract image URL
-            img_elem = item.find('img')
-            image_url = img_elem.get('src', '') if img_elem else ""
-            
-            # Extract link URL (from image or description)
-            link_elem = desc_elem.find('a') if desc_elem else None
-            lot_url = link_elem.get('href', '') if link_elem else ""
-            
-            # Extract bidding information
-            bid_elem = item.find('div', class_='lot__bidding')
-            current_bid = ""
-            reserve_price = ""
-            starting_bid = ""
-            
-            if bid_elem:
-                # Try to find starting bid
-                bid_text = bid_elem.get_text()
-                if 'STARTING BID' in bid_text:
-                    starting_bid_match = bid_elem.find('span', class_='fs-4')
-                    if starting_bid_match:
-                        starting_bid = starting_bid_match.get_text(strip=True)
-                
-                # Check for reserve price in description
-                if desc_elem and 'RESERVE PRICE' in desc_elem.get_text():
-                    reserve_match = desc_elem.find('td')
-                    if reserve_match:
-                        # Find the next td after RESERVE PRICE
-                        reserve_td = reserve_match.find_next('td')
-                        if reserve_td:
-                            reserve_price = reserve_td.get_text(strip=True)
-            
-            # Extract additional data from table in description
-            odometer = ""
-            engine = ""
-            declarations = ""
-            options = ""
-            
-            if desc_elem:
-                table = desc_elem.find('table')
-                if table:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all('td')
-                        if len(cells) >= 2:
-                            key = cells[0].get_text(strip=True).upper()
-                            value = cells[1].get_text(strip=True)
-                            
-                            if 'ODOMETER' in key:
-                                odometer = value
-                            elif 'ENGINE' in key:
-                                engine = value
-                            elif 'DECLARATION' in key:
-                                declarations = value
-                            elif 'OPTIONS' in key:
-                                options = value
-                            elif 'RESERVE' in key:
-                                reserve_price = value
-            
-            lot_data = {
-                'page': page_num,
-                'lot_number': lot_number,
-                'title': title,
-                'description': description[:500] if description else "",  # Limit description length
-                'image_url': image_url,
-                'lot_url': lot_url,
-                'starting_bid': starting_bid,
-                'current_bid': current_bid,
-                'reserve_price': reserve_price,
-                'odometer': odometer,
-                'engine': engine,
-                'declarations': declarations,
-                'options': options,
-            }
-            
-            # Clean up URLs
-            if lot_data['lot_url'] and not lot_data['lot_url'].startswith('http'):
-                lot_data['lot_url'] = self.base_url + lot_data['lot_url']
-            
-            if lot_data['image_url'] and not lot_data['image_url'].startswith('http'):
-                lot_data['image_url'] = self.base_url + lot_data['image_url']
-            
-            return lot_data
-            
+            return self._finalize_lot(extract_lot_from_soup(item), page_num)
         except Exception as e:
             print(f"Error extracting lot data: {e}")
             import traceback
             traceback.print_exc()
             return {}
     
+    def _finalize_lot(self, lot: Dict, page_num: int) -> Dict:
+        """
+        Shape an extracted lot into the scraper's output record
+        
+        Args:
+            lot: Lot dictionary from lot_extractor
+            page_num: Current page number
+            
+        Returns:
+            Dictionary with lot data
+        """
+        lot_data = {
+            'page': page_num,
+            'lot_number': lot['lot_number'],
+            'title': lot['title'],
+            'description': lot['description'],
+            'image_url': lot['image_url'],
+            'lot_url': lot['lot_url'],
+            'starting_bid': lot['starting_bid'],
+            'current_bid': "",
+            'reserve_price': lot['reserve_price'],
+            'odometer': lot['odometer'],
+            'engine': lot['engine'],
+            'declarations': lot['declarations'],
+            'options': lot['options'],
+        }
+        
+        # Clean up URLs
+        if lot_data['lot_url'] and not lot_data['lot_url'].startswith('http'):
+            lot_data['lot_url'] = self.base_url + lot_data['lot_url']
+        
+        if lot_data['image_url'] and not lot_data['image_url'].startswith('http'):
+            lot_data['image_url'] = self.base_url + lot_data['image_url']
+        
+        return lot_data
+    
     def _safe_extract(self, element, attrs: List[str]) -> str:
         """Safely extract attribute value"""
         for attr in attrs:
@@ -301,28 +640,41 @@ class AuctionScraper:
         print(f"🚀 Starting parallel scraping with {max_workers} threads...")
         print("=" * 70)
         
+        self._reset_run()
         start_time = time.time()
         
         # Use ThreadPoolExecutor for parallel scraping
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all page scraping tasks
-            future_to_page = {executor.submit(self.scrape_page, page): page for page in pages}
+            # Submit all page scraping tasks. The first page must have lots; a later empty page is only the end
+            # of the auction when it comes after the last page of the pagination, otherwise it is retried.
+            # A thread moves on to its next page as soon as a page is queued for parsing.
+            future_to_page = {executor.submit(self._start_page, page, page == start_page): page for page in pages}
             
-            # Process completed tasks as they finish
-            for future in as_completed(future_to_page):
-                page = future_to_page[future]
+            # Process pages as their parses finish
+            for page, future in as_parsed(future_to_page):
                 try:
-                    lots = future.result()
-                    with self.lock:  # Thread-safe append
-                        all_lots.extend(lots)
+                    started = future.result()
+                except PageFailed as failure:
+                    self._report_failure(page, failure.error, failure.attempts)
+                    continue
                 except Exception as e:
                     print(f"❌ Exception occurred for page {page}: {e}")
+                    continue
+                if started is not None:
+                    all_lots.extend(self._finish_page(page, started))
         
         elapsed_time = time.time() - start_time
         
         print("=" * 70)
         print(f"✅ Parallel scraping completed in {elapsed_time:.2f} seconds")
         
+        latencies = [self.page_readiness[p]['latency'] for p in pages if p in self.page_readiness]
+        if latencies:
+            print(f"⏱️  Page readiness: avg {sum(latencies) / len(latencies):.2f}s, max {max(latencies):.2f}s")
+        if self.page_timings.summary()['pages']:
+            print(f"⏱️  Average page: {self.page_timings.describe()}")
+        self.report_retries()
+        
         df = pd.DataFrame(all_lots)
         
         # Sort by page number for consistent ordering
@@ -333,13 +685,17 @@ class AuctionScraper:
         
         return df
     
-    def save_data(self, df: pd.DataFrame, format: str = 'both'):
+    def save_data(self, df: pd.DataFrame, format: str = 'both', excel: bool = False, parquet: bool = True,
+                  store: bool = True):
         """
         Save scraped data to file
         
         Args:
             df: DataFrame with scraped data
             format: 'csv', 'json', or 'both'
+            excel: Also write data/auction_data.xlsx (slowest output, off by default)
+            parquet: Append this run to the typed Parquet dataset under data/lots
+            store: Upsert this run into the historical SQLite lot store (data/lots.db)
         """
         os.makedirs('data', exist_ok=True)
         
@@ -355,38 +711,79 @@ class AuctionScraper:
             df_clean.to_json(json_path, orient='records', indent=2)
             print(f"Data saved to {json_path}")
         
-        # Also save as Excel for easier viewing
-        excel_path = 'data/auction_data.xlsx'
-        df_clean = df.drop(columns=['raw_html'], errors='ignore')
-        df_clean.to_excel(excel_path, index=False)
-        print(f"Data saved to {excel_path}")
+        # Both typed outputs share one normalisation pass and one run ID
+        typed = normalize_lots(df) if parquet or store else None
+        run_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        
+        if parquet:
+            parquet_path = write_lot_dataset(typed, self.auction_id, self.date, run_id=run_id)
+            print(f"Data saved to {parquet_path}")
+        
+        if store:
+            lot_store = LotStore()
+            result = lot_store.upsert_lots(typed, self.auction_id, self.date, run_id=run_id)
+            lot_store.close()
+            print(f"Data saved to {lot_store.db_path} ({result['lots']} lots, {result['snapshots']} price changes)")
+        
+        # Excel is optional; openpyxl is by far the slowest writer
+        if excel:
+            excel_path = 'data/auction_data.xlsx'
+            df_clean = df.drop(columns=['raw_html'], errors='ignore')
+            df_clean.to_excel(excel_path, index=False)
+            print(f"Data saved to {excel_path}")
 
 
 def main():
     """Main function to run the scraper"""
+    parser = argparse.ArgumentParser(description='Scrape Regal Auctions lot data')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse unchanged pages from the previous run and write data/auction_delta.json')
+    parser.add_argument('--excel', action='store_true', help='Also write data/auction_data.xlsx')
+    parser.add_argument('--retries', type=int, default=None,
+                        help='Retries per failed or empty page (default: PAGE_RETRIES or 2)')
+    parser.add_argument('--retry-budget', type=int, default=None,
+                        help='Retries shared by all pages of the run (default: RETRY_BUDGET or 20)')
+    args = parser.parse_args()
     
     # Configuration
     BASE_URL = "https://bids.regalauctions.com"
     AUCTION_ID = "1778628"
     DATE = "2025-10-24"
-    MAX_THREADS = 10  # Maximum concurrent threads
+    MAX_THREADS = int(os.environ.get('MAX_SCRAPE_WORKERS', 10))  # Maximum concurrent threads
     
     # Create scraper instance
     print("Initializing auction scraper with multithreading support...")
+    scraper = AuctionScraper(BASE_URL, AUCTION_ID, DATE, headless=True, pool_size=MAX_THREADS,
+                             page_retries=args.retries, retry_budget=args.retry_budget)
+    
+    # Threads beyond the browser sessions that fit in memory would only wait for a session
+    MAX_THREADS = min(MAX_THREADS, scraper.pool.session_limit())
     print(f"Using up to {MAX_THREADS} parallel threads for faster scraping")
     print("=" * 70)
     
-    scraper = AuctionScraper(BASE_URL, AUCTION_ID, DATE, headless=True)
-    
     # Scrape all pages (1-8) with multithreading
     print("\nStarting parallel auction data scraping...")
     print("=" * 70)
     
-    df = scraper.scrape_all_pages(start_page=1, end_page=8, max_workers=MAX_THREADS)
+    delta = None
+    try:
+        if args.incremental:
+            df, delta = scraper.scrape_incremental(start_page=1, end_page=8, max_workers=MAX_THREADS)
+        else:
+            df = scraper.scrape_all_pages(start_page=1, end_page=8, max_workers=MAX_THREADS)
+    finally:
+        scraper.close_driver()
+    
+    failed_pages = scraper.retries.failed_pages()
+    if failed_pages:
+        print(f"⚠️  Missing pages {', '.join(str(failure['page']) for failure in failed_pages)}; "
+              f"re-run to fill them in")
     
     # Save the data
+    if delta is not None:
+        scraper.save_delta(delta)
     if not df.empty:
-        scraper.save_data(df, format='both')
+        scraper.save_data(df, format='both', excel=args.excel)
         print("\n" + "=" * 70)
         print("Scraping completed successfully!")
         print(f"Total items scraped: {len(df)}")
@@ -401,7 +798,7 @@ def main():
         print("Next steps:")
         print("1. Check the 'debug' folder for rendered HTML files")
         print("2. Run 'python analyze.py' to query the scraped data")
-        print("3. Open 'data/auction_data.xlsx' in Excel for easy viewing")
+        print("3. Load the typed dataset with lot_storage.read_lots() (data/lots), or re-run with --excel for a spreadsheet")
     else:
         print("\n" + "=" * 70)
         print("No data was scraped.")
@@ -0,0 +1,111 @@
+"""
+Tests for the lot-card marker check and the per-site backend choice of FetchRouter
+Run with: python -m pytest test_fetch_backends.py
+"""
+
+import pytest
+import requests
+
+from fetch_backends import FetchRouter, has_marker
+
+CARD = '<div class="lot-card"><strong>101</strong></div>'
+EMPTY = '<html><body><p>No lots</p></body></html>'
+
+
+@pytest.mark.parametrize('html', [
+    '<div class="lot-card">',
+    "<div class='lot-card'>",
+    '<div class="col lot-card featured">',
+    '<div class="\n  lot-card\n">',
+    '<div CLASS="lot-card">',
+    '<div class=lot-card>',
+])
+def test_has_marker_matches_whole_class_names(html):
+    assert has_marker(html, 'lot-card')
+
+
+@pytest.mark.parametrize('html', [
+    '<div class="lot-card-image"><div class="lot-card-header">',
+    "<div class='lot-card-body'>",
+    '<div class="my-lot-card">',
+    '<div data-class="lot-card">',
+    '<p>lot-card</p>',
+    '<div class=lot-card-image>',
+])
+def test_has_marker_ignores_sub_elements_and_text(html):
+    assert not has_marker(html, 'lot-card')
+
+
+class FakeBackend:
+    """Backend returning canned HTML (or raising) and counting its fetches"""
+
+    def __init__(self, name, html=None, error=None):
+        self.name = name
+        self.html = html
+        self.error = error
+        self.calls = 0
+
+    def fetch(self, url, *args):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {'html': self.html, 'backend': self.name, 'not_modified': False,
+                'readiness': {'strategy': self.name, 'ready': True, 'latency': 0.0}, 'timings': {}}
+
+
+def router_with(http, browser, **options):
+    router = FetchRouter(pool=None, **options)
+    router.backends = {'http': http, 'browser': browser}
+    return router
+
+
+def fetch(router, page):
+    return router.fetch(f'https://bids.example.com/lots?page={page}', 'auto', ready_marker='lot-card')
+
+
+def test_empty_pages_do_not_switch_the_site_to_the_browser():
+    """Pages without lot cards over HTTP or in the browser (past the last page) say nothing about the site"""
+    http, browser = FakeBackend('http', EMPTY), FakeBackend('browser', EMPTY)
+    router = router_with(http, browser)
+    for page in range(5, 9):
+        assert fetch(router, page)['backend'] == 'browser'
+    assert router.site_backends() == {}
+
+    http.html = CARD
+    assert fetch(router, 1)['backend'] == 'http'
+    assert router.site_backends() == {'bids.example.com': 'http'}
+
+
+def test_site_switches_to_the_browser_after_repeated_misses():
+    """Only misses in a row where the browser found the cards count"""
+    http, browser = FakeBackend('http', EMPTY), FakeBackend('browser', CARD)
+    router = router_with(http, browser, misses_before_browser=2)
+
+    fetch(router, 1)
+    assert router.site_backends() == {}
+    fetch(router, 2)
+    assert router.site_backends() == {'bids.example.com': 'browser'}
+
+    fetch(router, 3)
+    assert http.calls == 2  # no HTTP probe once the site is browser-only
+
+
+def test_http_hit_resets_the_miss_count():
+    http, browser = FakeBackend('http', EMPTY), FakeBackend('browser', CARD)
+    router = router_with(http, browser, misses_before_browser=2)
+
+    fetch(router, 1)
+    http.html = CARD
+    fetch(router, 2)
+    http.html = EMPTY
+    fetch(router, 3)
+    assert router.site_backends() == {'bids.example.com': 'http'}
+
+
+def test_http_errors_count_as_misses():
+    http = FakeBackend('http', error=requests.ConnectionError('refused'))
+    router = router_with(http, FakeBackend('browser', EMPTY), misses_before_browser=2)
+
+    fetch(router, 1)
+    fetch(router, 2)
+    assert router.site_backends() == {'bids.example.com': 'browser'}
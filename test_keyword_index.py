@@ -0,0 +1,88 @@
+"""
+Tests for the Aho-Corasick keyword matcher
+Run with: python -m pytest test_keyword_index.py
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import keyword_index
+from keyword_index import KeywordIndex
+
+KEYWORDS = ['rust', 'rust damage', 'damage', 'he', 'she', 'hers', 'sunroof', 'AWD']
+
+
+@pytest.fixture(params=['pyahocorasick', 'python'])
+def automaton(request, monkeypatch):
+    """Run each test with pyahocorasick (when installed) and with the pure Python automaton"""
+    if request.param == 'python':
+        monkeypatch.setattr(keyword_index, 'ahocorasick', None)
+    elif keyword_index.ahocorasick is None:
+        pytest.skip('pyahocorasick is not installed')
+    return request.param
+
+
+def naive_hits(keywords, text):
+    return frozenset(keyword.lower() for keyword in keywords if keyword.lower() in text.lower())
+
+
+def test_hits_match_substring_search(automaton):
+    index = KeywordIndex(KEYWORDS)
+    for text in ['Minor RUST DAMAGE on tailgate', 'ushers', 'Power sunroof, awd', 'clean', '']:
+        assert index.hits(text) == naive_hits(KEYWORDS, text)
+
+
+def test_overlapping_and_nested_keywords(automaton):
+    index = KeywordIndex(['he', 'she', 'hers', 'his'])
+    assert index.hits('ushers') == {'he', 'she', 'hers'}
+    assert index.hits('this') == {'his'}
+
+
+def test_random_texts_agree_with_substring_search(automaton):
+    rng = random.Random(7)
+    keywords = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(20)]
+    index = KeywordIndex(keywords)
+    for _ in range(200):
+        text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 30)))
+        assert index.hits(text) == naive_hits(keywords, text)
+
+
+def test_case_sensitive(automaton):
+    index = KeywordIndex(['AWD', 'awd'], case_sensitive=True)
+    assert index.keywords == ['AWD', 'awd']
+    assert index.hits('AWD wagon') == {'AWD'}
+
+
+def test_keywords_are_folded_and_deduplicated(automaton):
+    index = KeywordIndex(['Rust', 'rust', '', None, 'Sunroof'])
+    assert index.keywords == ['rust', 'sunroof']
+    assert index.positions == {'rust': 0, 'sunroof': 1}
+
+
+def test_missing_text_holds_no_keywords(automaton):
+    index = KeywordIndex(KEYWORDS)
+    assert index.hits(None) == frozenset()
+    assert index.hits(float('nan')) == frozenset()
+    assert index.hits_many(['rust', None]) == [frozenset({'rust'}), frozenset()]
+
+
+def test_no_keywords(automaton):
+    index = KeywordIndex([])
+    assert index.hits('anything') == frozenset()
+    assert index.match_matrix(['a', 'b']).shape == (2, 0)
+    assert not index.any_mask(['a']).any()
+
+
+def test_matrix_masks_and_any_mask(automaton):
+    index = KeywordIndex(['rust', 'sunroof'])
+    texts = ['rust', 'sunroof and rust', 'clean', None]
+    expected = np.array([[True, False], [True, True], [False, False], [False, False]])
+
+    assert (index.match_matrix(texts) == expected).all()
+    masks = index.masks(iter(texts))  # any iterable, scanned once
+    assert list(masks['rust']) == [True, True, False, False]
+    assert list(masks['sunroof']) == [False, True, False, False]
+    assert list(index.any_mask(texts)) == [True, True, False, False]
+    assert index.match_matrix([]).shape == (0, 2)
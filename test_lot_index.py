@@ -0,0 +1,97 @@
+"""
+Tests for the in-memory lot indexes
+Run with: python -m pytest test_lot_index.py
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lot_index import LotIndex, SortedIndex, TokenIndex
+from lot_storage import normalize_lots
+
+LOTS = pd.DataFrame([
+    {'lot_number': '101', 'title': '2018 FORD F-150 XLT', 'description': 'Rust damage; sunroof',
+     'starting_bid': '$10,000', 'current_bid': '$12,500', 'odometer': '120,000 KM', 'page': 1},
+    {'lot_number': '102', 'title': '2020 RAM 1500 Big Horn', 'description': None,
+     'starting_bid': '$25,500', 'current_bid': '', 'odometer': '40,000 MILES', 'page': 1},
+    {'lot_number': ' 103r ', 'title': '2015 Ford Focus', 'description': 'Front-end damage',
+     'starting_bid': 'TBD', 'current_bid': '$3,000', 'odometer': '', 'page': 2},
+    {'lot_number': '104', 'title': '2019 Fordson tractor', 'description': 'AWD, sunroof',
+     'starting_bid': '$8,000', 'current_bid': '$9,000', 'odometer': '2,000 km', 'page': '2'},
+])
+
+
+@pytest.fixture(params=['text', 'typed'])
+def index(request):
+    """Indexes over the scraped text columns, and over lot_storage's typed columns"""
+    return LotIndex(LOTS if request.param == 'text' else normalize_lots(LOTS))
+
+
+def lots(df):
+    return [str(value).strip().upper() for value in df['lot_number']]
+
+
+def test_search_is_a_case_insensitive_substring_match(index):
+    assert list(index.search('ford')) == [0, 2, 3]  # 'Fordson' contains 'ford'
+    assert list(index.search('FORD F-150')) == [0]
+    assert list(index.search('rd fo')) == [2]  # across a word boundary
+    assert list(index.search('damage', 'description')) == [0, 2]
+    assert list(index.search('front-end', 'description')) == [2]
+    assert list(index.search('-', 'title')) == [0]  # punctuation only: falls back to a scan
+    assert list(index.search('horn', 'lot_number')) == []  # column without a token index is scanned
+    with pytest.raises(KeyError):
+        index.search('x', 'colour')
+
+
+def test_search_agrees_with_a_scan():
+    rng = random.Random(3)
+    words = ['ford', 'f-150', 'rust', 'ram', 'awd', 'sun roof', 'x']
+    texts = pd.Series([' '.join(rng.choice(words) for _ in range(rng.randint(0, 5))) for _ in range(300)])
+    token_index = TokenIndex(texts)
+    for keyword in ['ford', 'or', 'f-1', 'rust ram', 'n r', 'awd x', ' ', 'zzz']:
+        expected = np.flatnonzero(texts.str.contains(keyword, regex=False).to_numpy())
+        assert list(token_index.search(keyword)) == list(expected), keyword
+
+
+def test_numeric_ranges(index):
+    assert list(index.range('starting_bid', 8000, 10000)) == [0, 3]
+    assert list(index.range('starting_bid', low=20000)) == [1]
+    assert list(index.range('current_bid', high=9000)) == [2, 3]  # blank bids never match
+    assert list(index.range('odometer_km', high=100000)) == [1, 3]  # 40,000 miles is ~64,374 km
+    with pytest.raises(KeyError):
+        index.range('colour', 1, 2)
+
+
+def test_sorted_index_skips_missing_values():
+    sorted_index = SortedIndex(pd.Series([5, None, 1, 'n/a', 3]))
+    assert list(sorted_index.range()) == [0, 2, 4]
+    assert list(sorted_index.range(2, 4)) == [4]
+    assert list(sorted_index.range(6)) == []
+
+
+def test_key_lookups(index):
+    assert list(index.lookup('lot_number', '103R')) == [2]
+    assert list(index.lookup('lot_number', ' 103r')) == [2]
+    assert list(index.lookup('page', '2')) == [2, 3]
+    assert list(index.lookup('page', 'two')) == []
+    assert list(index.lookup('lot_number', '999')) == []
+    with pytest.raises(KeyError):
+        index.lookup('title', 'x')
+
+
+def test_query_intersects_conditions(index):
+    assert lots(index.query(keywords={'title': 'ford'}, ranges={'starting_bid': (None, 9000)})) == ['104']
+    assert lots(index.query(keywords={'description': 'sunroof'}, keys={'page': 1})) == ['101']
+    assert lots(index.query(keywords={'title': 'ford'}, keys={'page': 2})) == ['103R', '104']
+    assert index.query(keywords={'title': 'ram'}, keys={'page': 2}).empty
+    assert index.query() is index.df
+
+
+def test_rows_keeps_the_original_order_and_index():
+    df = LOTS.set_index(pd.Index([10, 20, 30, 40]))
+    index = LotIndex(df)
+    assert list(index.query(keywords={'title': 'ford'}).index) == [10, 30, 40]
+    assert list(index.rows(np.array([1, 2])).index) == [20, 30]
@@ -0,0 +1,96 @@
+"""
+Tests for lot normalisation and the partitioned Parquet dataset
+Run with: python -m pytest test_lot_storage.py
+"""
+
+import pytest
+
+from lot_storage import (normalize_lots, parse_amount, parse_lot_number, parse_make, parse_odometer,
+                         parse_reserve_type, read_lots, write_lot_dataset)
+
+LOTS = [
+    {'lot_number': ' 299r ', 'title': '2018 FORD F-150 XLT', 'starting_bid': '$10,000', 'current_bid': '',
+     'reserve_price': '$15,500', 'odometer': '148,603 KM', 'page': '1', 'raw_html': '<div>...</div>'},
+    {'lot_number': 'TBD', 'title': 'Boat trailer', 'starting_bid': 'Make an offer', 'current_bid': '$1,250.50',
+     'reserve_price': 'Seller Approval', 'odometer': '52,000 MILES', 'page': 2},
+    {'lot_number': '300', 'title': '2020 ram 1500', 'starting_bid': None, 'current_bid': None,
+     'reserve_price': 'UNRESERVED', 'odometer': '', 'page': None},
+]
+
+
+@pytest.mark.parametrize('text, amount', [
+    ('$1,234', 1234.0), ('$1,250.50', 1250.5), ('CAD 900', 900.0), ('Make an offer', None), (None, None),
+])
+def test_parse_amount(text, amount):
+    assert parse_amount(text) == amount
+
+
+@pytest.mark.parametrize('text, reading', [
+    ('148,603 KM', (148603.0, 'km')),
+    ('52,000 MILES', (83685.9, 'miles')),
+    ('10 mi', (16.1, 'miles')),
+    ('unknown', (None, 'unknown')),
+    ('', (None, None)),
+    (None, (None, None)),
+])
+def test_parse_odometer(text, reading):
+    assert parse_odometer(text) == reading
+
+
+@pytest.mark.parametrize('text, reserve', [
+    ('$15,500', 'amount'), ('Seller Approval', 'seller_approval'), ('UNRESERVED', 'unreserved'), ('', None),
+])
+def test_parse_reserve_type(text, reserve):
+    assert parse_reserve_type(text) == reserve
+
+
+def test_parse_lot_number_and_make():
+    assert parse_lot_number(' 299r ') == ('299R', 299)
+    assert parse_lot_number('TBD') == ('TBD', None)
+    assert parse_make('2018 FORD F-150 XLT') == 'FORD'
+    assert parse_make('2020 ram 1500') == 'RAM'
+    assert parse_make('Boat trailer') is None
+
+
+def test_normalize_lots_adds_typed_columns():
+    df = normalize_lots(LOTS)
+
+    assert 'raw_html' not in df.columns
+    assert list(df['lot_number']) == ['299R', 'TBD', '300']
+    assert df['lot_seq'].tolist()[0] == 299 and df['lot_seq'].isna().tolist() == [False, True, False]
+    assert df['page'].tolist()[:2] == [1, 2] and df['page'].isna().tolist()[2]
+    assert df['make'].tolist()[0] == 'FORD' and df['make'].isna().tolist()[1]
+    assert df['starting_bid_amount'].tolist()[0] == 10000 and df['starting_bid_amount'].isna().tolist()[1:] == [True, True]
+    assert df['current_bid_amount'].tolist()[1] == 1250.5
+    assert list(df['reserve_type']) == ['amount', 'seller_approval', 'unreserved']
+    assert df['reserve_amount'].tolist()[0] == 15500 and df['reserve_amount'].isna().tolist()[1:] == [True, True]
+    assert df['odometer_km'].tolist()[:2] == [148603, 83685.9]
+    assert list(df['odometer_unit'].astype(object).where(df['odometer_unit'].notna(), None)) == ['km', 'miles', None]
+    # The original text is kept for display
+    assert df['starting_bid'].tolist()[0] == '$10,000'
+
+
+def test_dataset_keeps_the_latest_run_per_partition(tmp_path):
+    root = str(tmp_path / 'lots')
+    write_lot_dataset(LOTS, 'A1', '2024-01-01', root, run_id='20240101T000000')
+    write_lot_dataset(LOTS[:1], 'A1', '2024-01-01', root, run_id='20240102T000000')
+    write_lot_dataset(LOTS[1:], 'A2', '2024-02-01', root, run_id='20240101T000000')
+
+    latest = read_lots(root)
+    assert sorted(zip(latest['auction_id'], latest['lot_number'])) == [('A1', '299R'), ('A2', '300'), ('A2', 'TBD')]
+    assert len(read_lots(root, latest_run=False)) == 6
+
+    a1 = read_lots(root, columns=['lot_number', 'odometer_km', 'run_id'], auction_id='A1')
+    assert list(a1.columns) == ['lot_number', 'odometer_km', 'run_id']
+    assert a1.to_dict('records') == [{'lot_number': '299R', 'odometer_km': 148603.0, 'run_id': '20240102T000000'}]
+    assert read_lots(root, auction_id='A1', date='2024-02-01').empty
+
+
+def test_dataset_round_trips_missing_values(tmp_path):
+    root = str(tmp_path / 'lots')
+    write_lot_dataset(normalize_lots(LOTS), 'A1', '2024-01-01', root)
+    df = read_lots(root).sort_values('lot_number').reset_index(drop=True)
+    assert list(df['lot_number']) == ['299R', '300', 'TBD']
+    assert df['starting_bid_amount'].isna().tolist() == [False, True, True]
+    assert df['lot_seq'].isna().tolist() == [False, False, True]
+    assert df['auction_id'].astype(str).unique().tolist() == ['A1']
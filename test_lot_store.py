@@ -0,0 +1,118 @@
+"""
+Tests for the historical lot store: filters, run_id and price snapshots
+Run with: python -m pytest test_lot_store.py
+"""
+
+import threading
+
+import pytest
+
+from lot_store import LotStore
+
+LOTS = [
+    {'lot_number': '101', 'title': '2018 FORD F-150 XLT', 'starting_bid': '$10,000', 'odometer': '120,000 KM', 'page': 1},
+    {'lot_number': '102', 'title': '2020 RAM 1500', 'starting_bid': '$25,500', 'odometer': '40,000 MILES', 'page': 1},
+    {'lot_number': '103R', 'title': '2015 Toyota Corolla 50%_off', 'starting_bid': '$4,000', 'odometer': '', 'page': 2},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    lot_store = LotStore(str(tmp_path / 'lots.db'))
+    yield lot_store
+    lot_store.close()
+
+
+def lot_numbers(df):
+    return sorted(df['lot_number'])
+
+
+def test_filters_without_conditions(store):
+    assert store._filters() == ('', [])
+
+
+def test_filters_build_the_where_clause(store):
+    where, params = store._filters(auction_id='A1', date='2024-01-01', makes=['ford', 'Ram'], min_price=5000,
+                                   max_odometer_km=100000)
+    assert where.startswith(' WHERE ')
+    assert 'make IN (?, ?)' in where
+    assert params == ['A1', '2024-01-01', 5000, 100000, 'FORD', 'RAM']
+
+
+def test_filters_match_substrings_literally(store):
+    where, params = store._filters(title='50%_')
+    assert "title LIKE ? ESCAPE '\\'" in where
+    assert params == ['%50\\%\\_%']
+
+
+def test_query_filters(store):
+    store.upsert_lots(LOTS, 'A1', '2024-01-01')
+
+    assert lot_numbers(store.query(makes=['ford', 'toyota'])) == ['101', '103R']
+    assert lot_numbers(store.query(min_price=5000, max_price=20000)) == ['101']
+    assert lot_numbers(store.query(max_odometer_km=70000)) == ['102']  # 40,000 miles
+    assert lot_numbers(store.query(title='corolla')) == ['103R']
+    assert lot_numbers(store.query(title='50%_off')) == ['103R']
+    assert store.query(title='50x_off').empty  # % and _ are not wildcards
+    assert lot_numbers(store.query(lot_number='3r')) == ['103R']
+    assert store.count(auction_id='A1') == 3 and store.count(auction_id='A2') == 0
+
+
+def test_query_sort_and_pages(store):
+    store.upsert_lots(LOTS, 'A1', '2024-01-01')
+
+    assert list(store.query(sort='starting_bid', descending=True)['lot_number']) == ['102', '101', '103R']
+    # Missing odometer readings sort last either way
+    assert list(store.query(sort='odometer')['lot_number']) == ['102', '101', '103R']  # 40,000 miles first
+    assert list(store.query(sort='odometer', descending=True)['lot_number']) == ['101', '102', '103R']
+    assert list(store.query(limit=2, offset=1)['lot_number']) == ['102', '103R']
+    with pytest.raises(ValueError):
+        store.query(sort='colour')
+
+
+def test_run_id_selects_the_lots_a_run_saw(store):
+    first = store.upsert_lots(LOTS, 'A1', '2024-01-01', run_id='run-1')
+    second = store.upsert_lots(LOTS[:2], 'A1', '2024-01-01', run_id='run-2')  # lot 103R was withdrawn
+
+    assert (first['lots'], second['lots']) == (3, 2)
+    assert lot_numbers(store.query(run_id='run-1')) == ['101', '102', '103R']
+    assert lot_numbers(store.query(run_id='run-2')) == ['101', '102']
+    assert store.count(run_id='run-2') == 2
+    assert store.count(auction_id='A1') == 3  # without run_id, everything stored
+    assert store.query(run_id='unknown').empty
+
+
+def test_run_id_selects_lots_but_rows_hold_the_latest_values(store):
+    """Only the set of lots is per run (see the README): a later run's values show through an earlier run_id"""
+    store.upsert_lots(LOTS[:1], 'A1', '2024-01-01', run_id='run-1')
+    store.upsert_lots([dict(LOTS[0], starting_bid='$12,000')], 'A1', '2024-01-01', run_id='run-2')
+
+    row = store.query(run_id='run-1').iloc[0]
+    assert row['starting_bid_amount'] == 12000 and row['run_id'] == 'run-2'
+
+
+def test_concurrent_runs_keep_their_own_lot_sets(store):
+    def upsert(lots, run_id):
+        store.upsert_lots(lots, 'A1', '2024-01-01', run_id=run_id)
+
+    threads = [threading.Thread(target=upsert, args=(LOTS[:2], 'run-a')),
+               threading.Thread(target=upsert, args=(LOTS[1:], 'run-b'))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert lot_numbers(store.query(run_id='run-a')) == ['101', '102']
+    assert lot_numbers(store.query(run_id='run-b')) == ['102', '103R']
+
+
+def test_snapshots_record_new_lots_and_price_changes(store):
+    assert store.upsert_lots(LOTS, 'A1', '2024-01-01', run_id='run-1')['snapshots'] == 3
+    assert store.upsert_lots(LOTS, 'A1', '2024-01-01', run_id='run-2')['snapshots'] == 0
+    changed = [dict(LOTS[0], starting_bid='$11,000'), *LOTS[1:]]
+    assert store.upsert_lots(changed, 'A1', '2024-01-01', run_id='run-3')['snapshots'] == 1
+
+    history = store.price_history('A1', '2024-01-01', ' 101 ')
+    assert list(history['run_id']) == ['run-1', 'run-3']
+    assert list(history['starting_bid_amount']) == [10000, 11000]
+    assert list(store.runs()['run_id']) == ['run-3', 'run-2', 'run-1']
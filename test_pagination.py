@@ -0,0 +1,123 @@
+"""
+Tests for early pagination hints and the page dispatch of multi-page API scrapes
+Run with: python -m pytest test_pagination.py
+"""
+
+import queue
+import threading
+
+import pytest
+
+import api
+from page_cache import PageCache
+from pagination import pagination_hint
+from parse_pipeline import ParsePipeline
+
+CARD = ('<div class="lot-card"><div class="lot-number"><strong>{n}</strong></div>'
+        '<div class="lot__name">Car {n}</div></div>')
+
+
+def listing(page_num, pagination='', lots=2):
+    cards = ''.join(CARD.format(n=page_num * 100 + n) for n in range(lots))
+    return f'<html><body>{cards}{pagination}</body></html>'
+
+
+@pytest.mark.parametrize('html, hint', [
+    ('<div class="pager">Page <b>1</b> of <b>12</b></div>', 12),
+    ('<a href="/lots?date=2024-01-01&amp;page=2">2</a><a href="/lots?date=2024-01-01&amp;page=7">7</a>', 7),
+    ('<a href="?page=3">Next</a> Showing page 1 of 2', 3),
+    ('<p>No lots found</p>', None),
+    ('<p>Page 1 of 1</p>', None),
+])
+def test_pagination_hint(html, hint):
+    assert pagination_hint(html) == hint
+
+
+class FakeFetcher:
+    """
+    Serves pages 1..pages with two lot cards each (one on the last page, so it is not probed past) and
+    empty pages after them. Page 1's early source hints at `pages` pages; page 1 is only ready once every
+    hinted page has been requested, so a scrape that waits for discovery before dispatching them would stall.
+    """
+
+    def __init__(self, pages=3, hint=True):
+        self.pages = pages
+        self.hint = hint
+        self.requested = set()
+        self.dispatched_early = threading.Event()
+        self.page_one_waited = None  # whether the hinted pages were requested while page 1 was loading
+        self._lock = threading.Lock()
+
+    def fetch(self, url, backend='auto', wait_strategy='auto', wait_time=15, ready_marker=None,
+              render_profile=None, fresh_session=False, on_source=None, validators=None):
+        page_num = int(url.rsplit('page=', 1)[1])
+        pagination = f'<p>Page {page_num} of {self.pages}</p>' if self.hint else ''
+        if page_num == 1:
+            if on_source:
+                on_source(f'<html><body>{pagination}</body></html>')
+            self.page_one_waited = self.dispatched_early.wait(timeout=5)
+        else:
+            with self._lock:
+                self.requested.add(page_num)
+                if self.requested >= set(range(2, self.pages + 1)):
+                    self.dispatched_early.set()
+        lots = 2 if page_num < self.pages else 1 if page_num == self.pages else 0
+        return {'html': listing(page_num, pagination, lots), 'backend': 'browser', 'render': {'profile': 'full'},
+                'readiness': {'strategy': 'fixed', 'ready': True, 'latency': 0.0}, 'timings': {}}
+
+
+class FakeRouter:
+    """Stands in for FetchRouter under the async engine, rendering every page through FakeFetcher"""
+
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+        browser = lambda *args: fetcher.fetch(args[0], 'browser', *args[1:3], render_profile=args[3],
+                                              fresh_session=args[4], on_source=args[5])
+        browser.pool = type('Pool', (), {'max_size': 4})()
+        browser.fetch = browser
+        self.backends = {'browser': browser}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """The parts of the API a scrape uses, without browsers"""
+    monkeypatch.setattr(api, 'parser_pipeline', ParsePipeline(0))
+    monkeypatch.setattr(api, 'page_cache', PageCache(str(tmp_path / 'page_cache')))
+    return monkeypatch
+
+
+def scrape(engine, progress=None):
+    return api.scrape_all_auction_pages('https://bids.example.com/auctions/1/lots', wait_time=1, max_workers=2,
+                                        progress_queue=progress, wait_strategy='fixed', fetch_backend='browser',
+                                        engine=engine, cache_mode='bypass', page_retries=0)
+
+
+@pytest.mark.parametrize('engine', ['threads', 'async'])
+def test_hinted_pages_are_dispatched_before_page_one_is_ready(server, engine):
+    fetcher = FakeFetcher(pages=3)
+    server.setattr(api, 'fetcher', FakeRouter(fetcher) if engine == 'async' else fetcher)
+    progress = queue.Queue()
+    result = scrape(engine, progress)
+
+    assert fetcher.page_one_waited
+    assert result['total_pages'] == 3 and result['total_lots'] == 5
+    assert result['failed_pages'] == [] and result['probe_capped'] is False
+    events = [progress.get() for _ in range(progress.qsize())]
+    types = [event['type'] for event in events]
+    assert types.index('pagination_hint') < types.index('discovery_complete')
+    assert sorted(event['page'] for event in events if event['type'] == 'page_complete') == [1, 2, 3]
+
+
+@pytest.mark.parametrize('engine', ['threads', 'async'])
+def test_probing_reports_the_page_cap(server, engine):
+    fetcher = FakeFetcher(pages=100, hint=False)
+    fetcher.dispatched_early.set()
+    server.setattr(api, 'fetcher', FakeRouter(fetcher) if engine == 'async' else fetcher)
+    server.setattr(api, 'MAX_PROBE_PAGES', 4)
+    progress = queue.Queue()
+    result = scrape(engine, progress)
+
+    assert result['total_pages'] == 4 and result['probe_capped'] is True
+    events = [progress.get() for _ in range(progress.qsize())]
+    capped = [event for event in events if event['type'] == 'probe_capped']
+    assert capped and capped[0]['max_probe_pages'] == 4
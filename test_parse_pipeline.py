@@ -0,0 +1,102 @@
+"""
+Tests for the parser process pool and the fetch/parse hand-off
+Run with: python -m pytest test_parse_pipeline.py
+"""
+
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from jobs import JobStore
+from parse_pipeline import ParsePipeline, as_parsed
+
+API_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api.py')
+
+CARD = ('<div class="lot-card"><div class="lot-number"><strong>{n}</strong></div>'
+        '<div class="lot__name">Car {n}</div></div>')
+
+
+@pytest.fixture
+def server_env(tmp_path, monkeypatch):
+    """Point the API's stores at tmp_path, as a server started with `python api.py` there would use"""
+    monkeypatch.setenv('JOBS_DB', str(tmp_path / 'jobs.db'))
+    monkeypatch.setenv('LOTS_DB', str(tmp_path / 'lots.db'))
+    monkeypatch.setenv('PAGE_CACHE_DIR', str(tmp_path / 'page_cache'))
+    monkeypatch.delenv('JOBS_RECOVERED', raising=False)
+    return tmp_path
+
+
+def test_parser_processes_leave_running_jobs_alone(server_env, monkeypatch):
+    """Starting the pool while a job runs under `python api.py` must not mark the job interrupted"""
+    store = JobStore(os.environ['JOBS_DB'])
+    job_id = store.create({'url': 'https://example.com'})
+    store.update(job_id, status='running')
+
+    # Spawned parser processes re-import the main module as __mp_main__; make that api.py
+    main = sys.modules['__main__']
+    monkeypatch.setattr(main, '__spec__', None)
+    monkeypatch.setattr(main, '__file__', API_PATH)
+
+    pipeline = ParsePipeline(workers=2)
+    try:
+        page = '<html><body>' + ''.join(CARD.format(n=n) for n in (101, 102)) + '</body></html>'
+        lots = pipeline.submit(page, page_num=3).result(timeout=120)
+    finally:
+        pipeline.shutdown()
+
+    assert [(lot['lot_number'], lot['page']) for lot in lots] == [('101', 3), ('102', 3)]
+    assert store.get(job_id)['status'] == 'running'
+    # Nor did the parser processes open stores of their own
+    assert not (server_env / 'lots.db').exists()
+    assert not (server_env / 'page_cache').exists()
+
+
+def test_importing_api_sets_nothing_up(server_env):
+    """Resources are built by create_app(), not at import"""
+    import api
+
+    assert api.driver_pool is None and api.parser_pipeline is None and api.job_manager is None
+    assert not (server_env / 'jobs.db').exists()
+
+
+def test_as_parsed_frees_fetch_threads_before_parses_finish():
+    """Fetch tasks return as soon as their page is queued; pages come back in the order their parses finish"""
+    slow, fast = Future(), Future()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fetches = {executor.submit(lambda parse=parse: {'lots': parse}): page for page, parse in ((1, slow), (2, fast))}
+        for future in fetches:
+            future.result(timeout=5)  # both fetch threads are done while neither page is parsed
+
+        pages = as_parsed(fetches)
+        fast.set_result(['b'])
+        page, future = next(pages)
+        assert page == 2 and future.result()['lots'].result() == ['b']
+        slow.set_result(['a'])
+        page, future = next(pages)
+        assert page == 1 and future.result()['lots'].result() == ['a']
+        assert next(pages, None) is None
+
+
+def test_as_parsed_yields_failed_and_unparsed_fetches_at_once():
+    """A fetch that raised or returned nothing to parse is yielded without waiting for other parses"""
+    pending = Future()
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        fetches = {executor.submit(fail): 1, executor.submit(lambda: None): 2,
+                   executor.submit(lambda: {'lots': pending}): 3}
+        done = {}
+        pages = as_parsed(fetches)
+        for _ in range(2):
+            page, future = next(pages)
+            done[page] = future
+        assert set(done) == {1, 2}
+        with pytest.raises(RuntimeError):
+            done[1].result()
+        assert done[2].result() is None
+        pending.set_result([])
+        assert next(pages)[0] == 3
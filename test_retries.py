@@ -0,0 +1,163 @@
+"""
+Tests for the page retry policy, the per-scrape retry budget and run_with_retries
+Run with: python -m pytest test_retries.py
+"""
+
+import asyncio
+
+import pytest
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from driver_pool import DriverPoolClosed
+from retries import (EmptyPageError, PageFailed, RetryBudget, RetryPolicy, ScrapeRetries, describe_error,
+                     is_driver_failure, run_with_retries, run_with_retries_async)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Record backoffs instead of sleeping through them"""
+    slept = []
+    monkeypatch.setattr('retries.time.sleep', slept.append)
+    return slept
+
+
+def test_delay_doubles_with_equal_jitter():
+    policy = RetryPolicy(retries=5, base_delay=1.0, max_delay=100.0)
+    for retry, ceiling in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 8.0)):
+        for _ in range(50):
+            assert ceiling / 2 <= policy.delay(retry) <= ceiling
+
+
+def test_delay_is_capped_by_max_delay():
+    policy = RetryPolicy(retries=10, base_delay=1.0, max_delay=3.0)
+    assert all(1.5 <= policy.delay(10) <= 3.0 for _ in range(50))
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv('PAGE_RETRIES', '4')
+    monkeypatch.setenv('RETRY_BASE_DELAY', '0.5')
+    monkeypatch.setenv('RETRY_MAX_DELAY', '2')
+    policy = RetryPolicy.from_env()
+    assert (policy.retries, policy.base_delay, policy.max_delay) == (4, 0.5, 2.0)
+    assert RetryPolicy.from_env(1).retries == 1
+
+
+@pytest.mark.parametrize('error, retryable', [
+    (WebDriverException('tab crashed'), True),
+    (EmptyPageError('no lot cards'), True),
+    (TimeoutError('timed out'), True),
+    (ValueError('bad url'), False),
+    (DriverPoolClosed('closed'), False),
+])
+def test_retryable(error, retryable):
+    assert RetryPolicy.retryable(error) is retryable
+
+
+@pytest.mark.parametrize('status, retryable', [(404, False), (403, False), (408, True), (429, True), (503, True)])
+def test_retryable_http_errors(status, retryable):
+    response = requests.Response()
+    response.status_code = status
+    assert RetryPolicy.retryable(requests.HTTPError(response=response)) is retryable
+
+
+def test_budget_is_shared_and_runs_out():
+    budget = RetryBudget(2)
+    assert budget.take() and budget.take()
+    assert not budget.take()
+    assert budget.stats() == {'limit': 2, 'used': 2}
+
+
+def test_budget_from_env(monkeypatch):
+    monkeypatch.setenv('RETRY_BUDGET', '7')
+    assert RetryBudget.from_env().limit == 7
+    assert RetryBudget.from_env(3).limit == 3
+
+
+def flaky(failures, error=EmptyPageError('no lot cards')):
+    """Task failing `failures` times before returning its attempt number; records what it was called with"""
+    calls = []
+
+    def task(attempt, previous):
+        calls.append((attempt, previous))
+        if attempt <= failures:
+            raise error
+        return attempt
+
+    task.calls = calls
+    return task
+
+
+def test_run_with_retries_recovers(no_sleep):
+    task = flaky(2)
+    retried = []
+    policy = RetryPolicy(retries=2, base_delay=1.0, max_delay=10.0)
+    assert run_with_retries(task, policy, on_retry=lambda *args: retried.append(args)) == 3
+    assert [attempt for attempt, _ in task.calls] == [1, 2, 3]
+    assert task.calls[0][1] is None and isinstance(task.calls[1][1], EmptyPageError)
+    assert [retry for retry, _, _ in retried] == [1, 2]
+    assert no_sleep == [delay for _, _, delay in retried]
+
+
+def test_run_with_retries_gives_up_after_the_policy():
+    task = flaky(5)
+    with pytest.raises(PageFailed) as failed:
+        run_with_retries(task, RetryPolicy(retries=2, base_delay=0))
+    assert failed.value.attempts == 3
+    assert isinstance(failed.value.error, EmptyPageError)
+
+
+def test_run_with_retries_stops_when_the_budget_is_spent():
+    budget = RetryBudget(1)
+    policy = RetryPolicy(retries=3, base_delay=0)
+    assert run_with_retries(flaky(1), policy, budget) == 2
+    with pytest.raises(PageFailed) as failed:
+        run_with_retries(flaky(1), policy, budget)
+    assert failed.value.attempts == 1
+    assert budget.stats() == {'limit': 1, 'used': 1}
+
+
+def test_run_with_retries_does_not_retry_permanent_errors():
+    task = flaky(1, ValueError('bad url'))
+    budget = RetryBudget(5)
+    with pytest.raises(PageFailed):
+        run_with_retries(task, RetryPolicy(retries=3, base_delay=0), budget)
+    assert len(task.calls) == 1 and budget.stats()['used'] == 0
+
+
+def test_run_with_retries_honours_should_retry():
+    task = flaky(1)
+    with pytest.raises(PageFailed):
+        run_with_retries(task, RetryPolicy(retries=3, base_delay=0), should_retry=lambda error: False)
+    assert len(task.calls) == 1
+
+
+def test_run_with_retries_async(monkeypatch):
+    async def no_wait(delay):
+        pass
+
+    monkeypatch.setattr('retries.asyncio.sleep', no_wait)
+    sync_task = flaky(1)
+
+    async def task(attempt, previous):
+        return sync_task(attempt, previous)
+
+    assert asyncio.run(run_with_retries_async(task, RetryPolicy(retries=1), RetryBudget(1))) == 2
+
+
+def test_scrape_retries_records_outcomes():
+    retries = ScrapeRetries(RetryPolicy(retries=2), RetryBudget(10))
+    retries.failed(3, WebDriverException('chrome not reachable\n'), 3)
+    retries.recovered(2, 2)
+    retries.failed(1, EmptyPageError('no lot cards'), 1)
+    retries.recovered(1, 2)  # a later attempt recovered the page
+
+    assert retries.failed_pages() == [{'page': 3, 'error': 'Message: chrome not reachable', 'attempts': 3}]
+    assert retries.summary() == {'page_retries': 2, 'budget': 10, 'used': 0, 'recovered_pages': [1, 2]}
+
+
+def test_error_helpers():
+    assert describe_error(RuntimeError()) == 'RuntimeError'
+    assert describe_error(RuntimeError('line one\n  line two\n')) == 'line one line two'
+    assert is_driver_failure(WebDriverException('crashed'))
+    assert not is_driver_failure(EmptyPageError('empty'))
@@ -0,0 +1,116 @@
+"""
+Tests for how AuctionScraper treats pages that come back without lot cards
+Run with: python -m pytest test_scraper_pages.py
+"""
+
+import pytest
+
+from scraper import AuctionScraper
+
+PAGES = 4
+LOTS_PER_PAGE = 3
+EMPTY = '<html><body><p>No lots found</p></body></html>'
+
+
+def listing(page_num, pages=PAGES):
+    cards = ''.join(
+        f'<div class="lot-card"><div class="lot-number"><strong>{page_num * 100 + n}</strong></div>'
+        f'<div class="lot__name">Car {page_num * 100 + n}</div></div>'
+        for n in range(LOTS_PER_PAGE))
+    return f'<html><body>{cards}<div class="pagination">Page {page_num} of {pages}</div></body></html>'
+
+
+class FakeFetcher:
+    """Serve listing pages 1..pages, and an empty page for every page listed in flaky until it was served once"""
+
+    def __init__(self, pages=PAGES, flaky=()):
+        self.pages = pages
+        self.flaky = set(flaky)
+        self.calls = {}
+
+    def fetch(self, url, backend, wait_strategy, wait_time, ready_marker=None, validators=None,
+              fresh_session=False):
+        page_num = int(url.rsplit('page=', 1)[1])
+        self.calls[page_num] = self.calls.get(page_num, 0) + 1
+        if page_num in self.flaky:
+            self.flaky.discard(page_num)
+            html = EMPTY
+        else:
+            html = listing(page_num) if page_num <= self.pages else EMPTY
+        return {'html': html, 'backend': 'http', 'not_modified': False,
+                'readiness': {'strategy': 'http', 'ready': True, 'latency': 0.0}, 'timings': {}, 'validators': None}
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the scraper saves each page under debug/
+    monkeypatch.setenv('RETRY_BASE_DELAY', '0')
+    monkeypatch.setenv('RETRY_MAX_DELAY', '0')
+    auction = AuctionScraper('https://bids.example.com', 'A1', '2024-01-01', fetch_backend='http',
+                             parse_workers=0, page_retries=2)
+    yield auction
+    auction.pool.shutdown()
+
+
+def test_empty_page_inside_the_pagination_is_retried(scraper):
+    scraper.fetcher = FakeFetcher(flaky={3})
+    df = scraper.scrape_all_pages(1, 6, max_workers=3)
+
+    assert len(df) == PAGES * LOTS_PER_PAGE
+    assert sorted(df['page'].unique()) == [1, 2, 3, 4]
+    assert scraper.fetcher.calls[3] == 2
+    assert scraper.retries.summary()['recovered_pages'] == [3]
+    assert scraper.retries.failed_pages() == []
+    assert scraper.page_count == PAGES and scraper.end_page == 5
+
+
+def test_empty_page_past_the_pagination_is_the_end(scraper):
+    scraper.fetcher = FakeFetcher()
+    scraper.scrape_all_pages(1, 8, max_workers=1)
+
+    assert scraper.end_page == 5
+    assert 5 not in [failure['page'] for failure in scraper.retries.failed_pages()]
+    assert scraper.fetcher.calls[5] == 1  # not retried
+    assert set(scraper.fetcher.calls) == {1, 2, 3, 4, 5}  # later pages are skipped
+
+
+def test_empty_page_that_stays_empty_fails_instead_of_ending_the_auction(scraper):
+    scraper.fetcher = FakeFetcher()
+    scraper.fetcher.flaky = {2}
+    original = scraper.fetcher.fetch
+
+    def fetch(url, *args, **kwargs):
+        if url.endswith('page=2'):
+            scraper.fetcher.flaky.add(2)
+        return original(url, *args, **kwargs)
+
+    scraper.fetcher.fetch = fetch
+    df = scraper.scrape_all_pages(1, 4, max_workers=2)
+
+    assert sorted(df['page'].unique()) == [1, 3, 4]
+    assert [failure['page'] for failure in scraper.retries.failed_pages()] == [2]
+    assert scraper.end_page is None
+
+
+def test_incremental_scrape_keeps_lots_of_failed_and_skipped_pages(scraper, tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    scraper.fetcher = FakeFetcher()
+    scraper.scrape_incremental(1, 6, max_workers=2, state_path=state_path)
+
+    # The auction looks shorter this time: page 3 is empty until retried, page 4 stays empty
+    scraper.fetcher = FakeFetcher(flaky={3})
+    original = scraper.fetcher.fetch
+
+    def fetch(url, *args, **kwargs):
+        if url.endswith('page=4'):
+            scraper.fetcher.flaky.add(4)
+        return original(url, *args, **kwargs)
+
+    scraper.fetcher.fetch = fetch
+    df, delta = scraper.scrape_incremental(1, 6, max_workers=2, state_path=state_path)
+
+    assert delta['removed'] == []
+    assert len(df) == PAGES * LOTS_PER_PAGE
+    assert delta['pages']['3'] == 'unchanged'
+    assert delta['pages']['4'] == 'failed'
+    assert scraper.retries.summary()['recovered_pages'] == [3]
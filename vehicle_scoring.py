@@ -0,0 +1,225 @@
+"""
+Vehicle scoring for auction lots
+Scores price, condition and odometer for a whole DataFrame at once; the rules and their
+weights are plain data so they can be tuned or loaded from JSON. Keyword rules are matched
+with a KeywordIndex, so each lot's text is scanned once however many rules there are.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from keyword_index import KeywordIndex
+
+# Makes that identify a lot as a vehicle (scooters, trailers and other lots are left out)
+VEHICLE_MAKES = ['RAM', 'JEEP', 'AUDI', 'KIA', 'NISSAN', 'CHEVROLET', 'BMW', 'FORD', 'BUICK', 'TOYOTA',
+                 'HONDA', 'MAZDA', 'HYUNDAI', 'GMC', 'DODGE', 'CADILLAC']
+
+DEFAULT_RULES = {
+    # Price (30 points): lower starting bid relative to reserve is better
+    'price': {
+        'unparsed': 15,                 # starting bid or reserve is not a number
+        'seller_approval': {'match': 'subject to seller approval', 'points': 15},
+        'bands': [                      # starting_bid < reserve * ratio, first match wins
+            {'ratio': 0.3, 'points': 30},
+            {'ratio': 0.5, 'points': 25},
+            {'ratio': 0.7, 'points': 20},
+        ],
+        'otherwise': 15,
+    },
+    # Condition (40 points): matched against description + declarations, lower-cased
+    'condition': {
+        'base': 40,
+        'min': 0,
+        'rules': [
+            {'any': ['engine noise', 'engine will not turn over'], 'points': -20},
+            {'any': ['transmission issues'], 'points': -20},
+            {'any': ['frame damage'], 'points': -15},
+            {'any': ['mechanical problems'], 'unless': ['engine'], 'points': -10},
+            {'any': ['as is - where is'], 'points': -10},
+            # Rules sharing an exclusive group only count the first one that matches
+            {'any': ['claims total $10,000 - $14,999'], 'points': -12, 'group': 'claims'},
+            {'any': ['claims total $5000 - $9999'], 'points': -8, 'group': 'claims'},
+            {'any': ['claims total $3000 - $4999'], 'points': -5, 'group': 'claims'},
+            {'any': ['claims total $1000 - $2999'], 'points': -3, 'group': 'claims'},
+            {'any': ['hail damage'], 'points': -5},
+            {'any': ['panels repainted'], 'points': -3},
+            {'any': ['exhaust modified'], 'points': -2},
+            {'any': ['suspension requires repair'], 'points': -8},
+            {'any': ['driveline noise'], 'points': -10},
+            {'any': ['leather'], 'points': 3},
+            {'any': ['sunroof'], 'points': 2},
+        ],
+    },
+    # Odometer (30 points): lower mileage is better
+    'odometer': {
+        'unknown': 5,                   # reading says "unknown"
+        'unparsed': 15,                 # reading is not a number
+        'bands': [                      # reading < below, first match wins
+            {'below': 100000, 'points': 30},
+            {'below': 150000, 'points': 25},
+            {'below': 200000, 'points': 20},
+            {'below': 250000, 'points': 10},
+        ],
+        'otherwise': 5,
+    },
+}
+
+SCORE_COLUMNS = ['total_score', 'price_score', 'condition_score', 'odometer_score']
+
+_NON_NUMERIC = re.compile(r'[^\d.]')
+
+
+def parse_number(values: pd.Series) -> pd.Series:
+    """Strip everything but digits and dots and convert to float (NaN when that fails)"""
+    return pd.to_numeric(values.astype(str).str.replace(_NON_NUMERIC, '', regex=True), errors='coerce')
+
+
+def condition_text(df: pd.DataFrame) -> pd.Series:
+    """Description + declarations, the text the condition rules are matched against (case-insensitively)"""
+    return df['description'].fillna('').astype(str) + ' ' + df['declarations'].fillna('').astype(str)
+
+
+def filter_vehicles(df: pd.DataFrame, makes: Optional[List[str]] = None) -> pd.DataFrame:
+    """Lots whose title mentions one of the vehicle makes"""
+    index = KeywordIndex(makes or VEHICLE_MAKES)
+    return df[index.any_mask(df['title'].fillna(''))]
+
+
+def score_price(df: pd.DataFrame, rules: Dict) -> np.ndarray:
+    """Price points for every lot"""
+    starting = parse_number(df['starting_bid']).to_numpy()
+    reserve_text = df['reserve_price'].astype(str)
+    reserve = parse_number(reserve_text).to_numpy()
+    approval = reserve_text.str.contains(rules['seller_approval']['match'], case=False, regex=False,
+                                         na=False).to_numpy(dtype=bool)
+
+    conditions = [np.isnan(starting), approval, np.isnan(reserve)]
+    choices = [rules['unparsed'], rules['seller_approval']['points'], rules['unparsed']]
+    with np.errstate(invalid='ignore'):
+        for band in rules['bands']:
+            conditions.append(starting < reserve * band['ratio'])
+            choices.append(band['points'])
+    return np.select(conditions, choices, rules['otherwise'])
+
+
+def score_condition(df: pd.DataFrame, rules: Dict) -> np.ndarray:
+    """Condition points for every lot"""
+    index = KeywordIndex(keyword for rule in rules['rules'] for keyword in rule['any'] + rule.get('unless', []))
+    # One pass over every lot's text finds all rule keywords at once
+    matrix = index.match_matrix(condition_text(df))
+
+    def contains_any(keywords):
+        return matrix[:, [index.positions[keyword.lower()] for keyword in keywords]].any(axis=1)
+
+    score = np.full(len(matrix), rules['base'])
+    matched_groups = {}
+    for rule in rules['rules']:
+        mask = contains_any(rule['any'])
+        if rule.get('unless'):
+            mask &= ~contains_any(rule['unless'])
+        group = rule.get('group')
+        if group:
+            taken = matched_groups.get(group, np.zeros(len(matrix), dtype=bool))
+            mask &= ~taken
+            matched_groups[group] = taken | mask
+        score = score + np.where(mask, rule['points'], 0)
+    return np.maximum(rules['min'], score)
+
+
+def score_odometer(df: pd.DataFrame, rules: Dict) -> np.ndarray:
+    """Odometer points for every lot"""
+    text = df['odometer'].astype(str)
+    reading = parse_number(text).to_numpy()
+
+    unknown = text.str.contains('unknown', case=False, regex=False, na=False).to_numpy(dtype=bool)
+    conditions = [unknown, np.isnan(reading)]
+    choices = [rules['unknown'], rules['unparsed']]
+    with np.errstate(invalid='ignore'):
+        for band in rules['bands']:
+            conditions.append(reading < band['below'])
+            choices.append(band['points'])
+    return np.select(conditions, choices, rules['otherwise'])
+
+
+def score_vehicles(df: pd.DataFrame, rules: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Score every lot in a DataFrame
+
+    Args:
+        df: Lots with starting_bid, reserve_price, description, declarations and odometer columns
+        rules: Scoring rules in the shape of DEFAULT_RULES (default: DEFAULT_RULES)
+
+    Returns:
+        DataFrame with SCORE_COLUMNS, aligned to df's index
+    """
+    rules = rules or DEFAULT_RULES
+    price = score_price(df, rules['price'])
+    condition = score_condition(df, rules['condition'])
+    odometer = score_odometer(df, rules['odometer'])
+    return pd.DataFrame({
+        'total_score': price + condition + odometer,
+        'price_score': price,
+        'condition_score': condition,
+        'odometer_score': odometer,
+    }, index=df.index)
+
+
+def score_vehicle(row, rules: Optional[Dict] = None) -> Dict:
+    """
+    Score a single lot; row-by-row reference for score_vehicles
+
+    Args:
+        row: Mapping with the same fields score_vehicles reads
+        rules: Scoring rules (default: DEFAULT_RULES)
+
+    Returns:
+        Dictionary with the SCORE_COLUMNS values
+    """
+    rules = rules or DEFAULT_RULES
+    price_rules, condition_rules, odometer_rules = rules['price'], rules['condition'], rules['odometer']
+
+    try:
+        starting_bid = float(_NON_NUMERIC.sub('', str(row['starting_bid'])))
+        reserve_price = str(row['reserve_price'])
+        if price_rules['seller_approval']['match'] in reserve_price.lower():
+            price_score = price_rules['seller_approval']['points']
+        else:
+            reserve = float(_NON_NUMERIC.sub('', reserve_price))
+            price_score = next((band['points'] for band in price_rules['bands']
+                                if starting_bid < reserve * band['ratio']), price_rules['otherwise'])
+    except ValueError:
+        price_score = price_rules['unparsed']
+
+    description = str(row['description']).lower() + ' ' + str(row['declarations']).lower()
+    condition_score = condition_rules['base']
+    matched_groups = set()
+    for rule in condition_rules['rules']:
+        group = rule.get('group')
+        if group in matched_groups:
+            continue
+        if any(k in description for k in rule['any']) and not any(k in description for k in rule.get('unless', [])):
+            condition_score += rule['points']
+            if group:
+                matched_groups.add(group)
+    condition_score = max(condition_rules['min'], condition_score)
+
+    odometer_str = str(row['odometer'])
+    try:
+        if 'unknown' in odometer_str.lower():
+            odometer_score = odometer_rules['unknown']
+        else:
+            km = float(_NON_NUMERIC.sub('', odometer_str))
+            odometer_score = next((band['points'] for band in odometer_rules['bands'] if km < band['below']),
+                                  odometer_rules['otherwise'])
+    except ValueError:
+        odometer_score = odometer_rules['unparsed']
+
+    return {
+        'total_score': price_score + condition_score + odometer_score,
+        'price_score': price_score,
+        'condition_score': condition_score,
+        'odometer_score': odometer_score,
+    }
@@ -0,0 +1,189 @@
+"""
+Readiness wait strategies for JavaScript-rendered pages
+Replaces fixed time.sleep() calls with policies that return as soon as the page is usable
+"""
+
+import time
+from typing import Dict
+
+from selenium.webdriver.common.by import By
+
+
+class WaitStrategy:
+    """Base class for readiness policies"""
+
+    name = 'base'
+
+    def __init__(self, timeout: float = 15, poll_interval: float = 0.25):
+        """
+        Args:
+            timeout: Maximum seconds to wait before giving up
+            poll_interval: Seconds between readiness checks
+        """
+        self.timeout = float(timeout)
+        self.poll_interval = poll_interval
+
+    def is_ready(self, driver) -> bool:
+        """Return True once the page is considered ready"""
+        raise NotImplementedError
+
+    def wait(self, driver) -> Dict:
+        """
+        Block until the page is ready or the timeout expires
+
+        Returns:
+            Dictionary with strategy name, whether readiness was reached and latency in seconds
+        """
+        start = time.time()
+        deadline = start + self.timeout
+        ready = False
+
+        while True:
+            try:
+                ready = self.is_ready(driver)
+            except Exception:
+                ready = False
+            if ready or time.time() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+        return {
+            'strategy': self.name,
+            'ready': ready,
+            'latency': round(time.time() - start, 3)
+        }
+
+
+class FixedWait(WaitStrategy):
+    """Legacy behaviour: always sleep for the full timeout"""
+
+    name = 'fixed'
+
+    def wait(self, driver) -> Dict:
+        time.sleep(self.timeout)
+        return {'strategy': self.name, 'ready': True, 'latency': self.timeout}
+
+
+class StableCountWait(WaitStrategy):
+    """Ready when the number of matching elements is non-zero and has stopped changing"""
+
+    name = 'lot_cards'
+
+    def __init__(self, timeout: float = 15, selector: str = 'div.lot-card', stable_for: float = 0.5,
+                 poll_interval: float = 0.25):
+        """
+        Args:
+            timeout: Maximum seconds to wait
+            selector: CSS selector of the elements to count
+            stable_for: Seconds the count must stay unchanged
+            poll_interval: Seconds between checks
+        """
+        super().__init__(timeout, poll_interval)
+        self.selector = selector
+        self.stable_for = stable_for
+        self._last_count = None
+        self._stable_since = None
+
+    def wait(self, driver) -> Dict:
+        self._last_count = None
+        self._stable_since = None
+        return super().wait(driver)
+
+    def is_ready(self, driver) -> bool:
+        count = len(driver.find_elements(By.CSS_SELECTOR, self.selector))
+        now = time.time()
+
+        if count != self._last_count:
+            self._last_count = count
+            self._stable_since = now
+            return False
+
+        return count > 0 and now - self._stable_since >= self.stable_for
+
+
+class NetworkIdleWait(WaitStrategy):
+    """Ready when the document has loaded and no new resources were fetched for a short period"""
+
+    name = 'network_idle'
+
+    RESOURCE_COUNT_JS = (
+        "return [document.readyState, "
+        "window.performance ? performance.getEntriesByType('resource').length : 0];"
+    )
+
+    def __init__(self, timeout: float = 15, idle_for: float = 0.5, poll_interval: float = 0.25):
+        """
+        Args:
+            timeout: Maximum seconds to wait
+            idle_for: Seconds without new resource entries to count as idle
+            poll_interval: Seconds between checks
+        """
+        super().__init__(timeout, poll_interval)
+        self.idle_for = idle_for
+        self._last_count = None
+        self._idle_since = None
+
+    def wait(self, driver) -> Dict:
+        self._last_count = None
+        self._idle_since = None
+        return super().wait(driver)
+
+    def is_ready(self, driver) -> bool:
+        ready_state, resource_count = driver.execute_script(self.RESOURCE_COUNT_JS)
+        now = time.time()
+
+        if ready_state != 'complete' or resource_count != self._last_count:
+            self._last_count = resource_count
+            self._idle_since = now
+            return False
+
+        return now - self._idle_since >= self.idle_for
+
+
+class ElementPresentWait(WaitStrategy):
+    """Ready as soon as an element matching the selector exists"""
+
+    name = 'pagination'
+
+    def __init__(self, timeout: float = 15, selector: str = 'select option, .pagination a, nav.pagination',
+                 poll_interval: float = 0.25):
+        """
+        Args:
+            timeout: Maximum seconds to wait
+            selector: CSS selector that signals readiness (pagination controls by default)
+            poll_interval: Seconds between checks
+        """
+        super().__init__(timeout, poll_interval)
+        self.selector = selector
+
+    def is_ready(self, driver) -> bool:
+        return len(driver.find_elements(By.CSS_SELECTOR, self.selector)) > 0
+
+
+WAIT_STRATEGIES = {
+    FixedWait.name: FixedWait,
+    StableCountWait.name: StableCountWait,
+    NetworkIdleWait.name: NetworkIdleWait,
+    ElementPresentWait.name: ElementPresentWait,
+}
+
+
+def get_wait_strategy(name: str = 'auto', timeout: float = 15, url: str = '') -> WaitStrategy:
+    """
+    Build a wait strategy by name
+
+    Args:
+        name: 'fixed', 'lot_cards', 'network_idle', 'pagination' or 'auto'
+        timeout: Maximum seconds to wait (the sleep duration for 'fixed')
+        url: Page URL, used by 'auto' to pick a policy for the site
+
+    Returns:
+        WaitStrategy instance
+    """
+    if not name or name == 'auto':
+        name = 'lot_cards' if 'regalauctions.com' in url else 'network_idle'
+
+    if name not in WAIT_STRATEGIES:
+        raise ValueError(f"Unknown wait strategy '{name}'. Use one of: auto, {', '.join(WAIT_STRATEGIES)}")
+
+    return WAIT_STRATEGIES[name](timeout=timeout)